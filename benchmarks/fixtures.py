@@ -0,0 +1,276 @@
+"""
+Synthetic payloads shared by the benchmarks.
+"""
+
+import base64
+import struct
+from typing import Any, Optional
+
+
+def track_payload(index: int, source: str = "youtube") -> dict[str, Any]:
+    """
+    Returns a Lavalink track payload that looks like a real search result.
+    """
+    identifier = f"id{index:08d}"
+    return {
+        "encoded": base64.b64encode(f"encoded-track-{identifier}".encode() * 8).decode(),
+        "info": {
+            "identifier": identifier,
+            "isSeekable": True,
+            "author": f"Artist {index % 997}",
+            "length": 180_000 + (index % 120) * 1000,
+            "isStream": False,
+            "position": 0,
+            "title": f"Song number {index} (Official Music Video)",
+            "uri": f"https://www.youtube.com/watch?v={identifier}",
+            "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/maxresdefault.jpg",
+            "isrc": None,
+            "sourceName": source,
+        },
+        "pluginInfo": {},
+        "userData": {},
+    }
+
+
+def _utf(text: str) -> bytes:
+    data = text.encode("utf-8")
+    return struct.pack(">H", len(data)) + data
+
+
+def _nullable_utf(text: Optional[str]) -> bytes:
+    return b"\x00" if text is None else b"\x01" + _utf(text)
+
+
+def encoded_track(index: int, source: str = "youtube") -> str:
+    """
+    Returns the track of `track_payload` encoded like Lavalink 4 does (version 3).
+    """
+    info = track_payload(index, source)["info"]
+    body = (
+        bytes([3])
+        + _utf(info["title"])
+        + _utf(info["author"])
+        + struct.pack(">q", info["length"])
+        + _utf(info["identifier"])
+        + struct.pack(">?", info["isStream"])
+        + _nullable_utf(info["uri"])
+        + _nullable_utf(info["artworkUrl"])
+        + _nullable_utf(info["isrc"])
+        + _utf(info["sourceName"])
+        + struct.pack(">q", info["position"])
+    )
+    ## Header: the message size, flagged as versioned.
+    return base64.b64encode(struct.pack(">i", len(body) | 1 << 30) + body).decode()
+
+
+def guild_payload(index: int, voice_members: int = 3) -> dict[str, Any]:
+    """
+    Returns a GUILD_CREATE payload for a mid-sized community guild,
+    as received with only the guilds and voice_states intents.
+    """
+    guild_id = 10**17 + index * 1000
+    bot_id = 939307188072116305
+
+    def user(user_id: int, name: str, bot: bool = False) -> dict[str, Any]:
+        return {
+            "id": str(user_id),
+            "username": name,
+            "discriminator": "0",
+            "global_name": name.title(),
+            "avatar": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4",
+            "bot": bot,
+        }
+
+    def member(user_id: int, name: str, bot: bool = False) -> dict[str, Any]:
+        return {
+            "user": user(user_id, name, bot),
+            "roles": [str(guild_id + 1)],
+            "joined_at": "2023-01-01T00:00:00+00:00",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        }
+
+    channels = [
+        {
+            "id": str(guild_id + 100 + i),
+            "type": 2 if i % 5 == 0 else 0,
+            "name": f"channel-{i}",
+            "position": i,
+            "permission_overwrites": [
+                {"id": str(guild_id), "type": 0, "allow": "0", "deny": "1024"}
+            ],
+            "topic": None if i % 5 == 0 else f"Topic of channel {i}" * 3,
+            "nsfw": False,
+            "bitrate": 64000,
+            "user_limit": 0,
+            "parent_id": None,
+            "rate_limit_per_user": 0,
+        }
+        for i in range(50)
+    ]
+    voice_channel_id = channels[0]["id"]
+    members = [member(bot_id, "braum", bot=True)] + [
+        member(guild_id + 500 + i, f"listener{i}") for i in range(voice_members)
+    ]
+
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {index}",
+        "icon": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4",
+        "owner_id": str(guild_id + 500),
+        "region": "europe",
+        "afk_timeout": 300,
+        "verification_level": 1,
+        "default_message_notifications": 1,
+        "explicit_content_filter": 2,
+        "features": ["COMMUNITY", "NEWS", "WELCOME_SCREEN_ENABLED"],
+        "mfa_level": 0,
+        "system_channel_flags": 0,
+        "premium_tier": 1,
+        "preferred_locale": "en-US",
+        "nsfw_level": 0,
+        "member_count": 500 + index % 5000,
+        "large": True,
+        "unavailable": False,
+        "roles": [
+            {
+                "id": str(guild_id + (0 if i == 0 else i)),
+                "name": "@everyone" if i == 0 else f"role-{i}",
+                "color": i * 1000,
+                "hoist": False,
+                "position": i,
+                "permissions": "1071698660929",
+                "managed": False,
+                "mentionable": False,
+            }
+            for i in range(30)
+        ],
+        "emojis": [
+            {
+                "id": str(guild_id + 700 + i),
+                "name": f"emoji_{i}",
+                "roles": [],
+                "require_colons": True,
+                "managed": False,
+                "animated": i % 4 == 0,
+                "available": True,
+            }
+            for i in range(60)
+        ],
+        "stickers": [
+            {
+                "id": str(guild_id + 800 + i),
+                "name": f"sticker_{i}",
+                "description": f"Sticker number {i}",
+                "tags": "sticker",
+                "type": 2,
+                "format_type": 1,
+                "available": True,
+                "guild_id": str(guild_id),
+            }
+            for i in range(5)
+        ],
+        "channels": channels,
+        "threads": [
+            {
+                "id": str(guild_id + 900 + i),
+                "type": 11,
+                "guild_id": str(guild_id),
+                "parent_id": channels[1]["id"],
+                "owner_id": str(guild_id + 500),
+                "name": f"thread-{i}",
+                "last_message_id": None,
+                "rate_limit_per_user": 0,
+                "message_count": 20,
+                "member_count": 3,
+                "thread_metadata": {
+                    "archived": False,
+                    "auto_archive_duration": 1440,
+                    "archive_timestamp": "2023-01-01T00:00:00+00:00",
+                    "locked": False,
+                },
+                "flags": 0,
+            }
+            for i in range(8)
+        ],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+        "members": members,
+        "voice_states": [
+            {
+                "user_id": item["user"]["id"],
+                "channel_id": voice_channel_id,
+                "session_id": f"session{i}",
+                "deaf": False,
+                "mute": False,
+                "self_deaf": i == 0,
+                "self_mute": False,
+                "self_video": False,
+                "suppress": False,
+                "request_to_speak_timestamp": None,
+            }
+            for i, item in enumerate(members)
+        ],
+        "presences": [],
+    }
+
+
+def interaction_payload(index: int) -> dict[str, Any]:
+    """
+    Returns an INTERACTION_CREATE payload for `/play query:<song>`.
+    """
+    guild_id = str(10**17 + index * 1000)
+    return {
+        "id": str(1_100_000_000_000_000_000 + index),
+        "application_id": "939307188072116305",
+        "type": 2,
+        "data": {
+            "id": "1100000000000000001",
+            "name": "play",
+            "type": 1,
+            "options": [{"name": "query", "type": 3, "value": f"Song number {index}"}],
+        },
+        "guild_id": guild_id,
+        "channel_id": str(int(guild_id) + 101),
+        "member": {
+            "user": {
+                "id": str(int(guild_id) + 500),
+                "username": "listener0",
+                "discriminator": "0",
+                "global_name": "Listener0",
+                "avatar": "a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4",
+            },
+            "roles": [str(int(guild_id) + 1)],
+            "joined_at": "2023-01-01T00:00:00+00:00",
+            "permissions": "1071698660929",
+            "deaf": False,
+            "mute": False,
+            "flags": 0,
+        },
+        "token": "aW50ZXJhY3Rpb246" + "x" * 180,
+        "version": 1,
+        "app_permissions": "2150911040",
+        "locale": "en-US",
+        "guild_locale": "en-US",
+        "entitlements": [],
+    }
+
+
+def lavalink_event(index: int) -> dict[str, Any]:
+    """
+    Returns a Lavalink websocket message, alternating track starts and player updates.
+    """
+    guild_id = str(10**17 + index * 1000)
+    if index % 2:
+        return {
+            "op": "playerUpdate",
+            "guildId": guild_id,
+            "state": {"time": 1_700_000_000_000, "position": 60_000, "connected": True, "ping": 42},
+        }
+    return {
+        "op": "event",
+        "type": "TrackStartEvent",
+        "guildId": guild_id,
+        "track": track_payload(index),
+    }
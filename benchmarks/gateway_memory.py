@@ -0,0 +1,107 @@
+"""
+Compares the per-guild cache memory of discord.py's defaults with the "low"
+gateway cache profile (see src/essentials/gateway.py).
+
+Synthetic GUILD_CREATE payloads are parsed by each profile's connection state,
+each profile in its own process so RSS is not shared. Run with:
+
+    python -m benchmarks.gateway_memory [guilds]
+"""
+
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import discord
+
+from benchmarks.fixtures import guild_payload
+from src.essentials.gateway import FULL, LOW, cache_options, connection_state
+
+
+def rss() -> int:
+    """Resident set size of this process in bytes, Linux only."""
+    with open("/proc/self/statm", encoding="ascii") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class BenchmarkClient(discord.Client):
+    """Client whose connection state follows the given cache profile."""
+
+    def __init__(self, profile: str) -> None:
+        self.cache_profile = profile
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.voice_states = True
+        super().__init__(intents=intents, **cache_options(profile))
+
+    def _get_state(self, **options) -> discord.state.ConnectionState:
+        return connection_state(self, self.cache_profile, **options)
+
+
+def new_state(profile: str) -> discord.state.ConnectionState:
+    state = BenchmarkClient(profile)._connection  # pylint:disable=protected-access
+    ## Chunking needs a gateway connection, only the cache is measured.
+    state._chunk_guilds = False  # pylint:disable=protected-access
+    return state
+
+
+def run(profile: str, guilds: int) -> None:
+    """Parses the guilds with the profile and prints bytes per guild."""
+    ## RSS first, tracemalloc's own bookkeeping would inflate it.
+    state = new_state(profile)
+    payloads = [guild_payload(i) for i in range(guilds)]
+    rss_before = rss()
+    for payload in payloads:
+        state.parse_guild_create(payload)
+    rss_delta = rss() - rss_before
+
+    state = new_state(profile)
+    payloads = [guild_payload(i) for i in range(guilds)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for payload in payloads:
+        state.parse_guild_create(payload)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    assert len(state.guilds) == guilds
+    print(size / guilds, rss_delta / guilds)
+
+
+def main(guilds: int) -> None:
+    results = {}
+    for profile in (FULL, LOW):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.gateway_memory",
+                "--profile",
+                profile,
+                str(guilds),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        results[profile] = (float(output[0]), float(output[1]))
+
+    print(f"guilds={guilds}")
+    full_heap = results[FULL][0]
+    for profile, (heap, rss_delta) in results.items():
+        saved = (
+            "" if profile == FULL else f" ({(1 - heap / full_heap) * 100:.1f}% less)"
+        )
+        print(
+            f"{profile:8} {heap:10.0f} bytes/guild allocated,"
+            f" {rss_delta:10.0f} bytes/guild RSS{saved}"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--profile"]:
+        run(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
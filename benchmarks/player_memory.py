@@ -0,0 +1,81 @@
+"""
+Compares the per-player memory of the old ad-hoc player state with BraumPlayer.
+
+The old state was a wavelink.Player with dynamic attributes, and an unbounded
+wavelink.Queue(history=True) as history next to the history wavelink keeps in
+player.queue. BraumPlayer only keeps the queue's history, trimmed to
+QUEUE_HISTORY_SIZE, of interned tracks. Like in production, every played track was
+decoded from its guild's own Lavalink response. Run with:
+
+    python -m benchmarks.player_memory [players] [tracks played per player]
+"""
+
+import asyncio
+import sys
+import tracemalloc
+
+import wavelink
+
+from benchmarks.fixtures import track_payload
+from src.utils.player import BraumPlayer
+
+
+def measure(build, count: int) -> float:
+    """Returns the bytes allocated per object built by `build`."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / count
+
+
+def compare(label: str, old: float, new: float) -> None:
+    change = (1 - new / old) * 100
+    print(f"{label}")
+    print(f"  ad-hoc wavelink.Player: {old:10.0f} bytes/player")
+    print(
+        f"  BraumPlayer:            {new:10.0f} bytes/player"
+        f" ({abs(change):.1f}% {'less' if change >= 0 else 'more'})"
+    )
+
+
+async def main(players: int, played: int) -> None:
+    node = wavelink.Node(uri="http://localhost:2333", password="benchmark")
+    payloads = [track_payload(i) for i in range(played)]
+
+    def old_player(played_tracks: bool = True):
+        player = wavelink.Player(nodes=[node])
+        player.reply = None
+        player.now_playing_message = None
+        player.nightcore = False
+        player.custom_queue = wavelink.Queue(history=True)
+        for payload in payloads if played_tracks else []:
+            track = wavelink.Playable(payload)
+            player.queue.history.put(track)  ## What Player.play does.
+            player.custom_queue.history.put(track)
+        return player
+
+    def new_player(played_tracks: bool = True):
+        player = BraumPlayer(nodes=[node])
+        for payload in payloads if played_tracks else []:
+            player.queue.history.put(wavelink.Playable(payload))
+            player.trim_history()  ## What on_wavelink_track_end does.
+        return player
+
+    print(f"players={players} tracks played={played}")
+    compare(
+        "empty",
+        measure(lambda: old_player(False), players),
+        measure(lambda: new_player(False), players),
+    )
+    compare("played", measure(old_player, players), measure(new_player, players))
+
+    await node._session.close()  # pylint:disable=protected-access
+
+
+if __name__ == "__main__":
+    arguments = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(arguments or [1000, 200])))
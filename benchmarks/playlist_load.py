@@ -0,0 +1,52 @@
+"""
+Measures loading a saved playlist (see src/utils/playlists.py): reading it from the
+store, decoding its tracks without Lavalink, and queueing them in one insert.
+Searching or loading the same playlist through Lavalink takes seconds. Run with:
+
+    python -m benchmarks.playlist_load [tracks] [repeats]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import encoded_track
+from src.utils.playlists import PlaylistStore, decode_tracks
+from src.utils.track_queue import BraumQueue
+
+
+async def main(tracks: int, repeats: int) -> None:
+    encoded = [encoded_track(i) for i in range(tracks)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = PlaylistStore(os.path.join(directory, "playlists.db"))
+        await store.save("user:1", "mix", encoded)
+        size = os.path.getsize(os.path.join(directory, "playlists.db"))
+
+        timings = {"read": [], "decode": [], "queue": []}
+        for _ in range(repeats):
+            started = time.perf_counter()
+            loaded = await store.load("user:1", "mix")
+            read = time.perf_counter()
+            decoded = decode_tracks(loaded)
+            decode = time.perf_counter()
+            BraumQueue().put(decoded)
+            done = time.perf_counter()
+            timings["read"].append(read - started)
+            timings["decode"].append(decode - read)
+            timings["queue"].append(done - decode)
+
+    print(
+        f"tracks={tracks} repeats={repeats} "
+        f"store={size / 1024:.0f} KiB ({sum(map(len, encoded)) / 1024:.0f} KiB encoded)"
+    )
+    for step, samples in timings.items():
+        print(f"{step:8} {min(samples) * 1000:8.2f} ms")
+    total = sum(min(samples) for samples in timings.values())
+    print(f"{'total':8} {total * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    arguments = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*(arguments or [500, 20])))
@@ -0,0 +1,65 @@
+"""
+Compares positional queue operations on wavelink.Queue (a list) with BraumQueue
+(an IndexedList, see src/utils/indexed.py). Not every operation gets faster.
+Reading by position walks the tree, so a peek stays several times slower than on
+a list. At 100k tracks, edits at the front are much faster and moves are about even.
+At 1000 tracks, the default QUEUE_MAX_TRACKS, the list is faster at all of them.
+What the tree keeps at any size is O(log n) durations up to a position (the ETAs).
+Run with:
+
+    python -m benchmarks.queue_ops [queue length] [operations]
+"""
+
+import random
+import sys
+import time
+
+import wavelink
+
+from benchmarks.fixtures import track_payload
+from src.utils.track_queue import BraumQueue
+
+
+def run(queue: wavelink.Queue, operations: int) -> dict[str, float]:
+    """Returns microseconds per operation, for each kind of operation."""
+    rng = random.Random(42)
+    timings = {}
+
+    def timed(name, operation) -> None:
+        started = time.perf_counter()
+        for _ in range(operations):
+            operation()
+        timings[name] = (time.perf_counter() - started) / operations * 1e6
+
+    def move() -> None:
+        track = queue.get_at(rng.randrange(len(queue)))
+        queue.put_at(rng.randrange(len(queue)), track)
+
+    timed("get + put front", lambda: queue.put_at(0, queue.get()))
+    timed("peek middle", lambda: queue.peek(len(queue) // 2))
+    timed("move", move)
+    return timings
+
+
+def main(length: int, operations: int) -> None:
+    songs = [wavelink.Playable(track_payload(i)) for i in range(1000)]
+    tracks = [songs[i % len(songs)] for i in range(length + 1)]
+    results = {}
+    for queue_cls in (wavelink.Queue, BraumQueue):
+        queue = queue_cls()
+        queue.put(tracks)
+        results[queue_cls.__name__] = run(queue, operations)
+
+    print(f"queue length={length} operations={operations} (microseconds per operation)")
+    print(f"{'':16}" + "".join(f"{name:>14}" for name in results))
+    for operation in results["Queue"]:
+        print(
+            f"{operation:16}"
+            + "".join(f"{timings[operation]:14.2f}" for timings in results.values())
+        )
+    print("peek is O(1) on a list and O(log n) on BraumQueue, which pays off on edits.")
+
+
+if __name__ == "__main__":
+    arguments = [int(arg) for arg in sys.argv[1:3]]
+    main(*(arguments or [100_000, 2000]))
@@ -0,0 +1,150 @@
+"""
+Compares the default runtime with RUNTIME=fast (see src/utils/runtime.py).
+
+- gateway: decoding gateway frames (GUILD_CREATE and INTERACTION_CREATE),
+- lavalink: decoding Lavalink websocket messages into tracks, and encoding player updates,
+- commands: latency of simulated /play interactions handled concurrently on the event loop.
+
+Fast mode uses whatever of uvloop and orjson is installed. Run with:
+
+    python -m benchmarks.runtime [iterations]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+import wavelink
+
+from benchmarks.fixtures import guild_payload, interaction_payload, lavalink_event
+from src.utils.runtime import DEFAULT, FAST, Runtime, select
+
+## Commands handled at once in the latency benchmark.
+CONCURRENCY = 50
+
+
+def codec(runtime: Runtime) -> tuple[Callable[[str], Any], Callable[[Any], str]]:
+    """Returns the runtime's loads and dumps."""
+    if runtime.json == "orjson":
+        import orjson  # pylint:disable=import-outside-toplevel
+
+        return orjson.loads, lambda obj: orjson.dumps(obj).decode("utf-8")
+    return json.loads, json.dumps
+
+
+def throughput(func: Callable[[], int], repeats: int = 5) -> float:
+    """Returns the best items per second of `func`, which returns how many it handled."""
+    best = 0.0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        handled = func()
+        best = max(best, handled / (time.perf_counter() - started))
+    return best
+
+
+def gateway(runtime: Runtime, iterations: int) -> float:
+    loads, _ = codec(runtime)
+    frames = [
+        json.dumps({"op": 0, "s": i, "t": "GUILD_CREATE", "d": guild_payload(i)})
+        for i in range(max(iterations // 50, 1))
+    ] + [
+        json.dumps({"op": 0, "s": i, "t": "INTERACTION_CREATE", "d": interaction_payload(i)})
+        for i in range(iterations)
+    ]
+
+    def decode() -> int:
+        for frame in frames:
+            loads(frame)
+        return len(frames)
+
+    return throughput(decode)
+
+
+def lavalink(runtime: Runtime, iterations: int) -> float:
+    loads, dumps = codec(runtime)
+    messages = [json.dumps(lavalink_event(i)) for i in range(iterations)]
+
+    def handle() -> int:
+        for message in messages:
+            data = loads(message)
+            if data["op"] == "event":
+                track = wavelink.Playable(data["track"])
+                dumps({"track": {"encoded": track.encoded}, "paused": False})
+            else:
+                dumps({"position": data["state"]["position"]})
+        return len(messages)
+
+    return throughput(handle)
+
+
+async def commands(runtime: Runtime, iterations: int) -> list[float]:
+    """Returns the latency of each simulated command, in seconds."""
+    loads, dumps = codec(runtime)
+    loop = asyncio.get_running_loop()
+    frames = [json.dumps(interaction_payload(i)) for i in range(iterations)]
+
+    async def handle(frame: str) -> float:
+        started = time.perf_counter()
+        data = loads(frame)
+        ## Defer, a search round trip, and the reply, each a trip through the loop.
+        for _ in range(3):
+            future = loop.create_future()
+            loop.call_soon(future.set_result, None)
+            await future
+            await asyncio.sleep(0)
+        dumps({"type": 4, "data": {"content": data["data"]["options"][0]["value"]}})
+        return time.perf_counter() - started
+
+    latencies = []
+    for start in range(0, len(frames), CONCURRENCY):
+        batch = frames[start : start + CONCURRENCY]
+        latencies += await asyncio.gather(*(handle(frame) for frame in batch))
+    return latencies
+
+
+def command_latency(
+    runtime: Runtime, iterations: int, repeats: int = 3
+) -> tuple[float, float]:
+    """Returns the best p50 and p99 command latency in milliseconds."""
+    loop_factory = None
+    if runtime.loop == "uvloop":
+        import uvloop  # pylint:disable=import-outside-toplevel
+
+        loop_factory = uvloop.new_event_loop
+
+    p50 = p99 = float("inf")
+    for _ in range(repeats):
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            latencies = runner.run(commands(runtime, iterations))
+        cuts = statistics.quantiles(latencies, n=100)
+        p50, p99 = min(p50, cuts[49] * 1000), min(p99, cuts[98] * 1000)
+    return p50, p99
+
+
+def main(iterations: int) -> None:
+    results = {}
+    for mode in (DEFAULT, FAST):
+        runtime = select(mode)
+        results[mode] = (
+            runtime,
+            gateway(runtime, iterations),
+            lavalink(runtime, iterations),
+            command_latency(runtime, iterations),
+        )
+
+    print(f"iterations={iterations} concurrency={CONCURRENCY}")
+    base = results[DEFAULT]
+    for mode, (runtime, frames, events, (p50, p99)) in results.items():
+        speedup = "" if mode == DEFAULT else f" x{frames / base[1]:.2f}"
+        print(f"{mode} ({runtime.loop}, {runtime.json}):")
+        print(f"  gateway frames:  {frames:12.0f} /s{speedup}")
+        speedup = "" if mode == DEFAULT else f" x{events / base[2]:.2f}"
+        print(f"  lavalink events: {events:12.0f} /s{speedup}")
+        print(f"  command latency: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
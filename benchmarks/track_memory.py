@@ -0,0 +1,76 @@
+"""
+Compares the memory of guild queues holding plain wavelink.Playables with queues
+holding interned tracks (see src/utils/tracks.py).
+
+Every guild queues and plays songs drawn from the same charts, popular songs far
+more often (Zipf). Each guild's tracks come from its own search, so from their own
+decoded Lavalink payload, like in production. Run with:
+
+    python -m benchmarks.track_memory [guilds] [queued per guild] [played per guild] [distinct songs]
+"""
+
+import json
+import random
+import sys
+import tracemalloc
+
+import wavelink
+
+from benchmarks.fixtures import track_payload
+from src.utils.tracks import InternedQueue, track_pool
+
+
+def measure(build) -> int:
+    """Returns the bytes still allocated by what `build` returns."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    built = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del built
+    return size
+
+
+def main(guilds: int, queued: int, played: int, songs: int) -> None:
+    rng = random.Random(42)
+    ## Raw Lavalink responses, decoded again for every search.
+    payloads = [json.dumps(track_payload(i)) for i in range(songs)]
+    weights = [1 / (rank + 1) for rank in range(songs)]
+    picks = [
+        (
+            rng.choices(range(songs), weights, k=queued),
+            rng.choices(range(songs), weights, k=played),
+        )
+        for _ in range(guilds)
+    ]
+
+    def search(song: int) -> wavelink.Playable:
+        return wavelink.Playable(json.loads(payloads[song]))
+
+    def build(queue_cls, remember):
+        players = []
+        for upcoming, history in picks:
+            queue = queue_cls()
+            for song in upcoming:
+                queue.put(search(song))
+            for song in history:
+                queue.history.put(remember(search(song)))
+            players.append(queue)
+        return players
+
+    plain = measure(lambda: build(wavelink.Queue, lambda track: track))
+    interned = measure(lambda: build(InternedQueue, track_pool.intern))
+
+    tracks = guilds * (queued + played)
+    print(f"guilds={guilds} queued={queued} played={played} distinct songs={songs}")
+    print(f"plain Playables: {plain / guilds:10.0f} bytes/guild, {plain / tracks:6.0f} bytes/track")
+    print(
+        f"interned tracks: {interned / guilds:10.0f} bytes/guild, {interned / tracks:6.0f} bytes/track"
+        f" ({(1 - interned / plain) * 100:.1f}% less)"
+    )
+
+
+if __name__ == "__main__":
+    arguments = [int(arg) for arg in sys.argv[1:5]]
+    main(*(arguments or [1000, 50, 50, 5000]))
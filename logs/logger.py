@@ -1,16 +1,157 @@
 """
 This module contains a function for setting up a logger from a configuration file.
+
+Records are handed to a queue on the calling thread, and formatted and written
+by a background `QueueListener`, so the event loop never blocks on stdout.
+
+The pipeline is configured through the environment:
+- LOG_LEVEL: the default level, e.g. INFO.
+- LOG_LEVELS: per-module levels, e.g. "discord=WARNING,wavelink=INFO,events=DEBUG".
+  Keys match logger names (and their children) or module names.
+- LOG_FORMAT: "text" or "json" (JSON lines).
+- LOG_RATE_LIMIT / LOG_RATE_WINDOW: at most LOG_RATE_LIMIT records below WARNING
+  per call site every LOG_RATE_WINDOW seconds. 0 disables sampling.
 """
+import atexit
+import copy
+import json
+import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import time
 
 import yaml
 
+_listener: logging.handlers.QueueListener | None = None
+
+## Record attribute holding how many similar records RateLimitFilter dropped before it.
+SUPPRESSED = "suppressed"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class LevelOverrideFilter(logging.Filter):
+    """
+    Applies per-module levels.
+    Most of the bot logs through the root logger, so module names are matched as well.
+    """
+
+    def __init__(self, default: int, overrides: dict[str, int]) -> None:
+        super().__init__()
+        self.default = default
+        self.overrides = overrides
+
+    def level_for(self, record: logging.LogRecord) -> int:
+        """Returns the minimum level for the record."""
+        name = record.name
+        while name:
+            if name in self.overrides:
+                return self.overrides[name]
+            name = name.rpartition(".")[0]
+        return self.overrides.get(record.module, self.default)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= self.level_for(record)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `rate` records per call site every `window` seconds.
+    Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rate: int, window: float) -> None:
+        super().__init__()
+        self.rate = rate
+        self.window = window
+        ## (pathname, lineno): [window start, records let through, records dropped]
+        self.sites: dict[tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        site = self.sites.setdefault((record.pathname, record.lineno), [now, 0, 0])
+
+        if now - site[0] >= self.window:
+            if site[2]:
+                ## Noted beside msg and args, the handler adds it to its own copy.
+                setattr(record, SUPPRESSED, site[2])
+            site[:] = [now, 0, 0]
+
+        if site[1] >= self.rate:
+            site[2] += 1
+            return False
+
+        site[1] += 1
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The trade-off: the event loop never pays for formatting, but the record is
+    formatted later, on another thread, with its live `args`. An argument that is
+    changed meanwhile is logged as it is then.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        suppressed = getattr(record, SUPPRESSED, 0)
+        if suppressed:
+            record = copy.copy(record)
+            record.msg = f"{record.msg} [suppressed {suppressed} similar messages]"
+        return record
+
+
+def _parse_levels(value: str) -> dict[str, int]:
+    levels: dict[str, int] = {}
+    for entry in value.split(","):
+        if "=" not in entry:
+            continue
+        name, _, level = entry.partition("=")
+        levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {k: v for k, v in levels.items() if isinstance(v, int)}
+
+
+def _stop_listener() -> None:
+    """
+    Flushes and stops the current listener, if it is running.
+    """
+    global _listener  # pylint:disable=global-statement
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logging(path: str = "config.yaml"):
     """
-    Sets up a logger from a configuration file.
+    Sets up a logger from a configuration file,
+    then moves the configured handlers behind a queue.
     """
+    global _listener  # pylint:disable=global-statement
+
     # Directory containing this script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     # Path to the configuration file
@@ -18,4 +159,46 @@ def setup_logging(path: str = "config.yaml"):
 
     with open(config_path, "rt", encoding="utf-8") as file:
         config = yaml.safe_load(file.read())
-        logging.config.dictConfig(config)
+
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        for handler in config.get("handlers", {}).values():
+            handler["formatter"] = "json"
+
+    logging.config.dictConfig(config)
+
+    default_level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+    if not isinstance(default_level, int):
+        default_level = logging.INFO
+    overrides = _parse_levels(os.getenv("LOG_LEVELS", ""))
+
+    root = logging.getLogger()
+    ## The root level is the lowest level anyone asked for,
+    ## so disabled debug calls stay cheap.
+    root.setLevel(min([default_level, *overrides.values()]))
+    for name, level in overrides.items():
+        logging.getLogger(name).setLevel(level)
+
+    _stop_listener()
+
+    handlers = list(root.handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(LevelOverrideFilter(default_level, overrides))
+    queue_handler.addFilter(
+        RateLimitFilter(
+            rate=int(os.getenv("LOG_RATE_LIMIT", "20")),
+            window=float(os.getenv("LOG_RATE_WINDOW", "10")),
+        )
+    )
+
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    ## Registered once, however many times logging is set up.
+    atexit.unregister(_stop_listener)
+    atexit.register(_stop_listener)
@@ -7,22 +7,42 @@
 """
 
 import asyncio
+import json
 import logging as logger
 import os
 import typing
 
+## Imported first, so the startup profile can time every import after it.
+from src.utils.startup import startup
+
 import discord
 import wavelink
 from discord.ext import commands
+from discord.state import ConnectionState
 
 from logs.logger import setup_logging
 from src.credentials.loader import EnvLoader
+from src.essentials.gateway import cache_options, connection_state
+from src.essentials.tree import BraumTree
 from src.utils.cogs_loader import cog_loader, cog_reloader
+from src.utils.metrics import metrics
+from src.utils.readiness import readiness
 from src.utils.responses import Responses
-from rich import inspect
+from src.utils.runtime import http_session, run, select
+from src.utils.search import track_search
+from src.utils.sessions import (
+    detach_players,
+    resume_session,
+    session_store,
+    snapshot,
+)
+from src.utils.views import PlayerControlsView
 
 env_loader = EnvLoader.load_env()
-setup_logging()
+with startup.measure("setup logging"):
+    setup_logging()
+runtime = select(env_loader.runtime)
+startup.mark("imports done")
 
 
 class Bot(commands.Bot):
@@ -33,6 +53,9 @@ class Bot(commands.Bot):
         intents.guilds = True
         intents.voice_states = True
 
+        ## Set before super().__init__, which builds the connection state.
+        self.cache_profile = env_loader.gateway_cache
+
         command_prefix = "$$$"
         help_command = None
         activity = discord.Activity(
@@ -45,14 +68,42 @@ class Bot(commands.Bot):
             command_prefix=command_prefix,
             help_command=help_command,
             activity=activity,
+            tree_cls=BraumTree,
+            **cache_options(self.cache_profile),
         )
+        self.tree.store_path = env_loader.command_sync_store
+
+    def _get_state(self, **options) -> ConnectionState:
+        return connection_state(self, self.cache_profile, **options)
 
     async def setup_hook(self) -> None:
         """
         Setup hook, better than putting this in on_ready event.
         """
         logger.info("Setting up the Hook!")
+        startup.mark("logged in")
 
+        ## Register the player controls once, they are routed by custom_id.
+        self.add_view(PlayerControlsView(responses=Responses()))
+
+        ## Only sync the command scopes that changed since the last sync.
+        if env_loader.command_sync != "off":
+            try:
+                await self.tree.sync_changed(
+                    dry_run=env_loader.command_sync == "dry-run"
+                )
+            except discord.HTTPException:
+                logger.exception("Failed to sync the command tree at startup")
+        startup.mark("command tree synced")
+
+        ## Connect to Lavalink next to the gateway instead of before it,
+        ## commands wait for the node meanwhile, see src/utils/readiness.py.
+        self.node_task = asyncio.create_task(self.connect_nodes())
+
+    async def connect_nodes(self) -> None:
+        """
+        Connects to the Lavalink server, wavelink reconnects on its own afterwards.
+        """
         logger.info(
             "Using Lavalink host:port >> %s:%s",
             os.getenv("LAVAHOST"),
@@ -67,19 +118,42 @@ class Bot(commands.Bot):
             node_docker: wavelink.Node = wavelink.Node(
                 uri=f"http://{env_loader.lavalink_host}:{env_loader.lavalink_port}",
                 password=env_loader.lavalink_pass,
+                session=http_session(runtime),
+                resume_timeout=env_loader.lavalink_resume_timeout,
             )
+            ## Resume the session of the last run, if Lavalink still has it.
+            session_store.load()
+            resume_session(node_docker, session_store)
 
             await wavelink.Pool.connect(
                 nodes=[node_docker],
                 client=self,
             )
-        except Exception as esx:
+        except Exception:  # pylint:disable=broad-except
             logger.exception("Failed to connect to lavalink server")
-            raise esx
+            return
+        readiness.notify()
+        startup.mark("lavalink connected")
+
+    async def close(self) -> None:
+        """
+        Saves the session and leaves the players playing on Lavalink,
+        so they are reattached after a restart, see src/utils/sessions.py.
+        """
+        if env_loader.lavalink_resume_timeout > 0 and wavelink.Pool.nodes:
+            try:
+                session_store.save(snapshot(self))
+            except OSError:
+                logger.exception("Failed to save the Lavalink session")
+            else:
+                detach_players(self)
+        await super().close()
 
     ### Bot Events
     async def on_ready(self):
         """This event runs when the bot is connected and ready to be used."""
+        startup.mark("gateway ready")
+        startup.finish()
 
         ## Create task to connect to the lavalink server.
         lines = "~~~" * 30
@@ -121,6 +195,8 @@ class Bot(commands.Bot):
                     "Was not able to send a logging message for [on_guild_join]."
                     "Logging channel is not a text channel."
                 )
+        from rich import inspect  ## Only needed here, kept out of startup.
+
         inspect(guild)
         # First, try to send message to system channel
         if (
@@ -252,14 +328,17 @@ class Bot(commands.Bot):
         """
         Returns the player for the guild.
         """
-        return wavelink.Pool().get_node().get_player(guild_id)
+        node = readiness.node()
+        return node.get_player(guild_id) if node is not None else None
 
 
 async def main():
     """main function"""
 
     async with Bot() as bot:
-        await cog_loader(client=bot)
+        with startup.measure("load cogs"):
+            await cog_loader(client=bot)
+        startup.mark("cogs loaded")
 
         @bot.command(name="sync")
         @commands.guild_only()
@@ -267,7 +346,7 @@ async def main():
         async def _sync(
             ctx: commands.Context,
             guilds: commands.Greedy[discord.Object],
-            spec: typing.Optional[typing.Literal["~", "*", "^"]] = None,
+            spec: typing.Optional[typing.Literal["~", "*", "^", "+", "?"]] = None,
         ) -> None:
             """
             A normal client.command for syncing app_commands.tree
@@ -278,7 +357,20 @@ async def main():
             !sync * -> copies all global app commands to current guild and syncs
             !sync ^ -> clears all commands from the current guild target and syncs (removes guild commands)
             !sync id_1 id_2 -> syncs guilds with id 1 and 2
+            !sync + -> syncs only the scopes that changed since their last sync
+            !sync ? -> dry run, lists the scopes that changed
             """
+            if not guilds and spec in ("+", "?"):
+                changes = await ctx.bot.tree.sync_changed(dry_run=spec == "?")
+                report = "\n".join(
+                    f"{change.scope}: {change.commands} commands" for change in changes
+                )
+                await ctx.send(
+                    f"{'Would sync' if spec == '?' else 'Synced'} "
+                    f"{len(changes)} scopes.\n{report}"[:1900]
+                )
+                return
+
             if not guilds:
                 if spec == "~":
                     synced = await ctx.bot.tree.sync(guild=ctx.guild)
@@ -333,9 +425,32 @@ async def main():
             await cog_reloader(client=bot)
             await ctx.send("Cogs are being reloaded")
 
+        @bot.command(name="metrics")
+        @commands.guild_only()
+        @commands.is_owner()
+        async def _metrics(
+            ctx: commands.Context,
+        ) -> None:
+            """
+            Shows the in-process metrics for Braum
+            """
+            dump = json.dumps(metrics.snapshot(), indent=1, default=str)
+            await ctx.send(f"```json\n{dump[:1900]}\n```")
+
+        @bot.command(name="unresolved")
+        @commands.guild_only()
+        @commands.is_owner()
+        async def _unresolved(ctx: commands.Context, count: int = 20) -> None:
+            """
+            Shows the queries Lavalink failed to resolve the most
+            """
+            worst = track_search.unresolved.worst(count)
+            lines = "\n".join(f"{failures:>5} {query}" for query, failures in worst)
+            await ctx.send(f"```\n{(lines or 'Nothing failed yet.')[:1900]}\n```")
+
         await bot.start(token=env_loader.bot_token)
 
 
 if __name__ == "__main__":
     assert env_loader.bot_token is not None, "NO TOKEN IN .ENV file"
-    asyncio.run(main())
+    run(main(), runtime)
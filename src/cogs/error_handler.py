@@ -3,14 +3,18 @@
 import logging as logger
 
 import discord
-import wavelink
 from discord.ext import commands
 
+from src.essentials.context import PlayerContext
 from src.essentials.errors import (
+    BreakerOpen,
+    DeadlineExceeded,
     MissingConnectionPermissions,
     MustBeSameChannel,
+    NodeUnavailable,
     NotConnectedToVoice,
 )
+from src.utils.responder import Responder
 from src.utils.responses import Responses
 
 
@@ -30,25 +34,36 @@ class ErrorHandler(commands.Cog):
         error: discord.app_commands.AppCommandError,
     ):
         """Triggers when a error is raised."""
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         if isinstance(error, NotConnectedToVoice):
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.user_not_in_vc()
             )
         if isinstance(error, MustBeSameChannel):
-            player: wavelink.Player = (
-                wavelink.Pool().get_node().get_player(interaction.guild.id)
-            )
-            return await interaction.followup.send(
+            player = PlayerContext.resolve(interaction).player
+            return await responder.send(
                 embed=await self.responses.already_in_voicechannel(
                     channel=player.channel
                 )
             )
         if isinstance(error, MissingConnectionPermissions):
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.no_connection_permissions()
             )
+        if isinstance(getattr(error, "original", error), DeadlineExceeded):
+            logger.warning("Interaction ran out of time: %s", error)
+            return await responder.send(
+                embed=await self.responses.request_timed_out()
+            )
+        if isinstance(getattr(error, "original", error), BreakerOpen):
+            return await responder.send(
+                embed=await self.responses.service_unavailable()
+            )
+        if isinstance(getattr(error, "original", error), NodeUnavailable):
+            return await responder.send(
+                embed=await self.responses.music_unavailable()
+            )
 
 
 async def setup(bot):
@@ -1,15 +1,21 @@
 """Discord cog for all Wavelink events"""
 
 import logging as logger
+import time
+
 import discord
 
 import wavelink
 from discord.ext import commands
 
 from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+from src.utils.overload import Stage, overload
+from src.utils.player import BraumPlayer
+from src.utils.readiness import readiness
 from src.utils.responses import Responses
 
-from src.utils.views import PlayerControlsView
+from src.utils.views import ControlsState, render_controls
 
 
 class MusicEvents(commands.Cog):
@@ -32,6 +38,21 @@ class MusicEvents(commands.Cog):
         """
         logger.info("Node: <{%s}> is ready!", payload.node.identifier)
         logger.info("Node status = %s", payload.node.status)
+        readiness.notify()
+
+    @commands.Cog.listener()
+    async def on_wavelink_node_closed(
+        self, node: wavelink.Node, disconnected: list[wavelink.Player]
+    ):
+        """
+        Fires when a node is closed, taking its players with it.
+        """
+        logger.warning(
+            "Node: <{%s}> closed, %s players disconnected",
+            node.identifier,
+            len(disconnected),
+        )
+        readiness.notify()
 
     @commands.Cog.listener()
     async def on_wavelink_track_end(self, payload: wavelink.TrackEndEventPayload):
@@ -39,30 +60,32 @@ class MusicEvents(commands.Cog):
         Fires when a track ends.
         """
 
-        player = payload.player
+        player: BraumPlayer = payload.player
         track = payload.track
 
-        if hasattr(player, "custom_queue"):
-            custom_queue: wavelink.Queue = player.custom_queue
-            custom_queue.history.put(track)
+        if player is None:
+            logger.warning("Track ended without a player: %s", payload.reason)
+            return
+
+        player.trim_history()
 
         logger.info("Track ended because of reason: %s", payload.reason)
 
         # Reset filters after all songs in the queue have been played.
-        if hasattr(player, "nightcore") and player.nightcore:
-            player.nightcore = False
-            filters: wavelink.Filters = player.filters
-            filters.timescale.reset()
-            await player.set_filters(filters)
+        if player.filter_preset is not None:
+            await player.reset_preset()
 
         # Cleanup the "now playing" message that was sent in "track_start" event.
-        if hasattr(player, "now_playing_message") and player.now_playing_message:
+        if player.now_playing_message is not None:
             try:
                 await player.now_playing_message.delete()
             except discord.errors.NotFound:
                 logger.warning("Tried to delete a message that no longer exists.")
             player.now_playing_message = None
 
+        if not overload.allows(Stage.LOG_EMBEDS):
+            return
+
         logging_channel = self.bot.get_channel(
             int(self.env.logging_id)
         )  ## Retrieve the logging channel.
@@ -89,7 +112,7 @@ class MusicEvents(commands.Cog):
         )
         logger.debug("Track started with payload: %s", track.raw_data)
 
-        player: wavelink.Player = payload.player
+        player: BraumPlayer = payload.player
 
         if not player:
             logger.error(
@@ -99,25 +122,25 @@ class MusicEvents(commands.Cog):
             )
             return
 
+        if player.play_requested_at is not None:
+            ## Time from the /play command to the first audio of the session.
+            time_to_first_audio = (time.monotonic() - player.play_requested_at) * 1000
+            player.play_requested_at = None
+            metrics.observe("time_to_first_audio_ms", time_to_first_audio)
+            logger.info(
+                "Time to first audio in guild=(%s): %.0fms",
+                player.guild,
+                time_to_first_audio,
+            )
+
         embed = await self.responses.display_track(
             player,
             payload.track,
         )  ## Build the track info embed.
 
-        if hasattr(player, "reply"):
-            view = PlayerControlsView(responses=self.responses)
-
-            view.previous.disabled = False
-            if hasattr(player, "custom_queue"):
-                if player.custom_queue.history.is_empty:
-                    view.previous.disabled = True
-
-            view.for_you.style = discord.ButtonStyle.grey
-            view.for_you.emoji = "🚀"
-
-            if player.autoplay == wavelink.AutoPlayMode.enabled:
-                view.for_you.style = discord.ButtonStyle.green
-                view.for_you.emoji = "<a:I_Check:812904249175834644>"
+        if player.reply is not None:
+            ## The layout is cached, clicks are routed to the persistent PlayerControlsView.
+            view = render_controls(ControlsState.from_player(player))
 
             reply: discord.interactions.InteractionChannel = player.reply
 
@@ -134,6 +157,9 @@ class MusicEvents(commands.Cog):
                     "Tried to send a message to a channel where the bot has no permissions.\n Buttons might now show correctly.."
                 )
 
+        if not overload.allows(Stage.LOG_EMBEDS):
+            return
+
         logging_channel = self.bot.get_channel(
             int(self.env.logging_id)
         )  ## Retrieve the logging channel.
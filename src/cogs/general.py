@@ -7,6 +7,7 @@ from discord import app_commands
 from discord.ext import commands
 
 from src.utils.functions import Functions
+from src.utils.responder import Responder
 from src.utils.responses import Responses
 
 
@@ -30,9 +31,9 @@ class General(commands.Cog):
         """
         Shows the 10 latest releases
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.display_new_releases(
                 await self.functions.get_new_releases()
             )
@@ -45,9 +46,9 @@ class General(commands.Cog):
         """
         Shows the trending chart
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.display_trending(
                 await self.functions.get_trending()
             )
@@ -60,11 +61,11 @@ class General(commands.Cog):
         """
         Vote command for top.gg
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         embed, view = await self.responses.display_vote()
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=embed, view=view
         )  ## Display the vote embed.
 
@@ -73,11 +74,11 @@ class General(commands.Cog):
         """
         Show the embed for joining Braums support server
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         embed, view = await self.responses.display_support()
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=embed, view=view
         )  ## Display the vote embed.
 
@@ -86,11 +87,11 @@ class General(commands.Cog):
         """
         Invite link for braum
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         embed, view = await self.responses.display_invite()
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=embed, view=view
         )  ## Display the invite embed.
 
@@ -102,9 +103,10 @@ class General(commands.Cog):
         """
         Search command for
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+        await responder.defer()  ## Searching always takes a while.
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.display_search(search_query)
         )  ## Display the invite embed.
 
@@ -112,24 +114,25 @@ class General(commands.Cog):
         """
         Fetch the lyrics of the current song.
         """
-        await interaction.response.defer(
-            ephemeral=True
+        responder = Responder.of(
+            interaction, ephemeral=True
         )  ## Send as an ephemeral to avoid clutter.
+        await responder.defer()  ## Genius is slow, defer right away.
 
         if not (current_track := await self.functions.get_track(interaction.guild)):
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         if current_track.source != "spotify":
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.display_lyrics_error_only_spotify_song_allowed()
             )
 
         lyrics = await self.functions.get_lyrics(current_track)
 
         if not lyrics:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.lyrics_not_found(current_track)
             )
 
@@ -138,13 +141,13 @@ class General(commands.Cog):
         )  ## Retrieve the lyrics and embed it.
 
         try:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=lyrics_embed
             )  ## Display the lyrics embed.
         except (
             discord.HTTPException
         ):  ## If the lyrics are more than 4096 characters, respond.
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.lyrics_too_long()
             )
 
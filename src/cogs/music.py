@@ -1,21 +1,43 @@
 """Discord Cog for all Music commands"""
 
+import asyncio
 import logging as logger
 import re
+import time
+from collections import OrderedDict
+from typing import Literal, Optional
 
 import discord
 import wavelink
 from discord import app_commands
 from discord.ext import commands
 
+from src.essentials.context import PlayerContext
+from src.essentials.errors import (
+    BreakerOpen,
+    DeadlineExceeded,
+    SpotifyRateLimited,
+)
 from src.essentials.checks import (
     allowed_to_connect,
     in_same_channel,
     member_in_voicechannel,
 )
 from src.utils.functions import Functions
+from src.utils.metrics import metrics
+from src.utils.overload import Stage, overload
+from src.utils.player import BraumPlayer
+from src.utils.quotas import admit
+from src.utils.readiness import readiness
+from src.utils.responder import Responder
 from src.utils.responses import Responses
+from src.utils.search import track_search
 from src.utils.spotify_models import SpotifyTrack
+from src.utils.spotify_scheduler import Priority
+from src.utils.track_queue import ShuffleMode
+
+## How many autocomplete results are kept for when Spotify is slow or busy.
+AUTOCOMPLETE_CACHE_SIZE = 256
 
 
 class Music(commands.Cog):
@@ -27,6 +49,24 @@ class Music(commands.Cog):
         self.bot = bot
         self.responses = Responses()
         self.functions = Functions()
+        ## Recent autocomplete choices, query: choices.
+        self.autocomplete_cache: OrderedDict[str, list[app_commands.Choice[str]]] = (
+            OrderedDict()
+        )
+
+    async def interaction_check(  # pylint:disable=invalid-overridden-method
+        self, interaction: discord.Interaction
+    ) -> bool:
+        """
+        Runs before the command checks.
+        Waits for a Lavalink node if none is connected yet,
+        then resolves the player once so checks and command bodies can share it.
+        """
+        if readiness.node() is None:
+            Responder.of(interaction)  ## Defers if the wait gets long.
+            await readiness.wait()
+        PlayerContext.resolve(interaction)
+        return True
 
     @app_commands.command(name="join", description="Braum joins your voice channel.")
     @allowed_to_connect()
@@ -36,7 +76,7 @@ class Music(commands.Cog):
         """
         /Join command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
         voice_channel: discord.channel.VocalGuildChannel = (
             interaction.user.voice.channel  # type:ignore
         )
@@ -45,12 +85,12 @@ class Music(commands.Cog):
         logger.info("Joining %s", voice_channel)
 
         if not guild.voice_client:  # If user is in a VC and bot is not, join it.
-            await voice_channel.connect(cls=wavelink.Player, self_deaf=True)
+            await voice_channel.connect(cls=BraumPlayer, self_deaf=True)
 
             embed = await self.responses.in_vc()
-            return await interaction.followup.send(embed=embed)
+            return await responder.send(embed=embed)
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.already_in_vc()
         )
 
@@ -61,15 +101,15 @@ class Music(commands.Cog):
         """
         /leave command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
         guild: discord.Guild = interaction.guild
         if not guild.voice_client:  # If bot is not in a VC, respond.
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.already_left_vc()
             )
 
         await interaction.guild.voice_client.disconnect()
-        return await interaction.followup.send(embed=await self.responses.left_vc())
+        return await responder.send(embed=await self.responses.left_vc())
 
     @app_commands.command(
         name="pause", description="Braum pauses the currently playing track."
@@ -80,29 +120,27 @@ class Music(commands.Cog):
         """
         /pause command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
+        ## Retrieve the current player and track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        if not track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve currently playing track's info.
-        track = await self.functions.get_track(interaction.guild)
-
         # If the player is already paused, respond
         if player.paused:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.already_paused(track)
             )
 
         ## If the current track is not paused, pause it.
         await player.pause(not player.paused)
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.common_track_actions(track, "Paused")
         )
 
@@ -115,29 +153,27 @@ class Music(commands.Cog):
         """
         /resume command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
+        ## Retrieve the current player and track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        if not track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve currently playing track's info.
-        track = await self.functions.get_track(interaction.guild)
-
         ## If the current track is paused, resume it.
         if player.paused:
             await player.pause(not player.paused)
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.common_track_actions(track, "Resumed")
             )
 
         ## Otherwise, respond.
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.already_resumed(track)
         )
 
@@ -150,22 +186,19 @@ class Music(commands.Cog):
         """
         /stop command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+
+        ## Retrieve the current player and track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
-        if not await self.functions.get_track(
-            interaction.guild
-        ):  ## If nothing is playing, respond.
-            return await interaction.followup.send(
+        if not track:  ## If nothing is playing, respond.
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## If bot is in a VC, stop the currently playing track.
-        ## Retrieve currently playing track's info.
-        track = await self.functions.get_track(interaction.guild)
-
-        ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
-        await interaction.followup.send(
+        await responder.send(
             embed=await self.responses.common_track_actions(track, "Stopped")
         )
 
@@ -181,20 +214,19 @@ class Music(commands.Cog):
         """
         /skip command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+
+        ## Retrieve the current player and track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        if not track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
-
-        ## Retrieve currently playing track's info.
-        track = await self.functions.get_track(interaction.guild)
-        await interaction.followup.send(
+        await responder.send(
             embed=await self.responses.common_track_actions(track, "Skipped")
         )
 
@@ -206,21 +238,18 @@ class Music(commands.Cog):
         """
         /queue command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        if not await self.functions.get_player(
-            interaction.guild
-        ) or not await self.functions.get_track(interaction.guild):
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.player or not ctx.track:
             ## If nothing is playing, respond.
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## Show the queue.
-        return await interaction.followup.send(
-            embed=await self.responses.show_queue(
-                await self.functions.get_queue(interaction.guild), interaction.guild
-            )
+        return await responder.send(
+            embed=await self.responses.show_queue(ctx.queue, ctx.player)
         )
 
     @app_commands.command(
@@ -231,105 +260,88 @@ class Music(commands.Cog):
         """
         /history command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        player = await self.functions.get_player(interaction.guild)
+        player = PlayerContext.resolve(interaction).player
 
-        if not hasattr(player, "custom_queue"):
-            return await interaction.followup.send(
-                embed=await self.responses.nothing_in_history()
-            )
-
-        history_tracks: wavelink.Queue = player.custom_queue.history
-        if not history_tracks:
-            return await interaction.followup.send(
+        history = player.track_history if player is not None else []
+        if not history:
+            return await responder.send(
                 embed=await self.responses.nothing_in_history()
             )
 
         ## Show the queue.
-        return await interaction.followup.send(
-            embed=await self.responses.show_history(list(history_tracks), interaction)
+        return await responder.send(
+            embed=await self.responses.show_history(history, interaction)
         )
 
     @app_commands.command(name="shuffle", description="Braum shuffles the queue.")
+    @app_commands.describe(
+        mode="random (default), fair: everyone takes turns, or off: back to the order tracks were added."
+    )
     @in_same_channel()
     @member_in_voicechannel()
-    async def shuffle(self, interaction: discord.Interaction):
+    async def shuffle(
+        self,
+        interaction: discord.Interaction,
+        mode: Literal["random", "fair", "off"] = "random",
+    ):
         """
-        /shuffle command
+        /shuffle command. Shuffling only changes how the next track is picked,
+        so it is instant and /shuffle off restores the original order.
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+
+        ## Retrieve the current player, queue and track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        if not track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve the current queue.
-        queue = await self.functions.get_queue(interaction.guild)
-
-        ## Retrieve the current track.
-        track = await self.functions.get_track(interaction.guild)
-
-        ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
-
+        shuffle_mode = ShuffleMode(mode)
         ## If there are no tracks in the queue, respond.
-        if len(queue) == 0:
-            return await interaction.followup.send(
+        if len(player.queue) == 0 and shuffle_mode is not ShuffleMode.OFF:
+            return await responder.send(
                 embed=await self.responses.empty_queue()
             )
 
-        else:
-            ## Shuffle the queue.
-            await self.functions.shuffle(queue)
-
-            ## If the queue loop is not enabled, place the current track at the end of the queue.
-            if not player.queue_loop:
-                ## Add the current track to the end of the queue.
-                player.queue.put(track)
-            return await interaction.followup.send(
-                embed=await self.responses.shuffled_queue()
-            )
+        ## Shuffle the queue.
+        await self.functions.shuffle(player.queue, shuffle_mode)
+        return await responder.send(
+            embed=await self.responses.shuffled_queue(shuffle_mode)
+        )
 
     @app_commands.command(name="nightcore", description="Braum enables nightcore mode.")
     async def nightcore(self, interaction: discord.Interaction):
         """
         /nightcore command sets the filter to a nightcore.
         """
-        await interaction.response.defer()
-
-        ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
-                embed=await self.responses.nothing_is_playing()
-            )
+        responder = Responder.of(interaction)
 
         ## Retrieve the current player.
-        player = await self.functions.get_player(interaction.guild)
-        if not player:
-            return await interaction.followup.send(
+        ctx = PlayerContext.resolve(interaction)
+        player = ctx.player
+
+        ## If nothing is playing, respond.
+        if not player or not ctx.track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## If nightcore mode is already enabled, respond.
-        if hasattr(player, "nightcore") and player.nightcore:
-
-            player.nightcore = False
-            filters: wavelink.Filters = player.filters
-            filters.timescale.reset()
-            await player.set_filters(filters)
-            return await interaction.followup.send(
+        if player.nightcore:
+            await player.reset_preset()
+            return await responder.send(
                 embed=await self.responses.nightcore_disable()
             )
 
         ## Enable nightcore mode.
-        player.nightcore = True
-        filters: wavelink.Filters = player.filters
-        filters.timescale.set(pitch=1.2, speed=1.2, rate=1)
-        await player.set_filters(filters)
-        return await interaction.followup.send(
+        await player.apply_preset("nightcore")
+        return await responder.send(
             embed=await self.responses.nightcore_enable()
         )
 
@@ -340,26 +352,24 @@ class Music(commands.Cog):
         """
         Displays the currently playing song.
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        player = wavelink.Pool().get_node().get_player(interaction.guild.id)
+        ctx = PlayerContext.resolve(interaction)
+        player = ctx.player
         if not player:
             # handle edge cases
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## If nothing is playing, respond.
         if not player.playing:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve currently playing track's info.
-        track = await self.functions.get_track(interaction.guild)
-
-        return await interaction.followup.send(
-            embed=await self.responses.display_track(player, track, True)
+        return await responder.send(
+            embed=await self.responses.display_track(player, ctx.track, True)
         )
 
     @app_commands.command(name="volume", description="Braum adjusts the volume.")
@@ -372,64 +382,151 @@ class Music(commands.Cog):
         """
         Sets the volume %
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## Volume cannot be greater than 100%.
         if volume_percentage > 100:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.volume_too_high()
             )
 
         ## Adjust the volume to the specified percentage.
-        await self.functions.modify_volume(interaction.guild, volume_percentage)
-        return await interaction.followup.send(
+        await ctx.player.set_volume(volume_percentage)
+        return await responder.send(
             embed=await self.responses.volume_set(percentage=volume_percentage)
         )
 
     @app_commands.command(
-        name="remove", description="Braum removes a track from the queue."
+        name="remove",
+        description="Braum removes a track, or a range of tracks, from the queue.",
     )
     @app_commands.describe(
-        track_index="The number of track to remove. Find out the track number using /queue."
+        track_index="The number of track to remove. Find out the track number using /queue.",
+        until="Also remove every track up to this number.",
     )
     @in_same_channel()
     @member_in_voicechannel()
-    async def remove(self, interaction: discord.Interaction, *, track_index: int):
+    async def remove(
+        self,
+        interaction: discord.Interaction,
+        *,
+        track_index: int,
+        until: Optional[int] = None,
+    ):
         """
         /remove command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
+        ## Remove a range of tracks.
+        if until is not None and until != track_index:
+            if not 1 <= track_index < until or track_index > len(ctx.queue):
+                return await responder.send(
+                    embed=await self.responses.track_not_in_queue()
+                )
+            removed = await self.functions.remove_tracks(
+                ctx.queue, track_index, min(until, len(ctx.queue))
+            )
+            return await responder.send(
+                embed=await self.responses.removed_tracks(removed)
+            )
+
         ## Store the info beforehand as the track will be removed.
         remove_msg = await self.responses.queue_track_actions(
-            await self.functions.get_queue(interaction.guild), track_index, "Removed"
+            ctx.queue, track_index, "Removed"
         )
 
         ## If the track exists in the queue, respond.
         if remove_msg:
             ## Remove the track.
-            await self.functions.remove_track(
-                await self.functions.get_queue(interaction.guild), track_index
-            )
-            return await interaction.followup.send(embed=remove_msg)
+            await self.functions.remove_track(ctx.queue, track_index)
+            return await responder.send(embed=remove_msg)
 
         ## If the track was not removed, respond.
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.track_not_in_queue()
         )
 
+    @app_commands.command(
+        name="move",
+        description="Braum moves a track to another position in the queue.",
+    )
+    @app_commands.describe(
+        from_index="The number of track to move. Find out the track number using /queue.",
+        to_index="The number it should have in the queue.",
+    )
+    @app_commands.rename(from_index="from", to_index="to")
+    @in_same_channel()
+    @member_in_voicechannel()
+    async def move(
+        self, interaction: discord.Interaction, *, from_index: int, to_index: int
+    ):
+        """
+        /move command
+        """
+        responder = Responder.of(interaction)
+
+        ## If nothing is playing, respond.
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.track:
+            return await responder.send(
+                embed=await self.responses.nothing_is_playing()
+            )
+
+        ## Both positions must exist in the queue.
+        if not (
+            1 <= from_index <= len(ctx.queue) and 1 <= to_index <= len(ctx.queue)
+        ):
+            return await responder.send(
+                embed=await self.responses.track_not_in_queue()
+            )
+
+        track = await self.functions.move_track(ctx.queue, from_index, to_index)
+        return await responder.send(
+            embed=await self.responses.moved_track(track, to_index)
+        )
+
+    @app_commands.command(
+        name="dedupe", description="Braum removes duplicate tracks from the queue."
+    )
+    @in_same_channel()
+    @member_in_voicechannel()
+    async def dedupe(self, interaction: discord.Interaction):
+        """
+        /dedupe command, keeps the first of every duplicate.
+        """
+        responder = Responder.of(interaction)
+
+        ## If nothing is playing, respond.
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.track:
+            return await responder.send(
+                embed=await self.responses.nothing_is_playing()
+            )
+
+        ## If there are no tracks in the queue, respond.
+        if len(ctx.queue) == 0:
+            return await responder.send(embed=await self.responses.empty_queue())
+
+        removed = ctx.queue.dedupe()
+        return await responder.send(
+            embed=await self.responses.deduped_queue(removed)
+        )
+
     @app_commands.command(
         name="skipto", description="Braum skips to a specific track in the queue."
     )
@@ -442,29 +539,30 @@ class Music(commands.Cog):
         """
         /skipto command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        ctx = PlayerContext.resolve(interaction)
+        if not ctx.track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## Store the info beforehand as the track will be removed.
         skipped_msg = await self.responses.queue_track_actions(
-            await self.functions.get_queue(interaction.guild), track_index, "Skipped to"
+            ctx.queue, track_index, "Skipped to"
         )
 
         ## If the track exists in the queue, respond.
         if skipped_msg:
             ## Skip to the requested track.
-            await self.functions.skipto_track(interaction.guild, track_index)
+            await self.functions.skipto_track(ctx.player, track_index)
             ## Stop the currently playing track.
             await interaction.guild.voice_client.stop()
-            return await interaction.followup.send(embed=skipped_msg)
+            return await responder.send(embed=skipped_msg)
 
         ## If the track was not skipped, respond.
-        return await interaction.followup.send(
+        return await responder.send(
             embed=await self.responses.track_not_in_queue()
         )
 
@@ -475,31 +573,30 @@ class Music(commands.Cog):
         """
         /empty command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+
+        ## Retrieve the current player and queue.
+        ctx = PlayerContext.resolve(interaction)
+        player, queue = ctx.player, ctx.queue
 
         ## If nothing is playing, respond.
-        if not await self.functions.get_track(interaction.guild):
-            return await interaction.followup.send(
+        if not ctx.track:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## If bot is in a VC, empty the queue.
         elif interaction.guild.voice_client:
-            ## Retrieve the current queue.
-            queue = await self.functions.get_queue(interaction.guild)
-
-            ## Retrieve the player.
-            player = await self.functions.get_player(interaction.guild)
 
             ## If there are no tracks in the queue, respond.
             if len(queue) == 0:
-                return await interaction.followup.send(
+                return await responder.send(
                     embed=await self.responses.empty_queue()
                 )
 
             ## Otherwise, clear the queue.
             player.queue.clear()
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.cleared_queue()
             )
 
@@ -512,30 +609,28 @@ class Music(commands.Cog):
         """
         /loop command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
-        ## Retrieve the player.
-        player: wavelink.Player = await self.functions.get_player(interaction.guild)
+        ## Retrieve the player and the currently playing track.
+        ctx = PlayerContext.resolve(interaction)
+        player, track = ctx.player, ctx.track
 
         ## If nothing is playing, respond.
-        if not player.playing:  # includes paused.
-            return await interaction.followup.send(
+        if not player or not player.playing:  # includes paused.
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
-        ## Retrieve the currently playing track.
-        track = await self.functions.get_track(interaction.guild)
-
         if player.queue.mode == wavelink.QueueMode.loop:
             player.queue.mode = wavelink.QueueMode.normal
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.common_track_actions(
                     track, "Stopped looping"
                 )
             )
         else:
             player.queue.mode = wavelink.QueueMode.loop
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.common_track_actions(track, "Looping")
             )
 
@@ -548,26 +643,26 @@ class Music(commands.Cog):
         """
         /queueloop command
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
 
         ## Retrieve the player.
-        player = await self.functions.get_player(interaction.guild)
+        player = PlayerContext.resolve(interaction).player
 
         ## If nothing is playing, respond.
-        if not player.playing:
-            return await interaction.followup.send(
+        if not player or not player.playing:
+            return await responder.send(
                 embed=await self.responses.nothing_is_playing()
             )
 
         ## If there is less than 1 track in the queue and there is not a current queueloop, respond.
         if len(player.queue) < 1:
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.less_than_1_track()
             )
 
         if player.queue.mode == wavelink.QueueMode.loop_all:
             player.queue.mode = wavelink.QueueMode.normal
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.common_track_actions(
                     None, "Stopped looping the queue"
                 )
@@ -575,7 +670,7 @@ class Music(commands.Cog):
         else:
             player.queue.mode = wavelink.QueueMode.loop_all
 
-            return await interaction.followup.send(
+            return await responder.send(
                 embed=await self.responses.common_track_actions(
                     None, "Looping the queue"
                 )
@@ -599,7 +694,8 @@ class Music(commands.Cog):
         If a spotify link is entered, it will be added to the queue.
         If a track name is entered, it will be searched and added to the queue.
         """
-        await interaction.response.defer()
+        responder = Responder.of(interaction)
+        await responder.defer()  ## Searching always takes a while.
         logger.info(
             "/Play command executed with search=(%s), by=(%s), in the guild=(%s)",
             search,
@@ -607,9 +703,17 @@ class Music(commands.Cog):
             interaction.guild,
         )
 
-        # SEARCH FOR TRACKS
+        # SEARCH FOR TRACKS AND CONNECT TO THE VOICE CHANNEL AT THE SAME TIME
+        started = time.monotonic()
+        search_task = asyncio.create_task(self._timed_search(search))
+        connect_task: asyncio.Task | None = None
+        if not interaction.guild.voice_client:
+            connect_task = asyncio.create_task(
+                self._timed_connect(interaction.user.voice.channel)
+            )
+
         try:
-            found_tracks: wavelink.Search = await wavelink.Playable.search(search)
+            found_tracks: wavelink.Search = await search_task
         except wavelink.exceptions.LavalinkLoadException as e:
             logger.warning(
                 "Nothing critical, but searching for tracks failed: %s %s",
@@ -617,38 +721,34 @@ class Music(commands.Cog):
                 {"search": search},
                 exc_info=True,
             )
-            logger.info("Sending out [Unable to find any results!] embed")
-            return await interaction.followup.send(
-                embed=await self.responses.no_track_results()
-            )
+            found_tracks = None
+        except BaseException:
+            await self._abort_connect(interaction, connect_task)
+            raise
+
         if not found_tracks:
             ## If no results are found or an invalid query was entered, respond.
             logger.info(
                 "did not find any tracks. Sending out [Unable to find any results!] embed: %s",
                 {"search": search},
             )
-            return await interaction.followup.send(
+            await self._abort_connect(interaction, connect_task)
+            return await responder.send(
                 embed=await self.responses.no_track_results()
             )
 
-        # CONNECT TO VOICE CHANNEL
-        if not interaction.guild.voice_client:
-            player: wavelink.Player = await interaction.user.voice.channel.connect(
-                cls=wavelink.Player, self_deaf=True
-            )
+        if connect_task is not None:
+            player: BraumPlayer = await connect_task
+            ## The context was resolved before the player existed.
+            PlayerContext.resolve(interaction).refresh(interaction)
         else:
             ## Otherwise, initalize voice_client.
-            player: wavelink.Player = interaction.guild.voice_client
+            player: BraumPlayer = interaction.guild.voice_client
 
         # INITIALIZE PLAYER ATTRIBUTES
         player.reply = interaction.channel
         player.now_playing_message = None
 
-        if not hasattr(player, "custom_queue"):
-            # Store all tracks in a custom queue.
-            # This is meant to deliver a better history experience. (see /history)
-            player.custom_queue = wavelink.Queue(history=True)
-
         # Automatically play the next track in the queue.
         # But not recommendations.
         if player.autoplay == wavelink.AutoPlayMode.disabled:
@@ -659,13 +759,24 @@ class Music(commands.Cog):
             # A track has been found
             logger.info("User entered a track. Adding to queue. %s", search)
             track = found_tracks[0]
+            admission = admit(player, [track], interaction.user.id)
+            if admission.refused is not None:
+                ## Leave again if this /play joined the channel.
+                await self._abort_connect(interaction, connect_task)
+                return await responder.send(
+                    embed=await self.responses.queue_limit_reached(admission.refused)
+                )
+            track.extras = {"requester_id": interaction.user.id}
             await player.queue.put_wait(track)
             if not player.playing:
                 # If nothing is playing, play the song.
+                player.play_requested_at = started
                 await player.play(player.queue.get(), volume=50)
 
-            return await interaction.followup.send(
-                embed=await self.responses.added_track(track, interaction.user)
+            return await responder.send(
+                embed=await self.responses.added_track(
+                    track, interaction.user, player
+                )
             )
 
         # ADD PLAYLIST TO QUEUE AND PLAY IT
@@ -681,8 +792,14 @@ class Music(commands.Cog):
                 "url": playlist.url,
             },
         )
-        for i, track in enumerate(tracks):
-            logger.info(
+        admission = admit(player, tracks, interaction.user.id)
+        if not admission.tracks:
+            await self._abort_connect(interaction, connect_task)
+            return await responder.send(
+                embed=await self.responses.queue_limit_reached(admission.refused)
+            )
+        for i, track in enumerate(admission.tracks):
+            logger.debug(
                 "Adding track to queue: %s",
                 {
                     "source": track.source,
@@ -690,11 +807,14 @@ class Music(commands.Cog):
                     "identifier": track.identifier,
                 },
             )
+            track.extras = {"requester_id": interaction.user.id}
             await player.queue.put_wait(track)
-            if i == 1 and not player.playing:
+            if i == 0 and not player.playing:
+                # Start playing as soon as the first track is queued.
+                player.play_requested_at = started
                 await player.play(player.queue.get(), volume=50)
 
-        return await interaction.followup.send(
+        return await responder.send(
             embed=(
                 await self.responses.display_playlist(
                     playlist,
@@ -703,10 +823,54 @@ class Music(commands.Cog):
                         if playlist.type and playlist.type == "playlist"
                         else "Album"
                     ),
+                    queued=len(admission.tracks),
+                    refused=admission.refused,
                 )
             )
         )
 
+    async def _timed_search(self, search: str) -> wavelink.Search:
+        """
+        Searches Lavalink, racing the sources if needed, and records how long it took.
+        """
+        started = time.monotonic()
+        try:
+            return await track_search.search(search)
+        finally:
+            metrics.observe("play_search_ms", (time.monotonic() - started) * 1000)
+
+    async def _timed_connect(
+        self, channel: discord.channel.VocalGuildChannel
+    ) -> BraumPlayer:
+        """
+        Connects to the voice channel and records how long the handshake took.
+        """
+        started = time.monotonic()
+        player = await channel.connect(cls=BraumPlayer, self_deaf=True)
+        metrics.observe("play_connect_ms", (time.monotonic() - started) * 1000)
+        return player
+
+    async def _abort_connect(
+        self, interaction: discord.Interaction, connect_task: asyncio.Task | None
+    ) -> None:
+        """
+        Leaves again after a voice connection started by /play, when nothing
+        was queued.
+        The handshake is not cancelled: once wavelink sent the voice state update,
+        cancelling it leaves the bot in the channel with an orphaned player.
+        """
+        if connect_task is None:
+            return
+
+        try:
+            await connect_task
+        except Exception:  # pylint:disable=broad-except
+            logger.debug("Voice connection for /play failed.", exc_info=True)
+
+        voice_client = interaction.guild.voice_client
+        if voice_client is not None:
+            await voice_client.disconnect(force=True)
+
     @play.autocomplete("search")
     async def play_autocomplete(
         self,
@@ -719,19 +883,32 @@ class Music(commands.Cog):
         """
         limit = 7
 
+        if not overload.allows(Stage.AUTOCOMPLETE):
+            ## Overloaded, no network calls. Serve what we have, or what the user typed.
+            return self._cached_choices(current) or (
+                [app_commands.Choice(name=current[:100], value=current)]
+                if current.strip()
+                else []
+            )
+
         if current.strip() == "":
             # When no search query has been entered, display trending songs.
+            trending_choice: list[SpotifyTrack] = []
             try:
-                trending: dict = await self.functions.get_trending()
+                trending: dict = await self.functions.get_trending(
+                    priority=Priority.AUTOCOMPLETE
+                )
 
                 trending_choice: list[SpotifyTrack] = SpotifyTrack.from_search_results(
                     [track["track"] for track in trending["items"]]
                 )
+            except (SpotifyRateLimited, DeadlineExceeded, BreakerOpen):
+                logger.info("Trending autocomplete was shed, timed out or rejected.")
             except Exception as e:
                 logger.error("Error getting trending songs: %s", e, exc_info=True)
 
             if not trending_choice:
-                return [
+                return self._cached_choices(current) or [
                     app_commands.Choice(
                         name="The only song you should listen to!",
                         value="https://open.spotify.com/track/6ctO0maVSlFzn31wR0GpNg",
@@ -739,7 +916,7 @@ class Music(commands.Cog):
                 ]
 
             my_tracks = self.format_songs_to_autocomplete(trending_choice)
-            return my_tracks
+            return self._remember_choices(current, my_tracks)
 
         if "https://" in current.lower().strip() and not (
             "open.spotify.com" in current.lower() or "youtube.com" in current.lower()
@@ -758,11 +935,18 @@ class Music(commands.Cog):
                 ),
             ]
 
-        query_searched = await self.functions.search_songs(
-            current.lower(),
-            category="track",
-            limit=limit,
-        )
+        try:
+            query_searched = await self.functions.search_songs(
+                current.lower(),
+                category="track",
+                limit=limit,
+                priority=Priority.AUTOCOMPLETE,
+            )
+        except (SpotifyRateLimited, DeadlineExceeded, BreakerOpen):
+            ## Spotify is busy, slow or down, serve what we have, or let the user play what they typed.
+            return self._cached_choices(current) or [
+                app_commands.Choice(name=current[:100], value=current)
+            ]
         formatted_track_results: list[SpotifyTrack] = (
             await self.functions.format_query_search_results_track(
                 search_results=query_searched, limit=limit
@@ -780,7 +964,34 @@ class Music(commands.Cog):
                     value=song.external_urls,
                 )
             )
-        return my_tracks
+        return self._remember_choices(current, my_tracks)
+
+    def _remember_choices(
+        self, current: str, choices: list[app_commands.Choice[str]]
+    ) -> list[app_commands.Choice[str]]:
+        """
+        Caches the choices for a query, to be served when Spotify cannot answer in time.
+        """
+        key = current.lower().strip()
+        self.autocomplete_cache[key] = choices
+        self.autocomplete_cache.move_to_end(key)
+        if len(self.autocomplete_cache) > AUTOCOMPLETE_CACHE_SIZE:
+            self.autocomplete_cache.popitem(last=False)
+        return choices
+
+    def _cached_choices(self, current: str) -> list[app_commands.Choice[str]] | None:
+        """
+        Returns the cached choices for the query, or for its longest cached prefix.
+        """
+        key = current.lower().strip()
+        if not key:  ## Trending is cached under the empty query.
+            return self.autocomplete_cache.get(key)
+
+        for end in range(len(key), 0, -1):
+            if (choices := self.autocomplete_cache.get(key[:end])) is not None:
+                metrics.inc("autocomplete_cache_hits")
+                return choices
+        return None
 
     def format_songs_to_autocomplete(
         self,
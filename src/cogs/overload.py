@@ -0,0 +1,63 @@
+"""Discord cog that samples load for the overload controller"""
+
+import asyncio
+import logging as logger
+import time
+
+import wavelink
+from discord.ext import commands, tasks
+
+from src.utils.overload import overload
+
+
+class OverloadMonitor(commands.Cog):
+    """
+    Measures event loop lag and Lavalink frame stats,
+    and lets the overload controller re-evaluate what is shed.
+    """
+
+    bot: commands.Bot
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.sample.start()
+
+    async def cog_unload(self) -> None:
+        self.sample.cancel()
+
+    @staticmethod
+    async def measure_lag() -> float:
+        """
+        Seconds a callback waits in the event loop's ready queue.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        started = time.monotonic()
+        loop.call_soon(future.set_result, None)
+        await future
+        return time.monotonic() - started
+
+    @tasks.loop(seconds=1)
+    async def sample(self) -> None:
+        overload.observe_lag(await self.measure_lag())
+        overload.update()
+
+    @sample.error
+    async def on_sample_error(self, error: BaseException) -> None:
+        logger.error("Overload monitor failed: %s", error, exc_info=error)
+
+    @commands.Cog.listener()
+    async def on_wavelink_stats_update(
+        self, payload: wavelink.StatsEventPayload
+    ) -> None:
+        if payload.frames is not None:
+            overload.observe_frames(
+                payload.frames.sent, payload.frames.nulled, payload.frames.deficit
+            )
+
+
+async def setup(bot):
+    """
+    Setup the cog.
+    """
+    await bot.add_cog(OverloadMonitor(bot))
@@ -0,0 +1,210 @@
+"""Discord Cog for saved playlists"""
+
+import logging as logger
+import time
+
+import discord
+import wavelink
+from discord import app_commands
+from discord.ext import commands
+
+from src.essentials.checks import (
+    allowed_to_connect,
+    in_same_channel,
+    member_in_voicechannel,
+)
+from src.essentials.context import PlayerContext
+from src.utils.metrics import metrics
+from src.utils.player import BraumPlayer
+from src.utils.playlists import (
+    MAX_NAME_LENGTH,
+    decode_tracks,
+    guild_owner,
+    playlist_store,
+    user_owner,
+)
+from src.utils.quotas import admit
+from src.utils.readiness import readiness
+from src.utils.responder import Responder
+from src.utils.responses import Responses
+
+
+@app_commands.guild_only()
+class Playlists(commands.GroupCog, group_name="playlist"):
+    """
+    Saves a queue as a playlist of encoded tracks, and queues it again
+    without searching, see src/utils/playlists.py.
+    """
+
+    bot: commands.Bot
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.responses = Responses()
+
+    async def interaction_check(  # pylint:disable=invalid-overridden-method
+        self, interaction: discord.Interaction
+    ) -> bool:
+        """
+        Waits for a Lavalink node if none is connected yet, like the Music cog.
+        """
+        if readiness.node() is None:
+            Responder.of(interaction)
+            await readiness.wait()
+        return True
+
+    @staticmethod
+    def owner(interaction: discord.Interaction, server: bool) -> str:
+        if server:
+            return guild_owner(interaction.guild_id)
+        return user_owner(interaction.user.id)
+
+    @app_commands.command(
+        name="save", description="Braum saves the queue as a playlist."
+    )
+    @app_commands.describe(
+        name="The playlist's name, an existing playlist with that name is replaced.",
+        server="Save it for the whole server instead of only for you.",
+    )
+    async def save_playlist(
+        self,
+        interaction: discord.Interaction,
+        name: app_commands.Range[str, 1, MAX_NAME_LENGTH],
+        server: bool = False,
+    ):
+        """
+        /playlist save command, saves the current track and the queue.
+        """
+        responder = Responder.of(interaction)
+        player = PlayerContext.resolve(interaction).player
+        if player is None or (not player.current and not player.queue):
+            return await responder.send(
+                embed=await self.responses.nothing_is_playing()
+            )
+        if server and not interaction.user.guild_permissions.manage_guild:
+            return await responder.send(
+                embed=await self.responses.cannot_save_server_playlist()
+            )
+
+        tracks = [player.current] if player.current else []
+        tracks += list(player.queue)
+        encoded = [track.encoded for track in tracks]
+        owner = self.owner(interaction, server)
+        if not await playlist_store.save(owner, name, encoded):
+            return await responder.send(
+                embed=await self.responses.too_many_playlists()
+            )
+
+        logger.info(
+            "Saved playlist=(%s) of %s tracks, server=(%s), in the guild=(%s)",
+            name,
+            len(encoded),
+            server,
+            interaction.guild,
+        )
+        metrics.inc("playlists_saved")
+        return await responder.send(
+            embed=await self.responses.saved_playlist(name, len(encoded), server)
+        )
+
+    @app_commands.command(name="load", description="Braum queues a saved playlist.")
+    @app_commands.describe(
+        name="The playlist's name.",
+        server="Load one of the server's playlists instead of one of yours.",
+    )
+    @allowed_to_connect()
+    @in_same_channel()
+    @member_in_voicechannel()
+    async def load_playlist(
+        self,
+        interaction: discord.Interaction,
+        name: app_commands.Range[str, 1, MAX_NAME_LENGTH],
+        server: bool = False,
+    ):
+        """
+        /playlist load command, decodes the saved tracks and queues them at once.
+        """
+        responder = Responder.of(interaction)
+        started = time.monotonic()
+
+        encoded = await playlist_store.load(self.owner(interaction, server), name)
+        if encoded is None:
+            return await responder.send(
+                embed=await self.responses.playlist_not_found(name)
+            )
+        tracks = decode_tracks(encoded)
+        for track in tracks:
+            track.extras = {"requester_id": interaction.user.id}
+
+        player: BraumPlayer = interaction.guild.voice_client
+        joined = player is None
+        if joined:
+            player = await interaction.user.voice.channel.connect(
+                cls=BraumPlayer, self_deaf=True
+            )
+            PlayerContext.resolve(interaction).refresh(interaction)
+        player.reply = interaction.channel
+        if player.autoplay == wavelink.AutoPlayMode.disabled:
+            player.autoplay = wavelink.AutoPlayMode.partial
+
+        admission = admit(player, tracks, interaction.user.id)
+        if not admission.tracks:
+            if joined:
+                await player.disconnect(force=True)
+            return await responder.send(
+                embed=await self.responses.queue_limit_reached(admission.refused)
+            )
+
+        ## One bulk insert, however long the playlist is.
+        player.queue.put(admission.tracks)
+        if not player.playing:
+            player.play_requested_at = started
+            await player.play(player.queue.get(), volume=50)
+
+        metrics.observe("playlist_load_ms", (time.monotonic() - started) * 1000)
+        return await responder.send(
+            embed=await self.responses.loaded_playlist(
+                name, len(admission.tracks), len(encoded), admission.refused
+            )
+        )
+
+    @load_playlist.autocomplete("name")
+    async def load_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[str]]:
+        """
+        Suggests the saved playlists, the server's with `server` set.
+        """
+        server = bool(getattr(interaction.namespace, "server", False))
+        playlists = await playlist_store.playlists(self.owner(interaction, server))
+        current = current.casefold()
+        return [
+            app_commands.Choice(
+                name=f"{playlist.name} ({playlist.tracks} tracks)"[:100],
+                value=playlist.name,
+            )
+            for playlist in playlists
+            if current in playlist.name.casefold()
+        ]
+
+    @app_commands.command(
+        name="list", description="Braum shows your and the server's saved playlists."
+    )
+    async def list_playlists(self, interaction: discord.Interaction):
+        """
+        /playlist list command
+        """
+        responder = Responder.of(interaction)
+        return await responder.send(
+            embed=await self.responses.show_playlists(
+                await playlist_store.playlists(user_owner(interaction.user.id)),
+                await playlist_store.playlists(guild_owner(interaction.guild_id)),
+            )
+        )
+
+
+async def setup(bot):
+    """
+    Setup the cog.
+    """
+    await bot.add_cog(Playlists(bot))
@@ -0,0 +1,141 @@
+"""Discord cog that disconnects idle players and reports what queues hold"""
+
+import logging as logger
+import time
+
+import discord
+import wavelink
+from discord.ext import commands, tasks
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+from src.utils.player import BraumPlayer
+from src.utils.quotas import export_memory
+from src.utils.readiness import readiness
+from src.utils.responses import Responses
+
+## Idle states, checked in this order.
+ALONE = "alone"
+PAUSED = "paused"
+STOPPED = "stopped"
+
+
+class IdleReaper(commands.Cog):
+    """
+    Periodically disconnects players that have been idle for too long,
+    and releases their queues and history.
+    Also exports how many tracks the queues hold and their estimated memory.
+    """
+
+    bot: commands.Bot
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.responses = Responses()
+        self.env = EnvLoader.load_env()
+
+        self.thresholds = {
+            ALONE: self.env.idle_alone_timeout,
+            PAUSED: self.env.idle_paused_timeout,
+            STOPPED: self.env.idle_stopped_timeout,
+        }
+        ## guild_id: (idle state, monotonic time the state was first seen)
+        self.idle_since: dict[int, tuple[str, float]] = {}
+
+        self.reap.change_interval(seconds=self.env.idle_check_interval)
+        self.reap.start()
+
+    async def cog_unload(self) -> None:
+        self.reap.cancel()
+
+    @staticmethod
+    def idle_state(player: BraumPlayer) -> str | None:
+        """
+        Returns why the player is idle, or None if it is in use.
+        """
+        channel = player.channel
+        if channel is None or all(member.bot for member in channel.members):
+            return ALONE
+        if player.paused:
+            return PAUSED
+        if not player.playing and player.queue.is_empty:
+            return STOPPED
+        return None
+
+    @tasks.loop(seconds=30)
+    async def reap(self) -> None:
+        """
+        Checks every player and disconnects the ones over their idle threshold.
+        """
+        now = time.monotonic()
+        seen: set[int] = set()
+        players: list[BraumPlayer] = []
+
+        for node in wavelink.Pool.nodes.values():
+            for guild_id, player in node.players.items():
+                seen.add(guild_id)
+                players.append(player)
+                state = self.idle_state(player)
+
+                if state is None:
+                    self.idle_since.pop(guild_id, None)
+                    continue
+
+                previous = self.idle_since.get(guild_id)
+                if previous is None or previous[0] != state:
+                    self.idle_since[guild_id] = (state, now)
+                    continue
+
+                if now - previous[1] >= self.thresholds[state]:
+                    self.idle_since.pop(guild_id, None)
+                    await self.reclaim(player, state)
+
+        ## Forget players that are gone.
+        for guild_id in set(self.idle_since) - seen:
+            del self.idle_since[guild_id]
+
+        metrics.set_gauge("players_idle", len(self.idle_since))
+        export_memory(players)
+        readiness.node()  ## Refreshes the node availability gauges.
+
+    @reap.before_loop
+    async def before_reap(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @reap.error
+    async def on_reap_error(self, error: BaseException) -> None:
+        logger.error("Idle reaper failed: %s", error, exc_info=error)
+
+    async def reclaim(self, player: BraumPlayer, reason: str) -> None:
+        """
+        Notifies the channel, releases the queues and disconnects the player.
+        """
+        logger.info(
+            "Disconnecting idle player in guild=(%s), reason=(%s)", player.guild, reason
+        )
+
+        if player.reply is not None:
+            try:
+                await player.reply.send(
+                    embed=await self.responses.left_due_to_inactivity(),
+                    delete_after=60,
+                )
+            except discord.HTTPException:
+                logger.warning("Could not send the inactivity message.")
+
+        player.release()
+
+        try:
+            await player.disconnect()
+        except Exception:  # pylint:disable=broad-except
+            logger.exception("Failed to disconnect an idle player.")
+            return
+
+        metrics.inc("players_reaped", reason=reason)
+
+
+async def setup(bot):
+    """
+    Setup the cog.
+    """
+    await bot.add_cog(IdleReaper(bot))
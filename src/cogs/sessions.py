@@ -0,0 +1,77 @@
+"""Discord cog that keeps the Lavalink session resumable"""
+
+import asyncio
+import logging as logger
+
+import wavelink
+from discord.ext import commands, tasks
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+from src.utils.sessions import reattach, session_store, snapshot
+
+
+class SessionKeeper(commands.Cog):
+    """
+    Periodically saves the session snapshot, and reattaches the players
+    when Lavalink resumed a session, see src/utils/sessions.py.
+    """
+
+    bot: commands.Bot
+
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        self.env = EnvLoader.load_env()
+        self.reattaching: set[asyncio.Task] = set()
+        ## Nodes that were ready before. Later resumes are websocket drops mid-run,
+        ## whose players are still attached.
+        self.ready_nodes: set[str] = set()
+
+        if self.env.lavalink_resume_timeout > 0:
+            self.save.change_interval(seconds=self.env.session_snapshot_interval)
+            self.save.start()
+
+    async def cog_unload(self) -> None:
+        self.save.cancel()
+
+    @commands.Cog.listener()
+    async def on_wavelink_node_ready(self, payload: wavelink.NodeReadyEventPayload):
+        """
+        Reattaches the players of a session resumed at startup,
+        once the gateway is ready.
+        """
+        first_ready = payload.node.identifier not in self.ready_nodes
+        self.ready_nodes.add(payload.node.identifier)
+        if not payload.resumed:
+            metrics.inc("lavalink_sessions", result="new")
+            return
+
+        logger.info("Node %s resumed its session.", payload.node.identifier)
+        metrics.inc("lavalink_sessions", result="resumed")
+        if not first_ready:
+            return
+        task = asyncio.create_task(reattach(self.bot, payload.node, session_store))
+        self.reattaching.add(task)
+        task.add_done_callback(self.reattaching.discard)
+
+    @tasks.loop(seconds=30)
+    async def save(self) -> None:
+        """
+        Saves the session snapshot, in case the bot stops without closing.
+        """
+        await session_store.save_async(snapshot(self.bot))
+
+    @save.before_loop
+    async def before_save(self) -> None:
+        await self.bot.wait_until_ready()
+
+    @save.error
+    async def on_save_error(self, error: BaseException) -> None:
+        logger.error("Saving the session snapshot failed: %s", error, exc_info=error)
+
+
+async def setup(bot):
+    """
+    Setup the cog.
+    """
+    await bot.add_cog(SessionKeeper(bot))
@@ -2,7 +2,7 @@
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional
 
 import dotenv
 
@@ -17,6 +17,11 @@ class EnvLoader:  # pylint:disable=too-many-instance-attributes
 
     # Bot Info
     bot_token: Optional[str]
+    command_sync: str
+    command_sync_store: str
+    gateway_cache: str
+    runtime: str
+    playlist_store: str
     vote_url: Optional[str]
     invite_url: Optional[str]
     support_server_url: Optional[str]
@@ -25,11 +30,22 @@ class EnvLoader:  # pylint:disable=too-many-instance-attributes
     lavalink_host: Optional[str]
     lavalink_port: Optional[str]
     lavalink_pass: Optional[str]
+    lavalink_resume_timeout: int
+    readiness_timeout: float
+    session_store: str
+    session_snapshot_interval: int
+
+    # Track search
+    search_sources: list[str]
+    search_hedge_delay: float
+    search_unresolved_ttl: float
 
     # Spotify Credentials
     spotify_client_id: Optional[str]
     spotify_client_secret: Optional[str]
     spotify_trending_id: Optional[str]
+    spotify_rate: float
+    spotify_burst: int
 
     # Logging Channel
     logging_id: Optional[str]
@@ -40,15 +56,49 @@ class EnvLoader:  # pylint:disable=too-many-instance-attributes
     # Genius
     genius: Optional[str]
 
+    # Idle player reaper, thresholds in seconds.
+    idle_check_interval: int
+    idle_paused_timeout: int
+    idle_stopped_timeout: int
+    idle_alone_timeout: int
+
+    # Overload controller targets.
+    overload_lag_ms: float
+    overload_pending: int
+    overload_frame_deficit: float
+
+    # Queue quotas, durations in seconds, 0 disables a limit.
+    queue_max_tracks: int
+    queue_max_duration: int
+    queue_max_user_tracks: int
+    queue_max_user_duration: int
+    queue_history_size: int
+
+    ## Loaded once per process, shared by every module and cog.
+    _loaded: ClassVar[Optional["EnvLoader"]] = None
+
     @classmethod
     def load_env(cls):
         """
-        Loads all environment variables
+        Loads all environment variables, once.
         """
+        if cls._loaded is None:
+            cls._loaded = cls._from_environ()
+        return cls._loaded
+
+    @classmethod
+    def _from_environ(cls):
         return cls(
             **{
                 # Bot Info
                 "bot_token": os.getenv("TOKEN"),
+                "command_sync": os.getenv("COMMAND_SYNC", "auto").lower(),
+                "command_sync_store": os.getenv(
+                    "COMMAND_SYNC_STORE", "command_sync.json"
+                ),
+                "gateway_cache": os.getenv("GATEWAY_CACHE", "full").lower(),
+                "runtime": os.getenv("RUNTIME", "default").lower(),
+                "playlist_store": os.getenv("PLAYLIST_STORE", "playlists.db"),
                 "vote_url": os.getenv("VOTE_URL"),
                 "invite_url": os.getenv("INVITE_URL"),
                 "support_server_url": os.getenv("SUPPORT_SERVER_URL"),
@@ -56,12 +106,50 @@ class EnvLoader:  # pylint:disable=too-many-instance-attributes
                 "lavalink_host": os.getenv("LAVAHOST"),
                 "lavalink_port": os.getenv("LAVAPORT"),
                 "lavalink_pass": os.getenv("LAVAPASS"),
+                "lavalink_resume_timeout": int(
+                    os.getenv("LAVALINK_RESUME_TIMEOUT", "60")
+                ),
+                "readiness_timeout": float(os.getenv("READINESS_TIMEOUT", "10")),
+                "session_store": os.getenv("SESSION_STORE", "lavalink_session.json"),
+                "session_snapshot_interval": int(
+                    os.getenv("SESSION_SNAPSHOT_INTERVAL", "30")
+                ),
+                # Track search
+                "search_sources": [
+                    source.strip()
+                    for source in os.getenv(
+                        "SEARCH_SOURCES", "ytmsearch,ytsearch,spsearch,scsearch"
+                    ).split(",")
+                    if source.strip()
+                ],
+                "search_hedge_delay": float(os.getenv("SEARCH_HEDGE_DELAY", "0.75")),
+                "search_unresolved_ttl": float(
+                    os.getenv("SEARCH_UNRESOLVED_TTL", "120")
+                ),
                 # Spotify Credentials
                 "spotify_client_id": os.getenv("SPOTID"),
                 "spotify_client_secret": os.getenv("SPOTCLIENT"),
                 "spotify_trending_id": os.getenv("SPOTIFY_TRENDING_ID"),
+                "spotify_rate": float(os.getenv("SPOTIFY_RATE", "5")),
+                "spotify_burst": int(os.getenv("SPOTIFY_BURST", "10")),
                 "logging_id": os.getenv("LOGID"),
                 "joined_left_channel_id": os.getenv("JOINED_LEFT_CHANNEL_ID"),
                 "genius": os.getenv("GENIUSKEY"),
+                "idle_check_interval": int(os.getenv("IDLE_CHECK_INTERVAL", "30")),
+                "idle_paused_timeout": int(os.getenv("IDLE_PAUSED_TIMEOUT", "1800")),
+                "idle_stopped_timeout": int(os.getenv("IDLE_STOPPED_TIMEOUT", "300")),
+                "idle_alone_timeout": int(os.getenv("IDLE_ALONE_TIMEOUT", "120")),
+                "overload_lag_ms": float(os.getenv("OVERLOAD_LAG_MS", "100")),
+                "overload_pending": int(os.getenv("OVERLOAD_PENDING", "25")),
+                "overload_frame_deficit": float(
+                    os.getenv("OVERLOAD_FRAME_DEFICIT", "0.05")
+                ),
+                "queue_max_tracks": int(os.getenv("QUEUE_MAX_TRACKS", "1000")),
+                "queue_max_duration": int(os.getenv("QUEUE_MAX_DURATION", "86400")),
+                "queue_max_user_tracks": int(os.getenv("QUEUE_MAX_USER_TRACKS", "500")),
+                "queue_max_user_duration": int(
+                    os.getenv("QUEUE_MAX_USER_DURATION", "43200")
+                ),
+                "queue_history_size": int(os.getenv("QUEUE_HISTORY_SIZE", "50")),
             }
         )
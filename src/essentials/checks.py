@@ -12,6 +12,7 @@ import wavelink
 from discord import app_commands
 from discord.ext import commands
 
+from src.essentials.context import PlayerContext
 from src.essentials.errors import (
     MissingConnectionPermissions,
     MustBeInNsfwChannel,
@@ -52,14 +53,9 @@ def player_connected():
             return False
 
         logger.info("Checking if Dj Braum is connected to a voice channel")
-        # player: wavelink.Player = wavelink.NodePool.get_node().get_player(
-        #     interaction.guild.id
-        # )
-        player: wavelink.Player = wavelink.Pool.get_node().get_player(
-            interaction.guild.id
-        )
+        player = PlayerContext.resolve(interaction).player
 
-        if not player.is_connected:
+        if player is None or not player.connected:
             logger.info("Dj Braum is not connected to any voice channel")
             raise PlayerNotConnected("Dj Braum is not connected to any voice channel.")
         logger.info("Dj Braum is connected to a voice channel")
@@ -90,8 +86,7 @@ def in_same_channel():
             return False
 
         logger.debug("Checking if user is in the same voice channel as Dj Braum")
-        # player = wavelink.NodePool.get_node().get_player(interaction.guild.id)
-        player = wavelink.Pool.get_node().get_player(interaction.guild.id)
+        player = PlayerContext.resolve(interaction).player
         if not isinstance(player, wavelink.Player):
             logger.debug(
                 "Dj Braum is not connected to any voice channel, let's connect him"
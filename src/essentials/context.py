@@ -0,0 +1,66 @@
+"""
+This module holds the interaction-scoped player context.
+
+The node, player, queue and current track are looked up once per interaction
+and shared by the checks in `src.essentials.checks` and the command body.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+import wavelink
+
+from src.essentials.errors import NodeUnavailable
+from src.utils.player import BraumPlayer
+
+CONTEXT_KEY = "player_context"
+
+
+@dataclass(slots=True)
+class PlayerContext:
+    """
+    Snapshot of the guild's player state, taken when the interaction arrives.
+    """
+
+    node: wavelink.Node
+    player: Optional[BraumPlayer]
+
+    @property
+    def queue(self) -> Optional[wavelink.Queue]:
+        """The player's queue, or the autoplay queue while the queue is empty."""
+        if self.player is None:
+            return None
+        return self.player.queue or self.player.auto_queue
+
+    @property
+    def track(self) -> Optional[wavelink.Playable]:
+        """The currently playing track, if there is one."""
+        return self.player.current if self.player is not None else None
+
+    @classmethod
+    def resolve(cls, interaction: discord.Interaction) -> "PlayerContext":
+        """
+        Returns the context for this interaction.
+        The lookup only happens the first time, later calls reuse the stored context.
+        Raises NodeUnavailable when no Lavalink node is connected.
+        """
+        context: Optional[PlayerContext] = interaction.extras.get(CONTEXT_KEY)
+        if context is None:
+            try:
+                node = wavelink.Pool.get_node()
+            except wavelink.InvalidNodeException as e:
+                raise NodeUnavailable("No Lavalink node is connected.") from e
+            player = node.get_player(interaction.guild.id) if interaction.guild else None
+            context = cls(node=node, player=player)
+            interaction.extras[CONTEXT_KEY] = context
+        return context
+
+    def refresh(self, interaction: discord.Interaction) -> "PlayerContext":
+        """
+        Re-reads the player, used after the command connected a new one.
+        """
+        self.player = (
+            self.node.get_player(interaction.guild.id) if interaction.guild else None
+        )
+        return self
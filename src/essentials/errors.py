@@ -31,3 +31,33 @@ class MissingConnectionPermissions(CheckFailure):
     """User is not allowed to connect to the voice channel"""
 
     pass
+
+
+class SpotifyRateLimited(Exception):
+    """Spotify request was shed or rate limited"""
+
+    pass
+
+
+class DeadlineExceeded(Exception):
+    """The interaction can no longer be answered in time"""
+
+    pass
+
+
+class DeadlinePassed(DeadlineExceeded):
+    """The deadline passed before an external call started"""
+
+    pass
+
+
+class BreakerOpen(Exception):
+    """An upstream's circuit breaker is open"""
+
+    pass
+
+
+class NodeUnavailable(CheckFailure):
+    """No Lavalink node connected in time"""
+
+    pass
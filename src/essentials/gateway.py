@@ -0,0 +1,82 @@
+"""
+Holds the gateway cache profiles.
+
+Dj Braum only needs guilds, their channels and roles (for permissions), and the
+members that are in a voice channel. The opt-in "low" profile (GATEWAY_CACHE=low)
+keeps just that:
+- members are only cached while they are in a voice channel,
+- no message cache,
+- guild payloads are trimmed of emojis, stickers, threads, stage instances
+  and scheduled events before discord.py parses them.
+
+GATEWAY_CACHE=full, the default, keeps discord.py's defaults.
+Compare both with `python -m benchmarks.gateway_memory`.
+"""
+
+from typing import Any
+
+import discord
+from discord.state import ConnectionState
+
+LOW = "low"
+FULL = "full"
+
+## Guild payload fields the bot never reads.
+TRIMMED_GUILD_FIELDS = (
+    "emojis",
+    "stickers",
+    "threads",
+    "stage_instances",
+    "guild_scheduled_events",
+)
+
+
+def trim_guild_payload(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Drops the fields in TRIMMED_GUILD_FIELDS from a guild payload, in place.
+    """
+    for field in TRIMMED_GUILD_FIELDS:
+        data.pop(field, None)
+    return data
+
+
+class LeanConnectionState(ConnectionState):
+    """
+    ConnectionState that trims guild payloads before caching them.
+    """
+
+    def parse_guild_create(self, data) -> None:
+        super().parse_guild_create(trim_guild_payload(data))
+
+    def parse_guild_update(self, data) -> None:
+        super().parse_guild_update(trim_guild_payload(data))
+
+
+def connection_state(
+    client: discord.Client, profile: str, **options: Any
+) -> ConnectionState:
+    """
+    Builds the client's connection state for the cache profile,
+    used from Client._get_state.
+    """
+    cls = LeanConnectionState if profile == LOW else ConnectionState
+    return cls(
+        dispatch=client.dispatch,
+        handlers=client._handlers,  # pylint:disable=protected-access
+        hooks=client._hooks,  # pylint:disable=protected-access
+        http=client.http,
+        **options,
+    )
+
+
+def cache_options(profile: str) -> dict[str, Any]:
+    """
+    Returns the Client options for the cache profile.
+    """
+    if profile != LOW:
+        return {}
+    return {
+        "max_messages": None,
+        "member_cache_flags": discord.MemberCacheFlags(voice=True, joined=False),
+        "chunk_guilds_at_startup": False,
+    }
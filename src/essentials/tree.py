@@ -0,0 +1,195 @@
+"""
+Command tree used by Dj Braum.
+
+Every scope of the tree (global, or one guild) has a fingerprint: a hash of the
+payload Discord would receive for it. Fingerprints of the last successful syncs are
+stored locally, so at startup only the scopes that changed are synced.
+Guild scopes filled with `copy_global_to` ("!sync *") only exist until a restart,
+they are stored as copies and left to the owner commands.
+"""
+
+import hashlib
+import json
+import logging as logger
+import os
+from typing import NamedTuple, Optional
+
+import discord
+from discord import app_commands
+from discord.abc import Snowflake
+
+from src.utils import deadline
+from src.utils.overload import overload
+
+## Store key for the global scope, guild scopes use the guild id.
+GLOBAL_SCOPE = "global"
+## Prefix of the stored fingerprint of a guild scope copied from the global one.
+COPIED = "copied:"
+
+
+class ScopeChange(NamedTuple):
+    """
+    A scope whose fingerprint differs from the stored one.
+    """
+
+    scope: str
+    stored: Optional[str]
+    current: Optional[str]  ## None when the scope has no commands anymore.
+    commands: int
+
+
+class BraumTree(app_commands.CommandTree):
+    """
+    CommandTree that binds the interaction's deadline, and counts it as in flight,
+    before any command, check or autocomplete runs.
+    Also remembers what it synced, see `sync_changed`.
+    """
+
+    store_path = "command_sync.json"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        ## Guild ids whose commands were copied from the global scope.
+        self._copied: set[int] = set()
+
+    def copy_global_to(self, *, guild: Snowflake) -> None:
+        super().copy_global_to(guild=guild)
+        self._copied.add(guild.id)
+
+    def clear_commands(self, *, guild: Optional[Snowflake], **kwargs) -> None:
+        super().clear_commands(guild=guild, **kwargs)
+        if guild is not None:
+            self._copied.discard(guild.id)
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        deadline.bind(interaction)
+        overload.track()
+        return True
+
+    async def _payload(self, guild: Optional[Snowflake]) -> list[dict]:
+        """
+        The payload `sync` sends for the scope, translations included.
+        """
+        commands = self._get_all_commands(guild=guild)
+        if self.translator:
+            return [
+                await command.get_translated_payload(self.translator)
+                for command in commands
+            ]
+        return [command.to_dict() for command in commands]
+
+    @staticmethod
+    def _hash(payload: list[dict]) -> Optional[str]:
+        if not payload:
+            return None
+        payload = sorted(
+            payload, key=lambda command: (command.get("type", 1), command["name"])
+        )
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def fingerprint(self, guild: Optional[Snowflake] = None) -> Optional[str]:
+        """
+        Returns the hash of the scope's commands, None if it has none.
+        """
+        return self._hash(await self._payload(guild))
+
+    def _load_store(self) -> dict[str, str]:
+        try:
+            with open(self.store_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            logger.warning("Command sync store is unreadable, syncing every scope.")
+            return {}
+
+    def _save_store(self, store: dict[str, str]) -> None:
+        tmp_path = f"{self.store_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(store, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.store_path)
+
+    def _guild_scopes(self) -> set[int]:
+        guild_ids = set(self._guild_commands)
+        guild_ids.update(
+            guild_id for _, guild_id, _ in self._context_menus if guild_id is not None
+        )
+        return guild_ids
+
+    async def changes(self) -> list[ScopeChange]:
+        """
+        Lists the scopes whose commands differ from what was last synced.
+        Guild scopes that were synced before but have no commands anymore are included.
+        """
+        store = self._load_store()
+        scopes: dict[str, Optional[Snowflake]] = {GLOBAL_SCOPE: None}
+        for guild_id in self._guild_scopes() | {
+            int(scope) for scope in store if scope != GLOBAL_SCOPE
+        }:
+            scopes[str(guild_id)] = discord.Object(id=guild_id)
+
+        changes = []
+        for scope, guild in scopes.items():
+            payload = await self._payload(guild)
+            current = self._hash(payload)
+            if current is None and store.get(scope, "").startswith(COPIED):
+                continue  ## Copied with "!sync *", not part of the tree.
+            if current != store.get(scope):
+                changes.append(ScopeChange(scope, store.get(scope), current, len(payload)))
+        return changes
+
+    async def sync(
+        self, *, guild: Optional[Snowflake] = None
+    ) -> list[app_commands.AppCommand]:
+        """
+        Syncs like CommandTree.sync, and records the scope's fingerprint.
+        """
+        synced = await super().sync(guild=guild)
+
+        store = self._load_store()
+        scope = GLOBAL_SCOPE if guild is None else str(guild.id)
+        if (current := await self.fingerprint(guild)) is None:
+            store.pop(scope, None)
+        elif guild is not None and guild.id in self._copied:
+            store[scope] = COPIED + current
+        else:
+            store[scope] = current
+        self._save_store(store)
+        return synced
+
+    async def sync_changed(self, dry_run: bool = False) -> list[ScopeChange]:
+        """
+        Syncs only the scopes that changed since their last sync.
+        With dry_run, only reports them.
+        """
+        changes = await self.changes()
+        for change in changes:
+            logger.info(
+                "%s command scope %s: %s -> %s (%s commands)",
+                "Would sync" if dry_run else "Syncing",
+                change.scope,
+                (change.stored or "none")[:12],
+                (change.current or "none")[:12],
+                change.commands,
+            )
+            if dry_run:
+                continue
+            if change.current is None and change.scope != GLOBAL_SCOPE:
+                ## Could be commands copied with "!sync *", clearing is left to "!sync ^".
+                logger.info("Leaving guild scope %s as it is.", change.scope)
+                continue
+
+            guild = (
+                None
+                if change.scope == GLOBAL_SCOPE
+                else discord.Object(id=int(change.scope))
+            )
+            try:
+                await self.sync(guild=guild)
+            except discord.HTTPException:
+                logger.exception("Failed to sync command scope %s", change.scope)
+
+        if not changes:
+            logger.info("Command tree is unchanged, nothing to sync.")
+        return changes
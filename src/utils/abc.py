@@ -3,24 +3,64 @@ Music helper module.
 Contains all responses and functions!
 """
 
-from typing import Final, Optional
+from functools import cache
+from typing import TYPE_CHECKING, Final, Optional
 
 import discord
-import lyricsgenius
-import spotipy
-from spotipy import Spotify, SpotifyClientCredentials
 
 from src.credentials.loader import EnvLoader
 
+if TYPE_CHECKING:
+    import lyricsgenius
+    import spotipy
+
+
+## spotipy and lyricsgenius are slow to import, and their clients are only needed
+## once someone asks for Spotify data or lyrics. Both are built on first use,
+## once per process.
+
+
+@cache
+def spotify_client() -> "spotipy.Spotify":
+    """
+    Returns the shared Spotify client.
+    """
+    import spotipy  # pylint:disable=import-outside-toplevel
+
+    env = EnvLoader.load_env()
+    ## Retries are disabled, 429s are handled by the spotify_scheduler.
+    return spotipy.Spotify(
+        auth_manager=spotipy.SpotifyClientCredentials(
+            client_id=env.spotify_client_id,
+            client_secret=env.spotify_client_secret,
+        ),
+        retries=0,
+        status_retries=0,
+    )
+
+
+@cache
+def genius_client() -> "lyricsgenius.Genius":
+    """
+    Returns the shared Genius client.
+    """
+    import lyricsgenius  # pylint:disable=import-outside-toplevel
+
+    ## Used to retrieve lyrics.
+    genius = lyricsgenius.Genius(EnvLoader.load_env().genius)
+    genius.verbose = False
+
+    ## Removes [Chorus], [Intro] from the lyrics.
+    genius.remove_section_headers = True
+    genius.skip_non_songs = True
+    return genius
+
 
 class AbstractBaseClass:  # pylint:disable=too-many-instance-attributes
     """
     Abstract Base Class to be inherited by other classes such as Responses or Functions.
     """
 
-    spotify: Spotify
-    genius: lyricsgenius.Genius
-
     err_color: discord.Colour
     sucess_color: discord.Colour
     trending_uri: Optional[str]
@@ -38,20 +78,6 @@ class AbstractBaseClass:  # pylint:disable=too-many-instance-attributes
     def __init__(self):
         self.env = EnvLoader.load_env()
 
-        self.spotify = spotipy.Spotify(
-            auth_manager=SpotifyClientCredentials(
-                client_id=self.env.spotify_client_id,
-                client_secret=self.env.spotify_client_secret,
-            )
-        )
-
-        self.genius = lyricsgenius.Genius(self.env.genius)  ## Used to retrieve lyrics.
-        self.genius.verbose = False
-
-        ## Removes [Chorus], [Intro] from the lyrics.
-        self.genius.remove_section_headers = True
-        self.genius.skip_non_songs = True
-
         self.err_color = discord.Colour.red()  ## Used for unsucesful embeds.
         self.sucess_color = discord.Colour.green()  ## Used for sucessful embeds.
         self.trending_uri = (
@@ -61,6 +87,16 @@ class AbstractBaseClass:  # pylint:disable=too-many-instance-attributes
         self.invite_url = self.env.invite_url
         self.support_url = self.env.support_server_url
 
+    @property
+    def spotify(self) -> "spotipy.Spotify":
+        """Spotify client, built on first use."""
+        return spotify_client()
+
+    @property
+    def genius(self) -> "lyricsgenius.Genius":
+        """Genius client, built on first use."""
+        return genius_client()
+
     async def async_init(self):
         """Add any async initialization code here"""
 
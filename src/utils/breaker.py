@@ -0,0 +1,234 @@
+"""
+Holds the circuit breakers in front of Spotify, Genius and Lavalink search.
+
+A breaker watches the last calls to its upstream. Once too many of them failed,
+or were too slow, it opens and calls fail fast with BreakerOpen instead of piling
+onto a struggling service. After a cooldown a single probe is let through
+(half-open), and its outcome closes or re-opens the breaker.
+
+While an upstream cannot answer, `StaleCache` serves the last good response for the
+same request, marked as stale so the embeds can say so.
+"""
+
+import asyncio
+import contextvars
+import logging as logger
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Optional
+
+import wavelink
+
+from src.essentials.errors import BreakerOpen, DeadlinePassed, SpotifyRateLimited
+from src.utils.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+## Key added to stale dict responses, holding when the response was stored (time.time()).
+STALE_KEY = "braum_stale_since"
+
+## When the upstream request of the current breaker call was sent, see `mark_sent`.
+_sent_at: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "sent_at", default=None
+)
+
+
+def mark_sent() -> None:
+    """
+    Called once a request is actually sent upstream, e.g. by the Spotify scheduler
+    after its token-bucket wait, so only the upstream's own time is timed.
+    """
+    _sent_at.set(time.monotonic())
+
+
+def answered(error: BaseException) -> bool:
+    """
+    Whether the error is the upstream's answer about a single request, e.g. a wrong
+    Spotify ID (a 4xx) or a dead link Lavalink could not load, rather than a failure.
+    """
+    if isinstance(error, wavelink.LavalinkLoadException):
+        return error.severity != "fault"
+    status = getattr(error, "http_status", None)
+    return isinstance(status, int) and 400 <= status < 500
+
+
+class CircuitBreaker:
+    """
+    Error-rate and latency circuit breaker for one upstream.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        slow_call: float = 5.0,
+        cooldown: float = 30.0,
+        ignored: tuple[type[BaseException], ...] = (
+            SpotifyRateLimited,
+            DeadlinePassed,
+        ),
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        ## Calls slower than this (seconds) count as failures, even if they succeeded.
+        self.slow_call = slow_call
+        self.cooldown = cooldown
+        ## Errors that say nothing about the upstream's health, e.g. local shedding
+        ## or a request that was never sent.
+        self.ignored = ignored
+
+        self.state = CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=window)  ## True for a bad call.
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _set_state(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit breaker %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        metrics.set_gauge("breaker_open", int(state != CLOSED), upstream=self.name)
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            metrics.inc("breaker_trips", upstream=self.name)
+
+    def _allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._set_state(HALF_OPEN)
+        ## Half-open, let a single probe through.
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def _record(self, bad: bool) -> None:
+        if self.state == HALF_OPEN:
+            self._probing = False
+            self._outcomes.clear()
+            self._set_state(OPEN if bad else CLOSED)
+            return
+
+        self._outcomes.append(bad)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._outcomes.clear()
+            self._set_state(OPEN)
+
+    async def call(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Awaits func(*args, **kwargs) through the breaker.
+        Raises BreakerOpen without calling the upstream while the breaker is open.
+        """
+        if not self._allow():
+            metrics.inc("breaker_rejected", upstream=self.name)
+            raise BreakerOpen(f"The {self.name} circuit breaker is open.")
+
+        started = time.monotonic()
+        token = _sent_at.set(None)
+        try:
+            result = await func(*args, **kwargs)
+        except (asyncio.CancelledError, *self.ignored):
+            if self.state == HALF_OPEN:
+                self._probing = False  ## Not an answer, let the next call probe.
+            raise
+        except BaseException as error:
+            self._record(bad=not answered(error))
+            raise
+        finally:
+            sent_at = _sent_at.get()
+            _sent_at.reset(token)
+
+        self._record(bad=time.monotonic() - (sent_at or started) > self.slow_call)
+        return result
+
+
+class StaleCache:
+    """
+    Last good responses by request key, served while their upstream is unavailable.
+    """
+
+    def __init__(self, name: str, maxsize: int = 256) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def put(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str, min_length: Optional[int] = None) -> Optional[Any]:
+        """
+        Returns the stale response for the key, marked as stale.
+        With min_length, falls back to the longest cached prefix of the key
+        that is at least min_length characters long.
+        """
+        floor = len(key) if min_length is None else min_length
+        for end in range(len(key), floor - 1, -1):
+            if (entry := self._entries.get(key[:end])) is not None:
+                metrics.inc("stale_served", upstream=self.name)
+                stored_at, value = entry
+                if isinstance(value, dict):
+                    return {**value, STALE_KEY: stored_at}
+                return value
+        return None
+
+    async def serve(
+        self,
+        breaker: CircuitBreaker,
+        key: str,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        min_length: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Calls the upstream through the breaker and remembers the response.
+        When the call fails or is rejected, returns the stale response if there is one,
+        otherwise re-raises. Answers about the request itself (see `answered`)
+        are always raised, old data would only hide bad input.
+        """
+        try:
+            value = await breaker.call(func, *args, **kwargs)
+        except Exception as error:
+            if answered(error):
+                raise
+            stale = self.get(key, min_length=min_length)
+            if stale is None:
+                raise
+            logger.info("Serving a stale %s response for %s", self.name, key)
+            return stale
+
+        if value:
+            self.put(key, value)
+        return value
+
+
+def stale_since(value: Any) -> Optional[float]:
+    """
+    Returns when a stale response was stored (time.time()), or None if it is fresh.
+    """
+    if isinstance(value, dict):
+        return value.get(STALE_KEY)
+    return None
+
+
+spotify_breaker = CircuitBreaker("spotify")
+spotify_stale = StaleCache("spotify")
+
+genius_breaker = CircuitBreaker("genius", slow_call=8.0)
+genius_stale = StaleCache("genius")
@@ -6,12 +6,15 @@ import os
 
 from discord.ext import commands
 
+from src.utils.startup import startup
+
 
 async def cog_loader(client: commands.Bot):
     """unloads all cogs."""
     for filename in os.listdir("src/cogs"):
         if filename.endswith(".py") and not filename.startswith("_"):
-            await client.load_extension(f"src.cogs.{filename[:-3]}")
+            with startup.measure(f"cog {filename[:-3]}"):
+                await client.load_extension(f"src.cogs.{filename[:-3]}")
             logger.info(f"Loaded src.cogs.{filename[:-3]}")
 
 
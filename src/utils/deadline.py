@@ -0,0 +1,96 @@
+"""
+Holds the per-interaction deadline that every external call runs under.
+
+Discord only accepts a response for a limited time, depending on the kind of interaction.
+The deadline is bound once per interaction and stored in a context variable,
+so it follows the interaction into Functions, Responses and the Spotify scheduler
+without being passed around. `within` caps every external call by the time left,
+and refuses to start work that could no longer be delivered.
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Awaitable, Optional, TypeVar
+
+import discord
+
+from src.essentials.errors import DeadlineExceeded, DeadlinePassed
+from src.utils.metrics import metrics
+
+T = TypeVar("T")
+
+## Seconds Discord gives to answer each kind of interaction.
+BUDGETS = {
+    discord.InteractionType.autocomplete: 3.0,
+    discord.InteractionType.component: 3.0,
+    discord.InteractionType.modal_submit: 3.0,
+    ## Commands reply through the Responder, directly within its DEFAULT_BUDGET (1s)
+    ## or else deferred, after which followups work for 15 minutes. Every command
+    ## creates its Responder before any external call, so the 3 second limit on the
+    ## initial response is met by that deferral, and the deadline can be the 15 minutes.
+    discord.InteractionType.application_command: 15 * 60.0,
+}
+DEFERRED_BUDGET = 15 * 60.0
+
+## Time kept in reserve to send the response itself.
+SAFETY_MARGIN = 0.5
+
+## Longest a single external call may take, with or without an interaction.
+CALL_TIMEOUT = 10.0
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+def bind(interaction: discord.Interaction, deferred: bool = False) -> float:
+    """
+    Sets the deadline for the current task from the interaction's kind and age.
+    Returns the deadline, in time.monotonic() seconds.
+    """
+    budget = (
+        DEFERRED_BUDGET if deferred else BUDGETS.get(interaction.type, DEFERRED_BUDGET)
+    )
+    age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    age = min(max(age, 0.0), budget)  ## Guard against clock skew.
+
+    deadline = time.monotonic() + budget - age - SAFETY_MARGIN
+    _deadline.set(deadline)
+    return deadline
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current interaction's deadline, None outside interactions.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def within(awaitable: Awaitable[T], timeout: Optional[float] = CALL_TIMEOUT) -> T:
+    """
+    Awaits an external call, capped by the timeout and the time left on the deadline.
+
+    Raises DeadlineExceeded when the call did not finish in time,
+    or DeadlinePassed without starting it when the deadline has already passed.
+    """
+    left = remaining()
+    limits = [limit for limit in (timeout, left) if limit is not None]
+    if not limits:
+        return await awaitable
+
+    limit = min(limits)
+    if limit <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()  ## Never started, avoid the "never awaited" warning.
+        metrics.inc("deadline_exceeded", stage="before")
+        raise DeadlinePassed("The deadline passed before the call started.")
+
+    try:
+        return await asyncio.wait_for(awaitable, timeout=limit)
+    except asyncio.TimeoutError as exc:
+        metrics.inc("deadline_exceeded", stage="during")
+        raise DeadlineExceeded(f"The call did not finish within {limit:.2f}s.") from exc
@@ -2,19 +2,30 @@
 This file contains basic functionalities for AbstractBaseClass and Responses.
 """
 
+import asyncio
 import logging as logger
-import random
 from time import gmtime, strftime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import discord
 import wavelink
-from lyricsgenius.types import Song
-
-from spotipy import SpotifyException
 
+from src.utils import deadline
 from src.utils.abc import AbstractBaseClass
+from src.utils.breaker import (
+    genius_breaker,
+    genius_stale,
+    spotify_breaker,
+    spotify_stale,
+)
+from src.utils.readiness import readiness
+from src.utils.search import track_search
 from src.utils.spotify_models import SpotifyTrack
+from src.utils.spotify_scheduler import Priority, spotify_scheduler
+from src.utils.track_queue import BraumQueue, ShuffleMode
+
+if TYPE_CHECKING:
+    from lyricsgenius.types import Song
 
 
 class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
@@ -32,9 +43,8 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
         return player.current
 
     async def get_player(self, guild: discord.Guild) -> wavelink.Player | None:
-        """Returns player info."""
-        # return wavelink.NodePool.get_node().get_player(guild.id)
-        return wavelink.Pool.get_node().get_player(guild.id)
+        """Returns player info, waiting for a Lavalink node if none is connected."""
+        return (await readiness.wait()).get_player(guild.id)
 
     async def get_queue(self, guild: discord.Guild) -> wavelink.Queue:
         """Returns the queue."""
@@ -45,9 +55,9 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
             return None
         return player.queue or player.auto_queue
 
-    async def shuffle(self, queue: wavelink.Queue) -> wavelink.Queue:
-        """Shuffles the queue."""
-        return random.shuffle(queue)
+    async def shuffle(self, queue: BraumQueue, mode: ShuffleMode) -> None:
+        """Switches the queue's shuffle mode, the queued order is kept."""
+        queue.set_shuffle(mode)
 
     async def modify_volume(self, guild: discord.Guild, volume: int) -> None:
         """
@@ -67,39 +77,70 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
 
         return None
 
-    async def remove_track(self, queue: wavelink.Queue, track_index: int) -> None:
+    async def remove_track(self, queue: BraumQueue, track_index: int) -> None:
         """
         Remove the track from the queue. 1 is subtracted as the queue starts from 0.
         """
         del queue[track_index - 1]
 
+    async def remove_tracks(
+        self, queue: BraumQueue, first_index: int, last_index: int
+    ) -> list[wavelink.Playable]:
+        """
+        Remove the tracks from first_index to last_index, both included, from the queue.
+        """
+        return queue.remove_range(first_index - 1, last_index)
+
+    async def move_track(
+        self, queue: BraumQueue, from_index: int, to_index: int
+    ) -> wavelink.Playable:
+        """
+        Move a track to another position in the queue. Returns the moved track.
+        """
+        return queue.move(from_index - 1, to_index - 1)
+
     async def skipto_track(
         self,
-        guild: discord.Guild,
+        player: wavelink.Player,
         track_index: int,
     ) -> None:
         """
-        Place a requested track at the front of the queue and remove it from the queue.
+        Move the requested track to the front of the queue, so it plays next.
         """
-        player = await self.get_player(guild)  ## Retrieve the player.
-        queue = await self.get_queue(guild)  ## Retrieve the queue.
-        if isinstance(player, wavelink.Player) and isinstance(queue, wavelink.Queue):
-            player.queue.put_at_front(
-                queue[track_index - 1]
-            )  ## Place the requested track at the front of the queue.
-            del queue[track_index]  ## Remove the track from the queue.
+        queue = player.queue or player.auto_queue  ## Retrieve the queue.
+        if isinstance(queue, BraumQueue):
+            queue.skip_to(track_index - 1)
 
-    async def get_new_releases(self) -> Any | None:
+    async def get_new_releases(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> Any | None:
         """
         Returns 10 newly released tracks from spotify.
         """
-        return self.spotify.new_releases(limit=10)
+        return await spotify_stale.serve(
+            spotify_breaker,
+            "new_releases",
+            spotify_scheduler.run,
+            priority,
+            self.spotify.new_releases,
+            limit=10,
+        )
 
-    async def get_trending(self) -> Any | None:
+    async def get_trending(
+        self, priority: Priority = Priority.INTERACTIVE
+    ) -> Any | None:
         """
         Returns 10 tracks in the trending playlist.
         """
-        return self.spotify.playlist_tracks(self.trending_uri, limit=10)
+        return await spotify_stale.serve(
+            spotify_breaker,
+            "trending",
+            spotify_scheduler.run,
+            priority,
+            self.spotify.playlist_tracks,
+            self.trending_uri,
+            limit=10,
+        )
 
     async def playlist_info(
         self,
@@ -111,7 +152,14 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
         playlist_id = playlist_url.split("/")[-1].split("?")[
             0
         ]  ## Returns only the playlist ID.
-        return self.spotify.playlist(playlist_id)
+        return await spotify_stale.serve(
+            spotify_breaker,
+            f"playlist:{playlist_id}",
+            spotify_scheduler.run,
+            Priority.INTERACTIVE,
+            self.spotify.playlist,
+            playlist_id,
+        )
 
     async def album_info(
         self,
@@ -121,19 +169,25 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
         Returns info about the album.
         """
         album_id = album_url.split("/")[-1].split("?")[0]  ## Returns only the album ID.
-        return self.spotify.album(album_id)
+        return await spotify_stale.serve(
+            spotify_breaker,
+            f"album:{album_id}",
+            spotify_scheduler.run,
+            Priority.INTERACTIVE,
+            self.spotify.album,
+            album_id,
+        )
 
     async def search_spotify_track(self, url: str) -> wavelink.Playable | None:
         """
         Search for a track on Spotify based on a given URL.
         If no track is found, return None.
 
-        Defaults to YouTube for non URL based queries.
+        Non URL based queries are raced across the configured search sources.
         """
         # If spotify is enabled via LavaSrc, this will automatically fetch Spotify tracks if you pass a URL...
         # LavaSrc needs to be configured to use Spotify API. Check application.yml for more details.
-        # Defaults to YouTube for non URL based queries...
-        tracks = await wavelink.Playable.search(url)
+        tracks = await track_search.search(url)
         if not tracks:
             logger.warning("User used an invalid track URL for spotify.%s", url)
             return None
@@ -143,13 +197,20 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
     async def get_lyrics(
         self,
         track: wavelink.Playable,
-    ) -> Optional[Song]:
+    ) -> Optional["Song"]:
         """
         Returns the lyrics of a song. If no lyrics are found, return None.
         Expecting track to be of source "spotify" only.
+
+        Raises DeadlineExceeded or BreakerOpen when Genius cannot answer,
+        unless the lyrics were fetched before.
         """
         self.genius.verbose = True
-        lyrics = self.genius.search_song(track.title, artist=track.author)
+        lyrics = await genius_stale.serve(
+            genius_breaker, f"{track.title}:{track.author}", self._search_lyrics, track
+        )
+
+        from lyricsgenius.types import Song  # pylint:disable=import-outside-toplevel
 
         if not isinstance(lyrics, Song):
             logger.debug(
@@ -160,8 +221,18 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
         logger.info("Lyrics found! track=(%s), artist=(%s)", track.title, track.author)
         return lyrics
 
+    async def _search_lyrics(self, track: wavelink.Playable) -> Optional["Song"]:
+        ## lyricsgenius is blocking, keep it off the event loop.
+        return await deadline.within(
+            asyncio.to_thread(self.genius.search_song, track.title, artist=track.author)
+        )
+
     async def search_songs(
-        self, search_query: str, category: str = "track", limit: int = 10
+        self,
+        search_query: str,
+        category: str = "track",
+        limit: int = 10,
+        priority: Priority = Priority.INTERACTIVE,
     ):
         """
         Search for songs on Spotify based on a given query.
@@ -170,12 +241,23 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
             search_query (str): The search query to use.
             category (str, optional): The category of the search. Defaults to "track".
             limit (int, optional): The maximum number of results to return. Defaults to 10.
+            priority (Priority, optional): The scheduler lane. Defaults to INTERACTIVE.
 
         Returns:
             dict: A dictionary containing the search results.
         """
-        search_results = self.spotify.search(
-            q=f"{search_query}", limit=limit, type=category
+        ## While Spotify is unavailable, the last results for the query, or a prefix of it, are served.
+        prefix = f"search:{category}:{limit}:"
+        search_results = await spotify_stale.serve(
+            spotify_breaker,
+            prefix + search_query.lower().strip(),
+            spotify_scheduler.run,
+            priority,
+            self.spotify.search,
+            min_length=len(prefix) + 1,
+            q=f"{search_query}",
+            limit=limit,
+            type=category,
         )
         return search_results
 
@@ -260,3 +342,13 @@ class Functions(AbstractBaseClass):  # pylint:disable=too-many-public-methods
         _seconds = milliseconds // 1000
         minutes, seconds = divmod(_seconds, 60)
         return f"{minutes}:{seconds if seconds >9 else f'0{seconds}'}"
+
+    def convert_duration(self, milliseconds: int) -> str:
+        """
+        Like convert_ms, with hours for durations of an hour or more ('1:02:03').
+        """
+        hours, milliseconds = divmod(milliseconds, 3_600_000)
+        if not hours:
+            return self.convert_ms(milliseconds)
+        minutes, seconds = divmod(milliseconds // 1000, 60)
+        return f"{hours}:{minutes:02}:{seconds:02}"
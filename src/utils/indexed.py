@@ -0,0 +1,401 @@
+"""
+Holds IndexedList, a list backed by an implicit treap.
+
+A treap is a binary tree that is balanced by random priorities. Nodes are ordered
+by position, not by key, and know the size of their subtree. So getting, setting,
+inserting, removing and moving by index, and cutting out a range, are all
+O(log n) expected, where a list is O(n) at the front.
+
+Values can also have a weight (e.g. a track's length). Nodes keep the total weight
+of their subtree, so the sum of weights before any index is O(log n) as well.
+"""
+
+import random
+from collections.abc import MutableSequence
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Node:  # pylint:disable=too-few-public-methods
+    __slots__ = ("value", "weight", "priority", "size", "total", "left", "right")
+
+    def __init__(self, value: Any, weight: int) -> None:
+        self.value = value
+        self.weight = weight
+        self.priority = random.random()
+        self.size = 1
+        self.total = weight
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+
+def _unweighted(_: Any) -> int:
+    return 0
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _total(node: Optional[_Node]) -> int:
+    return node.total if node is not None else 0
+
+
+def _update(node: _Node) -> _Node:
+    ## Inlined, it runs for every node on every split and merge path.
+    size, total = 1, node.weight
+    if (left := node.left) is not None:
+        size += left.size
+        total += left.total
+    if (right := node.right) is not None:
+        size += right.size
+        total += right.total
+    node.size = size
+    node.total = total
+    return node
+
+
+def _split(
+    node: Optional[_Node], index: int
+) -> tuple[Optional[_Node], Optional[_Node]]:
+    """Splits the tree into its first `index` values and the rest."""
+    ## Iterative: the recursive version spent most of its time on calls.
+    left = right = None
+    left_tail: Optional[_Node] = None
+    right_tail: Optional[_Node] = None
+    path = []
+    while node is not None:
+        path.append(node)
+        size = node.left.size if node.left is not None else 0
+        if size >= index:
+            ## The node and its right subtree go right, keep splitting its left.
+            if right_tail is None:
+                right = node
+            else:
+                right_tail.left = node
+            right_tail = node
+            node = node.left
+        else:
+            if left_tail is None:
+                left = node
+            else:
+                left_tail.right = node
+            left_tail = node
+            index -= size + 1
+            node = node.right
+    if left_tail is not None:
+        left_tail.right = None
+    if right_tail is not None:
+        right_tail.left = None
+    for node in reversed(path):
+        _update(node)
+    return left, right
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Joins two trees, all of `left` before all of `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    root: Optional[_Node] = None
+    parent: Optional[_Node] = None
+    path = []
+    while left is not None and right is not None:
+        if left.priority > right.priority:
+            node, left, attach_right = left, left.right, True
+        else:
+            node, right, attach_right = right, right.left, False
+        if parent is None:
+            root = node
+        elif parent_right:
+            parent.right = node
+        else:
+            parent.left = node
+        parent, parent_right = node, attach_right
+        path.append(node)
+    rest = left if left is not None else right
+    if parent_right:
+        parent.right = rest
+    else:
+        parent.left = rest
+    for node in reversed(path):
+        _update(node)
+    return root
+
+
+def _build(
+    values: Iterable[Any], weight: Callable[[Any], int]
+) -> Optional[_Node]:
+    """Builds a tree from the values in O(n), with a stack along its right spine."""
+    spine: list[_Node] = []
+    for value in values:
+        node = _Node(value, weight(value))
+        last = None
+        while spine and spine[-1].priority < node.priority:
+            last = _update(spine.pop())
+        node.left = last
+        if spine:
+            spine[-1].right = node
+        spine.append(node)
+    for node in reversed(spine):
+        _update(node)
+    return spine[0] if spine else None
+
+
+class IndexedList(MutableSequence, Generic[T]):
+    """
+    A list with O(log n) positional operations, see the module docstring.
+    Iterating, searching by value and slicing with a step other than 1 are O(n).
+    """
+
+    __slots__ = ("_root", "_weight")
+
+    def __init__(
+        self,
+        values: Iterable[T] = (),
+        weight: Callable[[T], int] = _unweighted,
+    ) -> None:
+        self._weight = weight
+        self._root: Optional[_Node] = _build(values, weight)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __repr__(self) -> str:
+        return f"IndexedList({list(self)!r})"
+
+    def _index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("IndexedList index out of range")
+        return index
+
+    def _path(self, index: int) -> list[_Node]:
+        """The nodes from the root down to the one at `index`."""
+        node = self._root
+        index = self._index(index)
+        path = []
+        while True:
+            path.append(node)
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return path
+            else:
+                index -= left + 1
+                node = node.right
+
+    def _node(self, index: int) -> _Node:
+        """Like `_path(index)[-1]`, without building the path."""
+        node = self._root
+        index = self._index(index)
+        while True:
+            left = node.left.size if node.left is not None else 0
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node
+            else:
+                index -= left + 1
+                node = node.right
+
+    def _iter_from(self, start: int) -> Iterator[T]:
+        """In-order values from `start`, O(log n) to reach it."""
+        stack: list[_Node] = []
+        node = self._root
+        while node is not None:
+            left = _size(node.left)
+            if start < left:
+                stack.append(node)
+                node = node.left
+            elif start == left:
+                stack.append(node)
+                node = None
+            else:
+                start -= left + 1
+                node = node.right
+        while stack:
+            node = stack.pop()
+            yield node.value
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iter_from(0)
+
+    def __reversed__(self) -> Iterator[T]:
+        stack: list[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node.value
+            node = node.left
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                values = self._iter_from(start)
+                return [next(values) for _ in range(max(stop - start, 0))]
+            return [self._node(i).value for i in range(start, stop, step)]
+        return self._node(index).value
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            values = list(self)
+            values[index] = value
+            self.replace(values)
+            return
+        path = self._path(index)
+        path[-1].value = value
+        path[-1].weight = self._weight(value)
+        for node in reversed(path):
+            _update(node)
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                self.pop_range(start, stop)
+                return
+            values = list(self)
+            del values[index]
+            self.replace(values)
+            return
+        self.pop(index)
+
+    def insert(self, index: int, value: T) -> None:
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+
+        ## Walk down to where the new node's priority belongs, and only split
+        ## the subtree there, instead of splitting and merging the whole tree.
+        new = _Node(value, self._weight(value))
+        node, parent, to_left = self._root, None, False
+        path = []
+        while node is not None and node.priority > new.priority:
+            path.append(node)
+            left = node.left.size if node.left is not None else 0
+            parent = node
+            if index <= left:
+                node, to_left = node.left, True
+            else:
+                index -= left + 1
+                node, to_left = node.right, False
+        new.left, new.right = _split(node, index)
+        _update(new)
+        self._attach(parent, to_left, new)
+        for node in reversed(path):
+            _update(node)
+
+    def append(self, value: T) -> None:
+        self._root = _merge(self._root, _Node(value, self._weight(value)))
+
+    def extend(self, values: Iterable[T]) -> None:
+        self._root = _merge(self._root, _build(list(values), self._weight))
+
+    def _attach(self, parent: Optional[_Node], to_left: bool, node: Optional[_Node]):
+        if parent is None:
+            self._root = node
+        elif to_left:
+            parent.left = node
+        else:
+            parent.right = node
+
+    def pop(self, index: int = -1) -> T:
+        ## Joins the node's children in its place, only its ancestors change.
+        index = self._index(index)
+        node, parent, to_left = self._root, None, False
+        path = []
+        while True:
+            left = node.left.size if node.left is not None else 0
+            if index == left:
+                break
+            path.append(node)
+            parent = node
+            if index < left:
+                node, to_left = node.left, True
+            else:
+                index -= left + 1
+                node, to_left = node.right, False
+        self._attach(parent, to_left, _merge(node.left, node.right))
+        for ancestor in reversed(path):
+            _update(ancestor)
+        return node.value
+
+    def pop_range(self, start: int, stop: int) -> list[T]:
+        """
+        Removes and returns the values in [start, stop), clamped like a slice.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        left, rest = _split(self._root, start)
+        middle, right = _split(rest, max(stop - start, 0))
+        self._root = _merge(left, right)
+        return list(self._from_root(middle))
+
+    def move(self, source: int, destination: int) -> None:
+        """
+        Moves the value at `source` so it ends up at `destination`.
+        """
+        destination = self._index(destination)
+        self.insert(destination, self.pop(source))
+
+    def clear(self) -> None:
+        self._root = None
+
+    def copy(self) -> "IndexedList[T]":
+        return IndexedList(self, self._weight)
+
+    def index(self, value: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        stop = len(self) if stop is None else stop
+        for position, item in enumerate(self._iter_from(start), start):
+            if position >= stop:
+                break
+            if item == value:
+                return position
+        raise ValueError(f"{value!r} is not in IndexedList")
+
+    def replace(self, values: Iterable[T]) -> None:
+        """
+        Replaces every value at once, in O(n).
+        """
+        self._root = _build(values, self._weight)
+
+    def total(self) -> int:
+        """
+        The sum of every value's weight.
+        """
+        return _total(self._root)
+
+    def prefix_total(self, index: int) -> int:
+        """
+        The sum of the weights of the values before `index`, clamped like a slice.
+        """
+        index = max(min(index if index >= 0 else index + len(self), len(self)), 0)
+        node, total = self._root, 0
+        while node is not None:
+            left = _size(node.left)
+            if index <= left:
+                node = node.left
+            else:
+                total += _total(node.left) + node.weight
+                index -= left + 1
+                node = node.right
+        return total
+
+    def _from_root(self, root: Optional[_Node]) -> "IndexedList[T]":
+        values = IndexedList(weight=self._weight)
+        values._root = root  # pylint:disable=protected-access
+        return values
@@ -0,0 +1,107 @@
+"""
+Holds a small in-process metrics registry.
+
+Counters, gauges and timings are keyed by a name and optional labels.
+Use the module level `metrics` instance, and the owner only `metrics` command to read them.
+"""
+
+from collections import defaultdict, deque
+from typing import Any
+
+LabelKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+def _key(name: str, labels: dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_key(key: LabelKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}"
+
+
+class Timing:  # pylint:disable=too-few-public-methods
+    """
+    Keeps count, sum, max and a bounded window of recent samples.
+    """
+
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self, window: int = 512) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Records a sample."""
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        self.samples.append(value)
+
+    def percentile(self, percent: float) -> float:
+        """Returns the given percentile of the recent samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def summary(self) -> dict[str, float]:
+        """Returns a summary of this timing."""
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.maximum,
+        }
+
+
+class Metrics:
+    """
+    Process wide registry for counters, gauges and timings.
+    """
+
+    def __init__(self) -> None:
+        self._counters: defaultdict[LabelKey, int] = defaultdict(int)
+        self._gauges: dict[LabelKey, float] = {}
+        self._timings: dict[LabelKey, Timing] = {}
+
+    def inc(self, name: str, value: int = 1, **labels: Any) -> None:
+        """Increments a counter."""
+        self._counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Sets a gauge to the given value."""
+        self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Records a sample, e.g. a latency in milliseconds."""
+        key = _key(name, labels)
+        timing = self._timings.get(key)
+        if timing is None:
+            timing = self._timings[key] = Timing()
+        timing.observe(value)
+
+    def counter(self, name: str, **labels: Any) -> int:
+        """Returns the current value of a counter."""
+        return self._counters.get(_key(name, labels), 0)
+
+    def gauge(self, name: str, **labels: Any) -> float | None:
+        """Returns the current value of a gauge."""
+        return self._gauges.get(_key(name, labels))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns every metric, keyed by a printable name."""
+        return {
+            "counters": {_format_key(k): v for k, v in self._counters.items()},
+            "gauges": {_format_key(k): v for k, v in self._gauges.items()},
+            "timings": {_format_key(k): t.summary() for k, t in self._timings.items()},
+        }
+
+
+metrics = Metrics()
@@ -0,0 +1,145 @@
+"""
+Holds the overload controller that sheds non-essential work under load.
+
+Pressure is the worst of three signals, each relative to its target:
+event loop lag, interactions in flight, and the share of audio frames Lavalink
+failed to send. As pressure rises, features are switched off in stages,
+least important first, so playback commands stay responsive.
+Stages come back one at a time, once pressure stayed low for a while (hysteresis).
+"""
+
+import asyncio
+import logging as logger
+import time
+from enum import IntEnum
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+
+
+class Stage(IntEnum):
+    """
+    Features that can be shed, in the order they are turned off.
+    """
+
+    ENRICHMENT = 1  ## Spotify metadata on "Now Playing".
+    LOG_EMBEDS = 2  ## Track logs in the logging channel.
+    AUTOCOMPLETE = 3  ## Network calls from /play autocomplete.
+    CONFIRMATIONS = 4  ## Confirmation messages from the player controls.
+
+
+## Pressure at which each stage is shed.
+ENTER = {
+    Stage.ENRICHMENT: 1.0,
+    Stage.LOG_EMBEDS: 1.5,
+    Stage.AUTOCOMPLETE: 2.0,
+    Stage.CONFIRMATIONS: 3.0,
+}
+## A stage comes back once pressure is below this share of its threshold...
+RECOVER_RATIO = 0.6
+## ...for this many seconds.
+RECOVER_AFTER = 15.0
+
+## Weight of the newest sample in the smoothed signals.
+SMOOTHING = 0.3
+
+
+class OverloadController:
+    """
+    Tracks load signals and decides which features are shed.
+    """
+
+    def __init__(self, lag_target: float, pending_target: int, deficit_target: float):
+        self.lag_target = lag_target
+        self.pending_target = pending_target
+        self.deficit_target = deficit_target
+
+        self.level = 0
+        self.pending = 0
+        self.lag = 0.0
+        self.deficit = 0.0
+        self._calm_since: float | None = None
+
+    def allows(self, stage: Stage) -> bool:
+        """
+        Whether the feature is currently enabled.
+        """
+        if self.level < stage:
+            return True
+        metrics.inc("overload_shed", feature=stage.name.lower())
+        return False
+
+    def track(self) -> None:
+        """
+        Counts the current task as an interaction in flight until it finishes.
+        """
+        task = asyncio.current_task()
+        if task is None:
+            return
+        self.pending += 1
+        task.add_done_callback(self._finished)
+
+    def _finished(self, _: asyncio.Task) -> None:
+        self.pending -= 1
+
+    def observe_lag(self, lag: float) -> None:
+        self.lag += SMOOTHING * (lag - self.lag)
+
+    def observe_frames(self, sent: int, nulled: int, deficit: int) -> None:
+        """
+        Records Lavalink frame stats, the deficit as a share of the expected frames.
+        """
+        expected = sent + nulled + deficit
+        share = deficit / expected if expected > 0 else 0.0
+        self.deficit += SMOOTHING * (share - self.deficit)
+
+    @property
+    def pressure(self) -> float:
+        return max(
+            self.lag / self.lag_target,
+            self.pending / self.pending_target,
+            self.deficit / self.deficit_target,
+        )
+
+    def update(self) -> int:
+        """
+        Re-evaluates the shedding level. Returns the new level.
+        """
+        pressure = self.pressure
+        now = time.monotonic()
+
+        target = max(
+            (stage for stage, threshold in ENTER.items() if pressure >= threshold),
+            default=0,
+        )
+        if target > self.level:
+            logger.warning(
+                "Overloaded (pressure=%.2f), shedding up to %s",
+                pressure,
+                Stage(target).name,
+            )
+            self.level = int(target)
+            self._calm_since = None
+        elif self.level and pressure < ENTER[Stage(self.level)] * RECOVER_RATIO:
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= RECOVER_AFTER:
+                logger.info("Load is down, re-enabling %s", Stage(self.level).name)
+                self.level -= 1
+                self._calm_since = now
+        else:
+            self._calm_since = None
+
+        metrics.set_gauge("overload_level", self.level)
+        metrics.set_gauge("overload_pressure", round(pressure, 3))
+        metrics.set_gauge("pending_interactions", self.pending)
+        metrics.set_gauge("event_loop_lag_ms", round(self.lag * 1000, 1))
+        return self.level
+
+
+_env = EnvLoader.load_env()
+overload = OverloadController(
+    lag_target=_env.overload_lag_ms / 1000,
+    pending_target=_env.overload_pending,
+    deficit_target=_env.overload_frame_deficit,
+)
@@ -0,0 +1,170 @@
+"""
+Holds the player used by Dj Braum.
+
+All per-guild state lives here as declared attributes,
+so the cogs and views can read it directly instead of probing with hasattr.
+Played tracks are only kept in the queue's history.
+"""
+
+import time
+from typing import Optional
+
+import discord
+import wavelink
+
+from src.utils.quotas import trim_history
+from src.utils.track_queue import LIVE, BraumQueue
+
+## Filter presets, name: timescale settings.
+FILTER_PRESETS: dict[str, dict[str, float]] = {
+    "nightcore": {"pitch": 1.2, "speed": 1.2, "rate": 1},
+}
+
+
+class BraumPlayer(wavelink.Player):
+    """
+    wavelink.Player with Dj Braum's per-guild state.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        ## Indexed queues of interned tracks, see src/utils/track_queue.py.
+        self.queue = BraumQueue()
+        self.auto_queue = BraumQueue()
+
+        ## Channel to send "Now Playing" messages to.
+        self.reply: Optional[discord.abc.Messageable] = None
+        self.now_playing_message: Optional[discord.Message] = None
+
+        ## Name of the active filter preset, if any.
+        self.filter_preset: Optional[str] = None
+
+        ## Monotonic time of the /play that started playback, until its audio starts.
+        self.play_requested_at: Optional[float] = None
+
+    @property
+    def track_history(self) -> list[wavelink.Playable]:
+        """
+        Tracks that finished playing, latest last: the queue's history,
+        which also has the current track, without it. Kept within
+        QUEUE_HISTORY_SIZE by `trim_history`.
+        """
+        tracks = list(self.queue.history)
+        current = self.current
+        if tracks and current is not None and tracks[-1].encoded == current.encoded:
+            tracks.pop()
+        return tracks
+
+    @property
+    def speed(self) -> float:
+        """Playback speed of the active filter preset, 1 without one."""
+        preset = FILTER_PRESETS.get(self.filter_preset or "", {})
+        return preset.get("speed", 1) * preset.get("rate", 1)
+
+    @property
+    def up_next(self) -> BraumQueue:
+        """The queue tracks are played from next, like PlayerContext.queue."""
+        return self.queue or self.auto_queue
+
+    def time_left(self) -> Optional[float]:
+        """
+        Milliseconds until the current track ends, 0 if nothing is playing.
+        None if it never ends: a stream, or a looped track.
+        """
+        track = self.current
+        if track is None:
+            return 0
+        if track.is_stream or self.queue.mode == wavelink.QueueMode.loop:
+            return None
+        return max(track.length - self.position, 0) / self.speed
+
+    def eta(self, index: int) -> Optional[int]:
+        """
+        Milliseconds until the track at `index` (0-based) of `up_next` starts,
+        None if a stream or a looped track comes first, or the queue is shuffled.
+        O(log n).
+        """
+        queue = self.up_next
+        if queue.shuffled and index >= queue.pinned:
+            return None  ## Not drawn yet.
+        lead = self.time_left()
+        ahead = queue.duration_until(index)
+        if lead is None or ahead >= LIVE:
+            return None
+        return int(lead + ahead / self.speed)
+
+    def time_remaining(self) -> Optional[int]:
+        """
+        Milliseconds until `up_next` is done, None if it never is.
+        With the queue looped, that of one loop: the queue plus its history,
+        which has the current track. O(1).
+        """
+        lead = self.time_left()
+        total = self.up_next.duration()
+        if self.queue.mode == wavelink.QueueMode.loop_all:
+            lead = 0
+            total += self.queue.history.duration()
+        if lead is None or total >= LIVE:
+            return None
+        return int(lead + total / self.speed)
+
+    @property
+    def nightcore(self) -> bool:
+        """Whether the nightcore preset is active."""
+        return self.filter_preset == "nightcore"
+
+    async def apply_preset(self, name: str) -> None:
+        """
+        Applies one of the FILTER_PRESETS.
+        """
+        filters: wavelink.Filters = self.filters
+        filters.timescale.set(**FILTER_PRESETS[name])
+        await self.set_filters(filters)
+        self.filter_preset = name
+
+    async def reset_preset(self) -> None:
+        """
+        Removes the active filter preset.
+        """
+        filters: wavelink.Filters = self.filters
+        filters.timescale.reset()
+        await self.set_filters(filters)
+        self.filter_preset = None
+
+    def adopt(
+        self,
+        track: Optional[wavelink.Playable],
+        *,
+        paused: bool,
+        volume: int,
+        position: int,
+        filters: wavelink.Filters,
+    ) -> None:
+        """
+        Takes over the state of a Lavalink player that kept playing,
+        see src/utils/sessions.py. Nothing is sent to Lavalink.
+        """
+        ## wavelink.Player only sets these from its own requests and events.
+        # pylint:disable=attribute-defined-outside-init
+        self._current = self._original = track
+        self._paused = paused
+        self._volume = volume
+        self._filters = filters
+        self._last_position = position
+        self._last_update = time.monotonic_ns()
+
+    def trim_history(self) -> None:
+        """
+        Keeps the queues' history within the quota, see src/utils/quotas.py.
+        """
+        trim_history(self.queue)
+        trim_history(self.auto_queue)
+
+    def release(self) -> None:
+        """
+        Drops the queues and history, used before disconnecting.
+        """
+        self.queue.reset()
+        self.auto_queue.reset()
+        self.now_playing_message = None
@@ -0,0 +1,246 @@
+"""
+Holds the saved playlists.
+
+A saved playlist is the list of its tracks' encoded strings, the strings Lavalink
+plays tracks from. They hold the track's info, so they are decoded here instead of
+being searched or loaded again, and even a long playlist is queued at once.
+Playlists belong to a guild or a member, and are kept in a local SQLite database.
+"""
+
+import asyncio
+import base64
+import logging as logger
+import sqlite3
+import struct
+import time
+import zlib
+from contextlib import closing
+from typing import Any, NamedTuple, Optional
+
+import wavelink
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+
+## Playlists one guild or member can have, as many as autocomplete can show.
+MAX_PLAYLISTS = 25
+## Longest playlist name.
+MAX_NAME_LENGTH = 100
+
+## First bit of the message header, set when the message starts with a version byte.
+_VERSIONED = 1
+
+
+class TrackDecodeError(ValueError):
+    """
+    An encoded track that is not in a format known here.
+    """
+
+
+class _Reader:
+    """
+    Reads the Java DataOutput fields Lavalink encodes tracks with.
+    """
+
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.offset = 0
+
+    def _unpack(self, fmt: str) -> Any:
+        value = struct.unpack_from(fmt, self.data, self.offset)[0]
+        self.offset += struct.calcsize(fmt)
+        return value
+
+    def byte(self) -> int:
+        return self._unpack(">B")
+
+    def boolean(self) -> bool:
+        return self._unpack(">?")
+
+    def int32(self) -> int:
+        return self._unpack(">i")
+
+    def int64(self) -> int:
+        return self._unpack(">q")
+
+    def utf(self) -> str:
+        """Java's modified UTF-8: NUL as 2 bytes and surrogate pairs kept apart."""
+        length = self._unpack(">H")
+        raw = self.data[self.offset : self.offset + length]
+        if len(raw) != length:
+            raise struct.error("string past the end of the track")
+        self.offset += length
+        text = raw.replace(b"\xc0\x80", b"\x00").decode("utf-8", "surrogatepass")
+        return text.encode("utf-16", "surrogatepass").decode("utf-16")
+
+    def nullable_utf(self) -> Optional[str]:
+        return self.utf() if self.boolean() else None
+
+
+def decode_track(encoded: str) -> wavelink.Playable:
+    """
+    Builds the Playable of an encoded track without Lavalink, from versions 1 to 3
+    of its format. Source specific fields (e.g. a Spotify album) are not decoded.
+    Raises TrackDecodeError if the track is in another format.
+    """
+    try:
+        reader = _Reader(base64.b64decode(encoded, validate=True))
+        flags = (reader.int32() & 0xC0000000) >> 30
+        version = reader.byte() if flags & _VERSIONED else 1
+        if not 1 <= version <= 3:
+            raise TrackDecodeError(f"Unknown encoded track version {version}.")
+
+        title = reader.utf()
+        author = reader.utf()
+        length = reader.int64()
+        identifier = reader.utf()
+        is_stream = reader.boolean()
+        uri = reader.nullable_utf() if version >= 2 else None
+        artwork = reader.nullable_utf() if version >= 3 else None
+        isrc = reader.nullable_utf() if version >= 3 else None
+        source = reader.utf()
+        ## Source specific fields come next, the position is always last.
+        position = struct.unpack_from(">q", reader.data, len(reader.data) - 8)[0]
+    except (ValueError, struct.error, UnicodeError) as e:
+        if isinstance(e, TrackDecodeError):
+            raise
+        raise TrackDecodeError(f"Malformed encoded track: {e}") from e
+
+    return wavelink.Playable(
+        {
+            "encoded": encoded,
+            "info": {
+                "identifier": identifier,
+                "isSeekable": not is_stream,
+                "author": author,
+                "length": length,
+                "isStream": is_stream,
+                "position": position,
+                "title": title,
+                "uri": uri,
+                "artworkUrl": artwork,
+                "isrc": isrc,
+                "sourceName": source,
+            },
+            "pluginInfo": {},
+            "userData": {},
+        }
+    )
+
+
+def decode_tracks(encoded: list[str]) -> list[wavelink.Playable]:
+    """
+    Decodes every track it can, skipping (and logging) the others.
+    """
+    tracks = []
+    for track in encoded:
+        try:
+            tracks.append(decode_track(track))
+        except TrackDecodeError as e:
+            metrics.inc("playlist_decode_failures")
+            logger.warning("Skipping a saved track: %s", e)
+    return tracks
+
+
+def guild_owner(guild_id: int) -> str:
+    return f"guild:{guild_id}"
+
+
+def user_owner(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class SavedPlaylist(NamedTuple):
+    """
+    A saved playlist's name and length, as listed.
+    """
+
+    name: str
+    tracks: int
+
+
+class PlaylistStore:
+    """
+    Saved playlists by owner and name, the encoded tracks compressed.
+    Every call opens its own connection in a worker thread, off the event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        if not self._ready:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS playlists ("
+                " owner TEXT NOT NULL,"
+                " name TEXT NOT NULL COLLATE NOCASE,"
+                " tracks BLOB NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (owner, name))"
+            )
+            db.commit()
+            self._ready = True
+        return db
+
+    def _save(self, owner: str, name: str, encoded: list[str]) -> bool:
+        tracks = zlib.compress("\n".join(encoded).encode("ascii"))
+        with closing(self._connect()) as db, db:
+            exists = db.execute(
+                "SELECT 1 FROM playlists WHERE owner = ? AND name = ?", (owner, name)
+            ).fetchone()
+            (count,) = db.execute(
+                "SELECT COUNT(*) FROM playlists WHERE owner = ?", (owner,)
+            ).fetchone()
+            if not exists and count >= MAX_PLAYLISTS:
+                return False
+            db.execute(
+                "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?, ?)",
+                (owner, name, tracks, len(encoded), time.time()),
+            )
+        return True
+
+    def _load(self, owner: str, name: str) -> Optional[list[str]]:
+        with closing(self._connect()) as db:
+            row = db.execute(
+                "SELECT tracks FROM playlists WHERE owner = ? AND name = ?",
+                (owner, name),
+            ).fetchone()
+        if row is None:
+            return None
+        text = zlib.decompress(row[0]).decode("ascii")
+        return text.split("\n") if text else []
+
+    def _playlists(self, owner: str) -> list[SavedPlaylist]:
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT name, count FROM playlists WHERE owner = ? ORDER BY name",
+                (owner,),
+            ).fetchall()
+        return [SavedPlaylist(*row) for row in rows]
+
+    async def save(self, owner: str, name: str, encoded: list[str]) -> bool:
+        """
+        Saves the encoded tracks under the name, replacing a playlist with that name.
+        Returns False when the owner already has MAX_PLAYLISTS other playlists.
+        """
+        return await asyncio.to_thread(self._save, owner, name, encoded)
+
+    async def load(self, owner: str, name: str) -> Optional[list[str]]:
+        """
+        Returns the encoded tracks of the playlist, None if there is none by that name.
+        """
+        return await asyncio.to_thread(self._load, owner, name)
+
+    async def playlists(self, owner: str) -> list[SavedPlaylist]:
+        """
+        Returns the owner's playlists, by name.
+        """
+        return await asyncio.to_thread(self._playlists, owner)
+
+
+playlist_store = PlaylistStore(EnvLoader.load_env().playlist_store)
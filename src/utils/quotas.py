@@ -0,0 +1,167 @@
+"""
+Holds the queue quotas.
+
+Without limits a single guild could queue playlist after playlist and hold
+thousands of tracks, plus their history, for as long as it stays connected.
+Each guild's queue is limited in tracks and duration, so is what each member
+queued in it, and the history only keeps the latest played tracks.
+A limit of 0 disables it. Streams never count toward a duration.
+
+The memory the queues hold is estimated from the number of entries and interned
+records (see src/utils/tracks.py and `python -m benchmarks.track_memory`).
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence
+
+import wavelink
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+from src.utils.track_queue import LIVE, requester_of
+from src.utils.tracks import track_pool
+
+if TYPE_CHECKING:
+    from src.utils.player import BraumPlayer
+
+## Why tracks were refused.
+GUILD_TRACKS = "guild_tracks"
+GUILD_DURATION = "guild_duration"
+USER_TRACKS = "user_tracks"
+USER_DURATION = "user_duration"
+
+## Estimated bytes of a queued track: its SharedTrack, extras and treap node.
+ENTRY_BYTES = 480
+## Estimated bytes of an interned TrackRecord, shared by every guild.
+RECORD_BYTES = 2500
+
+
+@dataclass(frozen=True, slots=True)
+class Quota:
+    """
+    Limits of a guild's queue, durations in milliseconds.
+    """
+
+    max_tracks: int
+    max_duration: int
+    max_user_tracks: int
+    max_user_duration: int
+    history_size: int
+
+
+class Admission(NamedTuple):
+    """
+    The tracks that fit in the queue, and why the rest did not (None if all fit).
+    """
+
+    tracks: list[wavelink.Playable]
+    refused: Optional[str]
+
+
+def _over(limit: int, value: int) -> bool:
+    return 0 < limit < value
+
+
+def _length(track: wavelink.Playable) -> int:
+    return 0 if track.is_stream else track.length
+
+
+def admit(
+    player: "BraumPlayer",
+    tracks: Sequence[wavelink.Playable],
+    requester_id: int,
+    quota: Optional[Quota] = None,
+) -> Admission:
+    """
+    Returns the leading tracks that can be queued by `requester_id` within the quota.
+    O(n) in the queue length, which the quota bounds.
+    """
+    quota = quota or queue_quota
+    queue = player.queue
+    queued = list(queue)
+    ## Finite sum modulo the weight of any streams in it.
+    duration = queue.duration() % LIVE
+    ## A looped queue plays its history again.
+    if queue.mode == wavelink.QueueMode.loop_all:
+        queued += list(queue.history)
+        duration += queue.history.duration() % LIVE
+
+    tracks_count = len(queued)
+    user_tracks = [track for track in queued if requester_of(track) == requester_id]
+    user_count = len(user_tracks)
+    user_duration = sum(_length(track) for track in user_tracks)
+
+    refused = None
+    admitted = []
+    for track in tracks:
+        length = _length(track)
+        if _over(quota.max_tracks, tracks_count + 1):
+            refused = GUILD_TRACKS
+        elif _over(quota.max_duration, duration + length):
+            refused = GUILD_DURATION
+        elif _over(quota.max_user_tracks, user_count + 1):
+            refused = USER_TRACKS
+        elif _over(quota.max_user_duration, user_duration + length):
+            refused = USER_DURATION
+        if refused is not None:
+            metrics.inc("queue_quota_refused", len(tracks) - len(admitted), reason=refused)
+            break
+        admitted.append(track)
+        tracks_count += 1
+        user_count += 1
+        duration += length
+        user_duration += length
+
+    return Admission(admitted, refused)
+
+
+def trim_history(queue: wavelink.Queue, quota: Optional[Quota] = None) -> None:
+    """
+    Drops the oldest played tracks over the history size, unless the queue is looped.
+    """
+    quota = quota or queue_quota
+    history = queue.history
+    if (
+        history is None
+        or not quota.history_size
+        or queue.mode == wavelink.QueueMode.loop_all
+    ):
+        return
+    excess = len(history) - quota.history_size
+    if excess > 0:
+        history.remove_range(0, excess)
+
+
+def queued_entries(player: "BraumPlayer") -> int:
+    """
+    How many tracks the player's queues and history hold, O(1).
+    """
+    return (
+        len(player.queue)
+        + len(player.queue.history)
+        + len(player.auto_queue)
+        + len(player.auto_queue.history)
+    )
+
+
+def export_memory(players: Sequence["BraumPlayer"]) -> None:
+    """
+    Sets the gauges of what the queues hold: the tracks, the estimated bytes of
+    every queue and of the heaviest guild's.
+    """
+    entries = [queued_entries(player) for player in players]
+    metrics.set_gauge("queued_tracks", sum(entries))
+    metrics.set_gauge(
+        "queue_memory_bytes", sum(entries) * ENTRY_BYTES + len(track_pool) * RECORD_BYTES
+    )
+    metrics.set_gauge("queue_memory_max_bytes", max(entries, default=0) * ENTRY_BYTES)
+
+
+_env = EnvLoader.load_env()
+queue_quota = Quota(
+    max_tracks=_env.queue_max_tracks,
+    max_duration=_env.queue_max_duration * 1000,
+    max_user_tracks=_env.queue_max_user_tracks,
+    max_user_duration=_env.queue_max_user_duration * 1000,
+    history_size=_env.queue_history_size,
+)
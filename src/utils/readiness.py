@@ -0,0 +1,96 @@
+"""
+Holds the readiness gate in front of Lavalink.
+
+The node connects in the background, next to the gateway instead of before it,
+and reconnects on its own whenever Lavalink restarts. Until a node is connected,
+wavelink.Pool.get_node() raises. Commands that need Lavalink wait for a connected
+node instead, up to a bounded time (and the interaction's deadline), and only then
+fail with NodeUnavailable.
+"""
+
+import asyncio
+import logging as logger
+import time
+from typing import Optional
+
+import wavelink
+
+from src.credentials.loader import EnvLoader
+from src.essentials.errors import NodeUnavailable
+from src.utils import deadline
+from src.utils.metrics import metrics
+
+## Seconds between checks of the nodes' status while waiting. wavelink only
+## dispatches an event when a node becomes ready, not when it drops.
+POLL_INTERVAL = 0.5
+
+
+class NodeReadiness:
+    """
+    Tells whether a Lavalink node is connected, and waits for one.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def changed(self) -> asyncio.Event:
+        ## Created on first use, inside the running event loop.
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def node(self) -> Optional[wavelink.Node]:
+        """
+        The connected node with the fewest players, None if no node is connected.
+        Also updates the node availability gauges.
+        """
+        nodes = wavelink.Pool.nodes.values()
+        connected = sum(node.status is wavelink.NodeStatus.CONNECTED for node in nodes)
+        metrics.set_gauge("lavalink_nodes", len(nodes))
+        metrics.set_gauge("lavalink_nodes_connected", connected)
+        if not connected:
+            return None
+        return wavelink.Pool.get_node()
+
+    def notify(self) -> None:
+        """
+        Wakes up the waiters, called when a node became ready or closed.
+        """
+        self.node()
+        self.changed.set()
+
+    async def wait(self, timeout: Optional[float] = None) -> wavelink.Node:
+        """
+        Returns a connected node, waiting up to `timeout` seconds (READINESS_TIMEOUT
+        by default, capped by the interaction's deadline) for one.
+        Raises NodeUnavailable when none connected in time.
+        """
+        if (node := self.node()) is not None:
+            return node
+
+        limits = [self.timeout if timeout is None else timeout, deadline.remaining()]
+        until = time.monotonic() + min(limit for limit in limits if limit is not None)
+        started = time.monotonic()
+        metrics.inc("node_waits")
+        logger.info("No Lavalink node is connected, waiting for one.")
+
+        while (node := self.node()) is None:
+            left = until - time.monotonic()
+            if left <= 0:
+                metrics.inc("node_wait_timeouts")
+                raise NodeUnavailable("No Lavalink node is connected.")
+            self.changed.clear()
+            try:
+                await asyncio.wait_for(
+                    self.changed.wait(), timeout=min(left, POLL_INTERVAL)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        metrics.observe("node_wait_ms", (time.monotonic() - started) * 1000)
+        return node
+
+
+readiness = NodeReadiness(timeout=EnvLoader.load_env().readiness_timeout)
@@ -0,0 +1,105 @@
+"""
+Holds the adaptive responder used by the slash commands.
+
+Most commands have their answer ready in microseconds, so deferring first and
+sending a followup costs an extra REST call. The responder sends the reply as the
+initial response when it is ready within a short budget, and only defers when the
+budget runs out, or when a command knows it is slow (search, lyrics, ...).
+"""
+
+import asyncio
+import logging as logger
+from typing import Any
+
+import discord
+
+from src.utils.metrics import metrics
+
+RESPONDER_KEY = "responder"
+
+## Seconds a command may take before the interaction is deferred.
+## Discord requires an initial response within 3 seconds.
+DEFAULT_BUDGET = 1.0
+
+
+class Responder:
+    """
+    Answers one interaction, either directly or through defer + followup.
+    """
+
+    __slots__ = ("interaction", "ephemeral", "_claimed", "_deferring", "_timer")
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        budget: float = DEFAULT_BUDGET,
+        ephemeral: bool = False,
+    ) -> None:
+        self.interaction = interaction
+        self.ephemeral = ephemeral
+
+        ## Set as soon as an initial response is on its way.
+        self._claimed = interaction.response.is_done()
+        self._deferring: asyncio.Task | None = None
+        self._timer = asyncio.get_running_loop().call_later(budget, self._start_defer)
+
+    @classmethod
+    def of(
+        cls,
+        interaction: discord.Interaction,
+        budget: float = DEFAULT_BUDGET,
+        ephemeral: bool = False,
+    ) -> "Responder":
+        """
+        Returns the responder for this interaction, creating it on first use.
+        The error handler gets the same responder as the command that failed.
+        """
+        responder: Responder | None = interaction.extras.get(RESPONDER_KEY)
+        if responder is None:
+            responder = cls(interaction, budget=budget, ephemeral=ephemeral)
+            interaction.extras[RESPONDER_KEY] = responder
+        return responder
+
+    def _start_defer(self) -> None:
+        if self._claimed:
+            return
+        self._claimed = True
+        self._deferring = asyncio.create_task(
+            self.interaction.response.defer(ephemeral=self.ephemeral)
+        )
+
+    async def defer(self) -> None:
+        """
+        Defers right away, for commands that are known to be slow.
+        """
+        self._timer.cancel()
+        self._start_defer()
+        if self._deferring is not None:
+            await self._deferring
+
+    async def send(self, **kwargs: Any) -> Any:
+        """
+        Sends the reply, as the initial response if nothing was sent yet,
+        otherwise as a followup.
+        """
+        self._timer.cancel()
+        kwargs.setdefault("ephemeral", self.ephemeral)
+
+        if not self._claimed and not self.interaction.response.is_done():
+            self._claimed = True
+            metrics.inc("interaction_responses", kind="direct")
+            try:
+                return await self.interaction.response.send_message(**kwargs)
+            except discord.HTTPException:
+                ## The interaction is still unanswered, let a retry respond.
+                self._claimed = self.interaction.response.is_done()
+                raise
+
+        if self._deferring is not None:
+            try:
+                await self._deferring
+            except discord.HTTPException:
+                logger.warning("Deferring the interaction failed.", exc_info=True)
+
+        metrics.inc("interaction_responses", kind="followup")
+        return await self.interaction.followup.send(**kwargs)
@@ -4,13 +4,35 @@ which holds methods for responding to interactions related to music playback.
 """
 
 import logging as logger
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
 import discord
 import wavelink
 
+from src.essentials.errors import BreakerOpen, DeadlineExceeded, SpotifyRateLimited
+from src.utils import deadline
+from src.utils.breaker import stale_since
 from src.utils.functions import Functions
-from lyricsgenius.types import Song
+from src.utils.overload import Stage, overload
+from src.utils.playlists import MAX_PLAYLISTS, SavedPlaylist
+from src.utils.quotas import (
+    GUILD_DURATION,
+    GUILD_TRACKS,
+    USER_DURATION,
+    USER_TRACKS,
+    queue_quota,
+)
+from src.utils.spotify_scheduler import Priority, spotify_scheduler
+from src.utils.track_queue import BraumQueue, ShuffleMode
+
+if TYPE_CHECKING:
+    from lyricsgenius.types import Song
+
+    from src.utils.player import BraumPlayer
+
+## Longest "Now Playing" waits for its Spotify metadata, budget wait included.
+ENRICHMENT_TIMEOUT = 1.5
 
 
 class Responses(Functions):  # pylint:disable=too-many-public-methods
@@ -159,6 +181,45 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
             colour=self.err_color,
         )
 
+    async def request_timed_out(self) -> discord.Embed:
+        """
+        When an external service did not answer in time
+        """
+        return discord.Embed(
+            title="**That took too long, please try again!**",
+            colour=self.err_color,
+        )
+
+    async def service_unavailable(self) -> discord.Embed:
+        """
+        When an external service is down and nothing is cached
+        """
+        return discord.Embed(
+            title="**That service is unavailable right now, please try again later!**",
+            colour=self.err_color,
+        )
+
+    async def music_unavailable(self) -> discord.Embed:
+        """
+        When no Lavalink node connected in time
+        """
+        return discord.Embed(
+            title="**Music is starting up, please try again in a moment!**",
+            colour=self.err_color,
+        )
+
+    def mark_stale(self, embed: discord.Embed, data: Any) -> discord.Embed:
+        """
+        Notes in the footer when the embed was built from a stale response.
+        """
+        if (since := stale_since(data)) is not None:
+            minutes = int((time.time() - since) // 60)
+            footer = f"Spotify is unavailable, showing results from {minutes} min ago."
+            if embed.footer.text:
+                footer = f"{embed.footer.text}\n{footer}"
+            embed.set_footer(text=footer)
+        return embed
+
     async def display_track(
         self,
         player: wavelink.Player,
@@ -176,11 +237,28 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         track_metadata = None
 
         # Fetch extra information from spotify if exists.
-        if track.source != "spotify":
-            _search_result = await wavelink.Playable.search(
-                f"{track.title} {track.author}",
-                source="spsearch",
-            )
+        # This is background enrichment, so it is the first to go when Spotify is busy
+        # or the bot is overloaded, and never holds up the embed for long.
+        if track.source != "spotify" and overload.allows(Stage.ENRICHMENT):
+            try:
+                _search_result = await deadline.within(
+                    spotify_scheduler.run(
+                        Priority.BACKGROUND,
+                        wavelink.Playable.search,
+                        f"{track.title} {track.author}",
+                        source="spsearch",
+                    ),
+                    timeout=ENRICHMENT_TIMEOUT,
+                )
+            except (SpotifyRateLimited, DeadlineExceeded, BreakerOpen):
+                logger.info("Skipped Spotify metadata for %s", track.title)
+                _search_result = None
+            except Exception:  # pylint:disable=broad-except
+                ## Optional enrichment, never worth losing "Now Playing" over.
+                logger.warning(
+                    "Spotify metadata failed for %s", track.title, exc_info=True
+                )
+                _search_result = None
             if _search_result and len(_search_result) > 0:
                 track_metadata = _search_result[0]
 
@@ -275,13 +353,12 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
 
     async def show_queue(
         self,
-        queue_info: list[wavelink.Playable],
-        guild: discord.Guild,
+        queue_info: BraumQueue,
+        player: "BraumPlayer",
     ) -> discord.Embed:
         """
         Shows the queue
         """
-        player = await self.get_player(guild)  ## Retrieve the player.
         queue_list: list[str] = []  ## To store the tracks in the queue.
         title = "**Queue**"
 
@@ -289,16 +366,20 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
             return await self.empty_queue()
 
         for i, track in enumerate(
-            list(queue_info)[:20], start=1
+            queue_info[:20], start=1
         ):  ## Loop through all items in the queue.
+            eta = player.eta(i - 1)
             queue_list.append(
                 f"**{i}.** [{track.title}]({track.uri}) - [{track.author}]({track.artist.url})"
+                + (f" · in {self.convert_duration(eta)}" if eta is not None else "")
             )  ## Add each track to the list.
 
         if (
             player.queue.mode == wavelink.QueueMode.loop_all
         ):  ## If the queue loop is enabled, change the title.
             title = "**Queue (Queue Loop Enabled)**"
+        if queue_info.shuffled:
+            title = title.replace("**Queue", "**Shuffled Queue", 1)
 
         embed = discord.Embed(
             title=title,
@@ -306,7 +387,21 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
             colour=self.sucess_color,
         )
 
-        embed.set_footer(text="Note: A max of 20 tracks are displayed in the queue.")
+        remaining = player.time_remaining()
+        if player.queue.mode == wavelink.QueueMode.loop:
+            summary = "The current track is looped."
+        elif remaining is None:
+            summary = "A live stream is queued, the remaining time is unknown."
+        elif player.queue.mode == wavelink.QueueMode.loop_all:
+            summary = f"One loop takes {self.convert_duration(remaining)}."
+        else:
+            summary = f"{self.convert_duration(remaining)} left."
+        if queue_info.shuffled:
+            summary += " Listed in the order they were added."
+        embed.set_footer(
+            text=f"{len(queue_info)} tracks. {summary}\n"
+            "Note: A max of 20 tracks are displayed in the queue."
+        )
         embed.set_thumbnail(url=queue_info[0].artwork)
         return embed
 
@@ -364,14 +459,16 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
             colour=discord.Colour.orange(),
         )
 
-    async def shuffled_queue(self) -> discord.Embed:
+    async def shuffled_queue(self, mode: ShuffleMode) -> discord.Embed:
         """
-        When the queue has been shuffled
+        When the queue has been shuffled, or unshuffled.
         """
-        return discord.Embed(
-            title="**Shuffled the queue**.",
-            colour=self.sucess_color,
-        )
+        titles = {
+            ShuffleMode.RANDOM: "**Shuffled the queue**.",
+            ShuffleMode.FAIR: "**Shuffled the queue, everyone takes turns**.",
+            ShuffleMode.OFF: "**Unshuffled the queue**.",
+        }
+        return discord.Embed(title=titles[mode], colour=self.sucess_color)
 
     async def volume_too_high(self) -> discord.Embed:
         """
@@ -396,20 +493,57 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         queue: wavelink.Queue,
         track_index: int,
         embed_title: str,
-    ) -> discord.Embed:
+    ) -> Optional[discord.Embed]:
         """
         Used for remove and skipto.
+        Returns None when there is no such track number in the queue.
         """
-        try:
-            embed = discord.Embed(
-                title=f"**{embed_title} {queue[track_index - 1].title} - {queue[track_index -1].author}.**",
-                colour=self.sucess_color,
-            )  ## The track exists in the queue.
+        if not 1 <= track_index <= len(queue):
+            return None
 
-        except IndexError:  ## If the track was not found in the queue, return False.
-            logger.exception("Track not found in queue.")
+        track = queue[track_index - 1]
+        return discord.Embed(
+            title=f"**{embed_title} {track.title} - {track.author}.**",
+            colour=self.sucess_color,
+        )
 
-        return embed
+    async def removed_tracks(self, removed: list[wavelink.Playable]) -> discord.Embed:
+        """
+        Used for /remove with a range of tracks.
+        """
+        return discord.Embed(
+            title=f"**Removed {len(removed)} tracks from the queue.**",
+            description="\n".join(
+                f"{track.title} - {track.author}" for track in removed[:10]
+            )
+            + (f"\n...and {len(removed) - 10} more." if len(removed) > 10 else ""),
+            colour=self.sucess_color,
+        )
+
+    async def moved_track(
+        self, track: wavelink.Playable, position: int
+    ) -> discord.Embed:
+        """
+        Used for /move.
+        """
+        return discord.Embed(
+            title=f"**Moved {track.title} - {track.author} to position {position}.**",
+            colour=self.sucess_color,
+        )
+
+    async def deduped_queue(self, removed: int) -> discord.Embed:
+        """
+        Used for /dedupe.
+        """
+        if not removed:
+            return discord.Embed(
+                title="**There are no duplicate tracks in the queue.**",
+                colour=discord.Colour.dark_purple(),
+            )
+        return discord.Embed(
+            title=f"**Removed {removed} duplicate tracks from the queue.**",
+            colour=self.sucess_color,
+        )
 
     async def common_track_actions(
         self,
@@ -506,9 +640,11 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         self,
         track_info: wavelink.Playable,
         user: discord.User,
+        player: Optional["BraumPlayer"] = None,
     ) -> discord.Embed:
         """
-        When a track is added to the queue
+        When a track is added to the queue.
+        With the player, also says when it plays if it is still queued.
         """
         embed = discord.Embed(
             # title=f"**Added {track_info.title} - {track_info.author} to the queue.**",
@@ -521,6 +657,125 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
             url=track_info.uri or None,
         )
 
+        if player is not None and player.queue.shuffled:
+            embed.set_footer(text="The queue is shuffled, it plays at a random turn.")
+        elif player is not None and player.queue and player.queue[-1] == track_info:
+            position = len(player.queue)
+            eta = player.eta(position - 1)
+            embed.set_footer(
+                text=f"Position {position} in the queue"
+                + (
+                    f", plays in about {self.convert_duration(eta)}."
+                    if eta is not None
+                    else "."
+                )
+            )
+
+        return embed
+
+    def quota_reason(self, refused: str) -> str:
+        """
+        Why tracks were refused by the queue quota, see src/utils/quotas.py.
+        """
+        return {
+            GUILD_TRACKS: "The queue is full, it holds up to "
+            f"{queue_quota.max_tracks} tracks.",
+            GUILD_DURATION: "The queue holds up to "
+            f"{self.convert_duration(queue_quota.max_duration)} of music.",
+            USER_TRACKS: "You can have up to "
+            f"{queue_quota.max_user_tracks} tracks in the queue.",
+            USER_DURATION: "You can have up to "
+            f"{self.convert_duration(queue_quota.max_user_duration)} of music "
+            "in the queue.",
+        }[refused]
+
+    async def queue_limit_reached(self, refused: str) -> discord.Embed:
+        """
+        When a track does not fit in the queue quota.
+        """
+        return discord.Embed(
+            title="**Could not add that to the queue.**",
+            description=self.quota_reason(refused),
+            colour=self.err_color,
+        )
+
+    async def saved_playlist(
+        self, name: str, count: int, server: bool
+    ) -> discord.Embed:
+        """
+        Used for /playlist save.
+        """
+        owner = "the server's" if server else "your"
+        return discord.Embed(
+            title=f"**Saved {count} tracks as {owner} playlist {name}.**",
+            colour=self.sucess_color,
+        )
+
+    async def loaded_playlist(
+        self, name: str, queued: int, total: int, refused: Optional[str] = None
+    ) -> discord.Embed:
+        """
+        Used for /playlist load. With `refused`, only `queued` tracks fit in the queue.
+        """
+        embed = discord.Embed(
+            title=f"**Queued {queued} tracks from the playlist {name}.**",
+            colour=self.sucess_color,
+        )
+        notes = []
+        if refused is not None:
+            notes.append(f"Only {queued} of {total} tracks were added. ")
+            notes.append(self.quota_reason(refused))
+        elif queued < total:
+            notes.append(f"{total - queued} saved tracks could not be read.")
+        if notes:
+            embed.description = "".join(notes)
+        return embed
+
+    async def playlist_not_found(self, name: str) -> discord.Embed:
+        """
+        When there is no saved playlist by that name.
+        """
+        return discord.Embed(
+            title=f"**There is no saved playlist named {name}.**",
+            colour=self.err_color,
+        )
+
+    async def too_many_playlists(self) -> discord.Embed:
+        """
+        When saving one more playlist than allowed.
+        """
+        return discord.Embed(
+            title=f"**You can only save up to {MAX_PLAYLISTS} playlists.**",
+            description="Save over an existing playlist by using its name.",
+            colour=self.err_color,
+        )
+
+    async def cannot_save_server_playlist(self) -> discord.Embed:
+        """
+        When a member without the Manage Server permission saves a server playlist.
+        """
+        return discord.Embed(
+            title="**You need the Manage Server permission to save server playlists.**",
+            colour=self.err_color,
+        )
+
+    async def show_playlists(
+        self, personal: list[SavedPlaylist], server: list[SavedPlaylist]
+    ) -> discord.Embed:
+        """
+        Used for /playlist list.
+        """
+        embed = discord.Embed(title="**Saved Playlists**", colour=self.sucess_color)
+        for title, playlists in (("Yours", personal), ("Server", server)):
+            embed.add_field(
+                name=title,
+                value="\n".join(
+                    f"**{playlist.name}** - {playlist.tracks} tracks"
+                    for playlist in playlists
+                )[:1024]
+                or "None yet, save the queue with /playlist save.",
+                inline=False,
+            )
         return embed
 
     async def only_supported_urls(self) -> discord.Embed:
@@ -551,7 +806,7 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         embed.set_thumbnail(
             url=new_releases["albums"]["items"][0]["images"][0]["url"]
         )  ## Set the thumbnail to the newest track.
-        return embed
+        return self.mark_stale(embed, new_releases)
 
     async def display_trending(self, trending) -> discord.Embed:
         """
@@ -573,7 +828,7 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         embed.set_thumbnail(
             url=trending["items"][0]["track"]["album"]["images"][0]["url"]
         )  ## Set the thumbnail to the top trending track.
-        return embed
+        return self.mark_stale(embed, trending)
 
     async def autosuggestion_trending_spotify(self, trending) -> dict[str, Any]:
         """
@@ -604,15 +859,18 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         embed.set_thumbnail(
             url=trending["items"][0]["track"]["album"]["images"][0]["url"]
         )  ## Set the thumbnail to the top trending track.
-        return embed
+        return self.mark_stale(embed, trending)
 
     async def display_playlist(
         self,
         playlist: wavelink.tracks.Playlist,
         type: str = "Playlist",
+        queued: Optional[int] = None,
+        refused: Optional[str] = None,
     ) -> discord.Embed:
         """
-        Display playlist data
+        Display playlist data.
+        With `refused`, only the first `queued` tracks fit in the queue quota.
         """
 
         embed = discord.Embed(
@@ -640,6 +898,13 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
                     )
         if playlist.tracks:
             embed.add_field(name="Tracks", value=len(playlist.tracks), inline=False)
+        if refused is not None:
+            embed.add_field(
+                name="Not queued",
+                value=f"Only {queued} of {len(playlist.tracks)} tracks were added. "
+                + self.quota_reason(refused),
+                inline=False,
+            )
         if playlist.artwork:
             embed.set_thumbnail(url=playlist.artwork)
         else:
@@ -770,7 +1035,7 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
 
     async def display_lyrics(
         self,
-        lyrics: Song,
+        lyrics: "Song",
         user: discord.User,
     ) -> discord.Embed:
         """
@@ -869,7 +1134,7 @@ class Responses(Functions):  # pylint:disable=too-many-public-methods
         embed.set_footer(
             text="Tip: Copy any one of the track or album hyperlinks and play them with /url."
         )
-        return embed
+        return self.mark_stale(embed, search_results)
 
     async def already_paused(self, track_info: wavelink.Playable) -> discord.Embed:
         """
@@ -0,0 +1,97 @@
+"""
+Holds the runtime mode.
+
+RUNTIME=fast swaps in faster implementations when they are installed,
+and falls back to the standard library, with a warning, when they are not:
+- uvloop runs the event loop,
+- orjson encodes the JSON bodies sent to Lavalink, through the node's HTTP session.
+
+discord.py decodes gateway payloads with orjson whenever it is installed,
+whatever the mode. wavelink decodes with the standard library either way.
+Compare both modes with `python -m benchmarks.runtime`.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging as logger
+from typing import Any, Coroutine, NamedTuple, Optional, TypeVar
+
+import aiohttp
+
+DEFAULT = "default"
+FAST = "fast"
+
+T = TypeVar("T")
+
+
+class Runtime(NamedTuple):
+    """
+    What the runtime mode ended up using.
+    """
+
+    mode: str
+    loop: str  ## "uvloop" or "asyncio".
+    json: str  ## "orjson" or "json".
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def select(mode: str) -> Runtime:
+    """
+    Resolves the runtime mode to what is installed.
+    """
+    if mode != FAST:
+        if mode != DEFAULT:
+            logger.warning("Unknown RUNTIME %r, using %r.", mode, DEFAULT)
+        return Runtime(DEFAULT, "asyncio", "json")
+
+    loop = "uvloop" if installed("uvloop") else "asyncio"
+    codec = "orjson" if installed("orjson") else "json"
+    if loop == "asyncio":
+        logger.warning("RUNTIME=fast but uvloop is not installed, using asyncio.")
+    if codec == "json":
+        logger.warning("RUNTIME=fast but orjson is not installed, using json.")
+    return Runtime(FAST, loop, codec)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Encodes JSON with orjson, or json when it is not installed.
+    """
+    try:
+        import orjson  # pylint:disable=import-outside-toplevel
+    except ImportError:
+        return json.dumps(obj)
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def run(coro: Coroutine[Any, Any, T], runtime: Runtime) -> T:
+    """
+    Runs the coroutine like asyncio.run, on uvloop if the runtime uses it.
+    """
+    logger.info(
+        "Runtime mode %s: %s event loop, %s encoder.",
+        runtime.mode,
+        runtime.loop,
+        runtime.json,
+    )
+    if runtime.loop != "uvloop":
+        return asyncio.run(coro)
+
+    import uvloop  # pylint:disable=import-outside-toplevel
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
+def http_session(runtime: Runtime) -> Optional[aiohttp.ClientSession]:
+    """
+    Returns the HTTP session for Lavalink nodes.
+    None leaves it to wavelink, which creates a default one.
+    """
+    if runtime.json != "orjson":
+        return None
+    return aiohttp.ClientSession(json_serialize=dumps)
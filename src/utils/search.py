@@ -0,0 +1,235 @@
+"""
+Holds the hedged track search used by /play.
+
+A text query is sent to the most preferred source first. If it has not returned
+a usable result after a short delay, the remaining sources are raced in parallel.
+The most preferred usable result among the finished searches wins, and the
+searches that are still running are cancelled. Each source has its own circuit
+breaker, so a source that keeps failing is skipped until it recovers.
+
+Queries and URLs that Lavalink could not resolve are remembered for a short while,
+so retrying them is answered at once instead of loading them again.
+"""
+
+import asyncio
+import heapq
+import logging as logger
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from urllib.parse import urlsplit
+
+import wavelink
+
+from src.credentials.loader import EnvLoader
+from src.utils import deadline
+from src.utils.breaker import CircuitBreaker, StaleCache
+from src.utils.metrics import metrics
+
+
+def _is_url(query: str) -> bool:
+    return query.startswith(("http://", "https://"))
+
+
+def normalize(query: str) -> str:
+    """
+    The form of a query that unresolved queries are remembered by:
+    text without case or extra spaces, URLs without their fragment.
+    """
+    query = query.strip()
+    if _is_url(query):
+        url = urlsplit(query)
+        return url._replace(netloc=url.netloc.lower(), fragment="").geturl()
+    return " ".join(query.split()).casefold()
+
+
+def origin(key: str) -> str:
+    """Where a normalized query was looked up: the URL's host, or "text"."""
+    return (urlsplit(key).hostname or "text") if _is_url(key) else "text"
+
+
+class NegativeCache:
+    """
+    Normalized queries that found nothing, answered at once until they expire.
+    Also counts how often each of the latest failing queries failed.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 4096) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        ## key: monotonic expiry. Every entry lives as long, so the oldest is first.
+        self._expires: OrderedDict[str, float] = OrderedDict()
+        ## key: failures, the most recently failed last.
+        self._failures: OrderedDict[str, int] = OrderedDict()
+
+    def __contains__(self, query: str) -> bool:
+        key = normalize(query)
+        expires = self._expires.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            del self._expires[key]
+            return False
+        metrics.inc("search_unresolved_hits")
+        return True
+
+    def add(self, query: str) -> None:
+        """
+        Remembers that the query found nothing.
+        """
+        key = normalize(query)
+        metrics.inc("search_unresolved", origin=origin(key))
+        self._failures[key] = self._failures.pop(key, 0) + 1
+        if len(self._failures) > self.maxsize:
+            self._failures.popitem(last=False)
+        if self.ttl <= 0:
+            return
+
+        now = time.monotonic()
+        self._expires.pop(key, None)
+        self._expires[key] = now + self.ttl
+        while self._expires and (
+            len(self._expires) > self.maxsize
+            or next(iter(self._expires.values())) <= now
+        ):
+            self._expires.popitem(last=False)
+
+    def worst(self, count: int = 10) -> list[tuple[str, int]]:
+        """
+        The queries that failed the most, with how often they failed.
+        """
+        return heapq.nlargest(count, self._failures.items(), key=itemgetter(1))
+
+
+class HedgedSearch:
+    """
+    Races Lavalink search sources, in a configurable preference order.
+    """
+
+    def __init__(
+        self, sources: list[str], hedge_delay: float, unresolved_ttl: float = 0
+    ) -> None:
+        ## Most preferred source first.
+        self.sources = sources or ["ytmsearch"]
+        self.hedge_delay = hedge_delay
+
+        ## One breaker per source, an open breaker fails at once and the others are raced.
+        self.breakers = {
+            source: CircuitBreaker(f"lavalink:{source}")
+            for source in [*self.sources, "url"]
+        }
+        ## Last results per query, served when every source failed.
+        self.stale = StaleCache("lavalink")
+        ## Queries that found nothing lately.
+        self.unresolved = NegativeCache(unresolved_ttl)
+
+    async def _search(self, source: str | None, query: str) -> wavelink.Search:
+        label = source or "url"
+        started = time.monotonic()
+        try:
+            return await self.breakers[label].call(self._load, source, query)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            metrics.inc("search_failures", source=label)
+            raise
+        finally:
+            metrics.observe(
+                "search_latency_ms", (time.monotonic() - started) * 1000, source=label
+            )
+
+    async def _load(self, source: str | None, query: str) -> wavelink.Search:
+        return await deadline.within(wavelink.Playable.search(query, source=source))
+
+    def _pick(
+        self, tasks: dict[asyncio.Task, str]
+    ) -> tuple[str, wavelink.Search] | None:
+        """
+        Returns the most preferred finished search with results, if any.
+        """
+        finished = [
+            (self.sources.index(source), source, task)
+            for task, source in tasks.items()
+            if task.done() and not task.cancelled() and task.exception() is None
+        ]
+        for _, source, task in sorted(finished, key=lambda item: item[0]):
+            if task.result():
+                return source, task.result()
+        return None
+
+    async def search(self, query: str) -> wavelink.Search:
+        """
+        Searches for tracks, racing the sources when the preferred one is slow.
+        URLs are loaded directly, they do not need a source.
+
+        Returns an empty list when no source found anything,
+        or the query found nothing a moment ago.
+        When every source failed, returns the last results for the query if there are any,
+        otherwise raises the preferred source's error
+        (LavalinkLoadException, DeadlineExceeded, BreakerOpen).
+        """
+        if query in self.unresolved:
+            return []
+
+        if _is_url(query):
+            try:
+                result = await self._search(None, query)
+            except wavelink.LavalinkLoadException:
+                self.unresolved.add(query)
+                raise
+            if not result:
+                self.unresolved.add(query)
+            return result
+
+        metrics.inc("search_requests")
+        primary, *others = self.sources
+        tasks = {asyncio.create_task(self._search(primary, query)): primary}
+
+        try:
+            await asyncio.wait(tasks, timeout=self.hedge_delay)
+            picked = self._pick(tasks)
+
+            if picked is None and others:
+                metrics.inc("search_hedged")
+                logger.debug("Racing search sources for query=(%s)", query)
+                for source in others:
+                    tasks[asyncio.create_task(self._search(source, query))] = source
+
+            pending = {task for task in tasks if not task.done()}
+            while picked is None and pending:
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                picked = self._pick(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if picked is not None:
+            source, result = picked
+            metrics.inc("search_wins", source=source)
+            self.stale.put(query, result)
+            return result
+
+        errors = [
+            task.exception()
+            for task in tasks
+            if not task.cancelled() and task.exception() is not None
+        ]
+        if len(errors) == len(tasks):
+            if (stale := self.stale.get(query)) is not None:
+                return stale
+            ## Timeouts and open breakers say nothing about the query itself.
+            if all(isinstance(e, wavelink.LavalinkLoadException) for e in errors):
+                self.unresolved.add(query)
+            raise errors[0]
+        self.unresolved.add(query)
+        return []
+
+
+_env = EnvLoader.load_env()
+track_search = HedgedSearch(
+    sources=_env.search_sources,
+    hedge_delay=_env.search_hedge_delay,
+    unresolved_ttl=_env.search_unresolved_ttl,
+)
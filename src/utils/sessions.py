@@ -0,0 +1,228 @@
+"""
+Holds Lavalink session resuming.
+
+With resuming on, Lavalink keeps a session's players playing for `resume_timeout`
+seconds after the bot disconnects. The session id, and what only the bot knows about
+each player (its voice channel, queue, loop and shuffle modes, ...), are saved in a
+snapshot file, periodically and when the bot closes. After a restart the node
+connects with the saved session id. If Lavalink resumed it, every player it still
+has is reattached: the bot joins its voice channel again, which only renews the
+voice connection, and the player's state is rebuilt from Lavalink and the snapshot.
+"""
+
+import asyncio
+import json
+import logging as logger
+import os
+import time
+from typing import Any, Optional
+
+import discord
+import wavelink
+
+from src.credentials.loader import EnvLoader
+from src.utils.metrics import metrics
+from src.utils.player import BraumPlayer
+from src.utils.playlists import decode_tracks
+from src.utils.track_queue import ShuffleMode, requester_of
+from src.utils.tracks import track_pool
+
+
+def snapshot_player(player: BraumPlayer) -> Optional[dict[str, Any]]:
+    """
+    What the bot needs to rebuild the player, None if it is not in a voice channel.
+    """
+    if player.channel is None:
+        return None
+    queue = list(player.queue)
+    return {
+        "channel_id": player.channel.id,
+        "reply_id": getattr(player.reply, "id", None),
+        "queue": [track.encoded for track in queue],
+        "requesters": [requester_of(track) for track in queue],
+        "history": [track.encoded for track in player.queue.history],
+        "queue_mode": player.queue.mode.value,
+        "shuffle_mode": player.queue.shuffle_mode.value,
+        "autoplay": player.autoplay.value,
+        "filter_preset": player.filter_preset,
+    }
+
+
+def snapshot(client: discord.Client) -> dict[str, Any]:
+    """
+    The session id of every connected node and the state of every player.
+    """
+    players = {}
+    for voice_client in client.voice_clients:
+        if isinstance(voice_client, BraumPlayer) and voice_client.guild is not None:
+            if (state := snapshot_player(voice_client)) is not None:
+                players[str(voice_client.guild.id)] = state
+    return {
+        "saved_at": time.time(),
+        "sessions": {
+            node.uri: node.session_id
+            for node in wavelink.Pool.nodes.values()
+            if node.session_id
+        },
+        "players": players,
+    }
+
+
+class SessionStore:
+    """
+    The last snapshot, in a JSON file replaced atomically.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.snapshot: dict[str, Any] = {}
+
+    def load(self) -> dict[str, Any]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                self.snapshot = json.load(file)
+        except FileNotFoundError:
+            self.snapshot = {}
+        except (OSError, ValueError):
+            logger.warning("Lavalink session store is unreadable, not resuming.")
+            self.snapshot = {}
+        return self.snapshot
+
+    def _write(self, data: dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def save(self, data: dict[str, Any]) -> None:
+        """Writes the snapshot, blocking. Used when closing."""
+        self._write(data)
+        self.snapshot = data
+
+    async def save_async(self, data: dict[str, Any]) -> None:
+        """Writes the snapshot in a worker thread."""
+        await asyncio.to_thread(self._write, data)
+        self.snapshot = data
+
+    def session_id(self, node: wavelink.Node) -> Optional[str]:
+        return self.snapshot.get("sessions", {}).get(node.uri)
+
+    def pop_player(self, guild_id: int) -> Optional[dict[str, Any]]:
+        return self.snapshot.get("players", {}).pop(str(guild_id), None)
+
+
+def resume_session(node: wavelink.Node, store: "SessionStore") -> None:
+    """
+    Makes the node connect with its saved session id, so Lavalink resumes it.
+    wavelink sends the node's session id when it connects, but has no way to set it.
+    """
+    if node._resume_timeout > 0:  # pylint:disable=protected-access
+        node._session_id = store.session_id(node)  # pylint:disable=protected-access
+
+
+async def _restore(
+    player: BraumPlayer,
+    lavalink: wavelink.PlayerResponsePayload,
+    saved: dict[str, Any],
+    client: discord.Client,
+) -> None:
+    """
+    Rebuilds the player from what Lavalink and the snapshot know about it.
+    """
+    current = track_pool.intern(lavalink.track) if lavalink.track else None
+    player.adopt(
+        current,
+        paused=lavalink.paused,
+        volume=lavalink.volume,
+        position=lavalink.state.position,
+        filters=lavalink.filters,
+    )
+    player.filter_preset = saved.get("filter_preset")
+    player.autoplay = wavelink.AutoPlayMode(
+        saved.get("autoplay", wavelink.AutoPlayMode.partial.value)
+    )
+    if (reply_id := saved.get("reply_id")) is not None:
+        player.reply = client.get_channel(reply_id)
+
+    tracks = decode_tracks(saved.get("queue", []))
+    requesters = saved.get("requesters", [])
+    if len(tracks) == len(requesters):
+        for track, requester_id in zip(tracks, requesters):
+            if requester_id is not None:
+                track.extras = {"requester_id": requester_id}
+    if tracks:
+        player.queue.put(tracks)
+    if history := decode_tracks(saved.get("history", [])):
+        player.queue.history.put(history)
+    player.queue.mode = wavelink.QueueMode(
+        saved.get("queue_mode", wavelink.QueueMode.normal.value)
+    )
+    player.queue.set_shuffle(
+        ShuffleMode(saved.get("shuffle_mode", ShuffleMode.OFF.value))
+    )
+
+    ## The track may have ended while nothing was listening for it.
+    if current is None and player.queue:
+        await player.play(player.queue.get(), volume=lavalink.volume)
+
+
+async def reattach(
+    client: discord.Client, node: wavelink.Node, store: "SessionStore"
+) -> None:
+    """
+    Reattaches the players of a resumed session, once the guilds are cached.
+    Lavalink players the snapshot knows nothing about are destroyed.
+    """
+    await client.wait_until_ready()
+    try:
+        players = await node.fetch_players()
+    except (wavelink.LavalinkException, wavelink.NodeException):
+        logger.exception("Could not fetch the players of the resumed session.")
+        return
+
+    for lavalink in players:
+        guild = client.get_guild(lavalink.guild_id)
+        if lavalink.guild_id in node.players or (guild and guild.voice_client):
+            continue  ## Live in this run, e.g. joined again by a command meanwhile.
+
+        saved = store.pop_player(lavalink.guild_id)
+        channel = client.get_channel(saved["channel_id"]) if saved else None
+        if not isinstance(channel, discord.abc.Connectable):
+            try:
+                await node.send(
+                    "DELETE",
+                    path=f"v4/sessions/{node.session_id}/players/{lavalink.guild_id}",
+                )
+            except (wavelink.LavalinkException, wavelink.NodeException):
+                logger.warning("Could not destroy the player of an unknown guild.")
+            metrics.inc("players_resumed", result="dropped")
+            continue
+
+        try:
+            player: BraumPlayer = await channel.connect(
+                cls=BraumPlayer(nodes=[node]), self_deaf=True
+            )
+            await _restore(player, lavalink, saved, client)
+        except Exception:  # pylint:disable=broad-except
+            logger.exception(
+                "Could not reattach the player in guild=(%s)", channel.guild
+            )
+            metrics.inc("players_resumed", result="failed")
+            continue
+        logger.info("Reattached the player in guild=(%s)", channel.guild)
+        metrics.inc("players_resumed", result="reattached")
+
+
+def detach_players(client: discord.Client) -> None:
+    """
+    Forgets the players without disconnecting them, so Lavalink keeps them playing
+    for the session to be resumed. Used when closing.
+    """
+    state = client._connection  # pylint:disable=protected-access
+    for voice_client in list(client.voice_clients):
+        if isinstance(voice_client, BraumPlayer) and voice_client.guild is not None:
+            ## pylint:disable-next=protected-access
+            state._remove_voice_client(voice_client.guild.id)
+
+
+session_store = SessionStore(EnvLoader.load_env().session_store)
@@ -0,0 +1,179 @@
+"""
+Holds the scheduler that every Spotify request goes through.
+
+Requests are paced with a token bucket shared by the whole process,
+`Retry-After` from a 429 pauses every lane, and requests are served by priority:
+interactive commands first, then autocomplete, then background enrichment.
+Autocomplete never waits, it is shed as soon as the budget runs short.
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging as logger
+import time
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable
+
+from src.credentials.loader import EnvLoader
+from src.essentials.errors import SpotifyRateLimited
+from src.utils import deadline
+from src.utils.breaker import mark_sent
+from src.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from spotipy import SpotifyException
+
+
+class Priority(IntEnum):
+    """
+    Priority lanes, lower values are served first.
+    """
+
+    INTERACTIVE = 0
+    AUTOCOMPLETE = 1
+    BACKGROUND = 2
+
+
+class SpotifyScheduler:
+    """
+    Token bucket with priority lanes in front of the Spotify API.
+    """
+
+    ## Longest a request waits for a token or a Retry-After, per lane.
+    MAX_WAIT = {
+        Priority.INTERACTIVE: 10.0,
+        Priority.AUTOCOMPLETE: 0.0,
+        Priority.BACKGROUND: 30.0,
+    }
+
+    def __init__(self, rate: float, burst: int, autocomplete_reserve: float = 0.5):
+        self.rate = rate
+        self.burst = burst
+        ## Autocomplete is shed when fewer than this share of the burst is left.
+        self.autocomplete_reserve = autocomplete_reserve
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._pump: asyncio.Task | None = None
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return now
+
+    def _should_shed(self, priority: Priority, now: float) -> bool:
+        if priority is not Priority.AUTOCOMPLETE:
+            return False
+        if now < self._blocked_until or self._waiters:
+            return True
+        return self._tokens < max(1.0, self.burst * self.autocomplete_reserve)
+
+    async def _acquire(self, priority: Priority) -> None:
+        now = self._refill()
+
+        if self._should_shed(priority, now):
+            metrics.inc("spotify_shed", lane=priority.name.lower())
+            raise SpotifyRateLimited("Spotify budget is short, request was shed.")
+
+        if not self._waiters and now >= self._blocked_until and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run_pump())
+
+        ## Never wait past the interaction's deadline.
+        timeout = self.MAX_WAIT[priority]
+        if (left := deadline.remaining()) is not None:
+            timeout = max(0.0, min(timeout, left))
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError as exc:
+            metrics.inc("spotify_shed", lane=priority.name.lower())
+            raise SpotifyRateLimited("Timed out waiting for the Spotify budget.") from exc
+        finally:
+            metrics.observe(
+                "spotify_wait_ms",
+                (time.monotonic() - started) * 1000,
+                lane=priority.name.lower(),
+            )
+
+    async def _run_pump(self) -> None:
+        """
+        Hands out tokens to waiting requests, highest priority first.
+        """
+        while self._waiters:
+            now = self._refill()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  ## The waiter gave up.
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+    def _block(self, error: "SpotifyException") -> float:
+        try:
+            retry_after = float(error.headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            retry_after = 1.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._tokens = 0
+        metrics.inc("spotify_rate_limited")
+        logger.warning("Spotify rate limited us, pausing for %s seconds.", retry_after)
+        return retry_after
+
+    async def run(
+        self,
+        priority: Priority,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Runs a Spotify request once the budget allows it.
+        Blocking clients (spotipy) are run in a thread, coroutine functions are awaited.
+
+        Raises SpotifyRateLimited when the request was shed or could not be served in time,
+        and DeadlineExceeded when the request itself took too long.
+        """
+        ## spotipy is imported lazily, by the time a request runs it is needed anyway.
+        from spotipy import SpotifyException  # pylint:disable=import-outside-toplevel
+
+        for attempt in range(2):
+            await self._acquire(priority)
+            mark_sent()  ## The breaker times the request, not the wait for a token.
+            try:
+                if inspect.iscoroutinefunction(func):
+                    return await deadline.within(func(*args, **kwargs))
+                return await deadline.within(asyncio.to_thread(func, *args, **kwargs))
+            except SpotifyException as error:
+                if error.http_status != 429:
+                    raise
+                retry_after = self._block(error)
+                ## Only one retry, and only when it is worth waiting for.
+                if attempt or retry_after > self.MAX_WAIT[priority]:
+                    raise SpotifyRateLimited(
+                        f"Spotify rate limited the request for {retry_after}s."
+                    ) from error
+        raise SpotifyRateLimited("Spotify rate limited the request.")
+
+
+_env = EnvLoader.load_env()
+spotify_scheduler = SpotifyScheduler(rate=_env.spotify_rate, burst=_env.spotify_burst)
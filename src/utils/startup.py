@@ -0,0 +1,137 @@
+"""
+Holds the startup profiler.
+
+Enabled with STARTUP_PROFILE=1. It times every top-level import from the moment
+this module is imported (the first import in `src.__main__`), each cog's import
+and setup, and the startup phases up to gateway READY, then logs a report.
+"""
+
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import logging as logger
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import dotenv
+
+## The profiler starts before the credentials loader, so it reads .env itself.
+dotenv.load_dotenv(dotenv_path=".env")
+
+## Imports and steps faster than this are left out of the report.
+REPORT_THRESHOLD = 0.005
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Times the outermost import of every top-level package, nested imports included.
+    """
+
+    def __init__(self, profile: "StartupProfile") -> None:
+        self.profile = profile
+        self._finding: set[str] = set()
+        self._depth = 0
+
+    def find_spec(self, fullname, path, target=None):
+        if "." in fullname or fullname in self._finding or self._depth:
+            return None
+
+        self._finding.add(fullname)
+        try:
+            spec = importlib.util.find_spec(fullname)
+        finally:
+            self._finding.discard(fullname)
+
+        ## Only source modules have a loader of their own that can be wrapped.
+        if spec is None or not isinstance(
+            spec.loader, importlib.machinery.SourceFileLoader
+        ):
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def timed_exec_module(module) -> None:
+            self._depth += 1
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                self._depth -= 1
+                self.profile.record(
+                    f"import {fullname}", time.perf_counter() - started
+                )
+
+        spec.loader.exec_module = timed_exec_module
+        return spec
+
+
+class StartupProfile:
+    """
+    Collects timings from process start to gateway READY.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.timings: list[tuple[str, float]] = []
+        self.phases: list[tuple[str, float]] = []
+        self._timer: _ImportTimer | None = None
+
+        if enabled:
+            self._timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._timer)
+
+    def record(self, label: str, seconds: float) -> None:
+        self.timings.append((label, seconds))
+
+    @contextmanager
+    def measure(self, label: str) -> Iterator[None]:
+        """
+        Times the block, when profiling is enabled.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - started)
+
+    def mark(self, phase: str) -> None:
+        """
+        Records that a startup phase was reached.
+        """
+        self.phases.append((phase, time.perf_counter() - self.started))
+
+    def report(self) -> str:
+        lines = ["Startup profile, phases (since the first import):"]
+        lines += [
+            f"  {seconds * 1000:9.1f} ms  {phase}" for phase, seconds in self.phases
+        ]
+        lines.append("Slowest imports and steps:")
+        lines += [
+            f"  {seconds * 1000:9.1f} ms  {label}"
+            for label, seconds in sorted(self.timings, key=lambda item: -item[1])
+            if seconds >= REPORT_THRESHOLD
+        ]
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        """
+        Logs the report and stops timing imports.
+        """
+        if not self.enabled:
+            return
+        if self._timer in sys.meta_path:
+            sys.meta_path.remove(self._timer)
+        logger.info("%s", self.report())
+        self.enabled = False
+
+
+startup = StartupProfile(
+    enabled=os.getenv("STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+)
@@ -0,0 +1,228 @@
+"""
+Holds the queue used by Dj Braum's players.
+
+Shuffling is a view: the tracks stay in the order they were queued, and while a
+shuffle mode is on, `get` draws the next track instead of taking the first one.
+The permutation is only ever generated one draw at a time, and turning shuffle off
+goes straight back to the queued order.
+- random: every remaining track is as likely to play next.
+- fair: requesters take turns, each turn plays a random track of that requester.
+Tracks moved to the front with /skipto are "pinned" and play first, in order.
+"""
+
+import random
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Hashable, Optional
+
+import wavelink
+
+from src.utils.indexed import IndexedList
+from src.utils.tracks import InternedQueue
+
+
+## Weight of a stream, which never ends. Any sum at least this large is unknown.
+LIVE = 1 << 62
+
+
+def track_weight(track: wavelink.Playable) -> int:
+    """A track's length in milliseconds, LIVE for streams."""
+    return LIVE if track.is_stream else track.length
+
+
+## Random positions sampled to find a track of the requester whose turn it is,
+## before scanning the queue for one.
+FAIR_SAMPLES = 16
+
+
+class ShuffleMode(Enum):
+    """
+    How the next track is drawn from the queue.
+    """
+
+    OFF = "off"
+    RANDOM = "random"
+    FAIR = "fair"
+
+
+def requester_of(track: wavelink.Playable) -> Optional[int]:
+    """The id of the member who queued the track, None for AutoPlay and the like."""
+    return getattr(track.extras, "requester_id", None)
+
+
+def track_key(track: wavelink.Playable) -> Hashable:
+    """Tracks with the same key are the same song, for /dedupe."""
+    return track.source, track.identifier
+
+
+class BraumQueue(InternedQueue):
+    """
+    InternedQueue whose items are an IndexedList weighted by track length,
+    so getting, removing, inserting and moving by position,
+    and the duration up to any position, are O(log n).
+    """
+
+    def __init__(self, *, history: bool = True) -> None:
+        super().__init__(history=history)
+        self._items: IndexedList[wavelink.Playable] = IndexedList(weight=track_weight)
+
+        self.shuffle_mode = ShuffleMode.OFF
+        ## How many tracks at the front play before the shuffle draws again.
+        self._pinned = 0
+        ## Everyone who queued a track, in order of their first track.
+        self._requesters: dict[Optional[int], None] = {}
+        ## Requesters in the order of their next turn, for the fair shuffle.
+        self._turns: deque[Optional[int]] = deque()
+
+    def _seen(self, item: Any) -> None:
+        for track in item if isinstance(item, (list, wavelink.Playlist)) else [item]:
+            if isinstance(track, wavelink.Playable):
+                requester = requester_of(track)
+                if requester not in self._requesters:
+                    self._requesters[requester] = None
+                    self._turns.append(requester)
+
+    def put(self, item, /, *, atomic: bool = True) -> int:
+        self._seen(item)
+        return super().put(item, atomic=atomic)
+
+    async def put_wait(self, item, /, *, atomic: bool = True) -> int:
+        self._seen(item)
+        return await super().put_wait(item, atomic=atomic)
+
+    def put_at(self, index: int, value: wavelink.Playable, /) -> None:
+        self._seen(value)
+        super().put_at(index, value)
+
+    @property
+    def shuffled(self) -> bool:
+        return self.shuffle_mode is not ShuffleMode.OFF
+
+    @property
+    def pinned(self) -> int:
+        """How many tracks at the front play in order, even while shuffled."""
+        self._pinned = min(self._pinned, len(self._items))
+        return self._pinned
+
+    def set_shuffle(self, mode: ShuffleMode) -> None:
+        """
+        Switches the shuffle mode, O(1). The queued order is never changed.
+        """
+        if mode is ShuffleMode.FAIR and self.shuffle_mode is not ShuffleMode.FAIR:
+            self._turns = deque(self._requesters)
+        if mode is ShuffleMode.OFF:
+            self._pinned = 0
+        self.shuffle_mode = mode
+
+    def skip_to(self, index: int, /) -> wavelink.Playable:
+        """
+        Moves the track at `index` to the front, so it plays next even while shuffled.
+        """
+        track = self.move(index, 0)
+        if self.shuffled:
+            self._pinned = self.pinned + 1
+        return track
+
+    def reset(self) -> None:
+        super().reset()
+        self.set_shuffle(ShuffleMode.OFF)
+        self._requesters.clear()
+        self._turns.clear()
+
+    def _draw_random(self) -> int:
+        return random.randrange(self.pinned, len(self._items))
+
+    def _draw_fair(self) -> int:
+        """
+        Position of a random track of the requester whose turn it is.
+        Requesters without tracks left lose their turn.
+        """
+        start = self.pinned
+        while self._turns:
+            requester = self._turns[0]
+            self._turns.rotate(-1)
+
+            for _ in range(FAIR_SAMPLES):
+                index = random.randrange(start, len(self._items))
+                if requester_of(self._items[index]) == requester:
+                    return index
+
+            ## Few of their tracks are left, look for them.
+            matches = [
+                index
+                for index, track in enumerate(self._items[start:], start)
+                if requester_of(track) == requester
+            ]
+            if matches:
+                return random.choice(matches)
+            self._turns.pop()
+            del self._requesters[requester]
+        return self._draw_random()
+
+    def get(self) -> wavelink.Playable:
+        """
+        Like wavelink.Queue.get, but draws the track while shuffled.
+        """
+        if not self.shuffled or (self.mode is wavelink.QueueMode.loop and self._loaded):
+            return super().get()
+
+        if self.mode is wavelink.QueueMode.loop_all and not self:
+            self._items.extend(self.history)
+            self.history.clear()
+        if not self:
+            raise wavelink.QueueEmpty("There are no items currently in this queue.")
+
+        if self.pinned:
+            self._pinned -= 1
+            return self.get_at(0)
+        if self.shuffle_mode is ShuffleMode.FAIR:
+            return self.get_at(self._draw_fair())
+        return self.get_at(self._draw_random())
+
+    def duration(self) -> int:
+        """
+        Milliseconds of all the tracks, at least LIVE if one is a stream.
+        """
+        return self._items.total()
+
+    def duration_until(self, index: int, /) -> int:
+        """
+        Milliseconds of the tracks before `index`, at least LIVE if one is a stream.
+        """
+        return self._items.prefix_total(index)
+
+    def shuffle(self) -> None:
+        """
+        Shuffles the queued order itself, in O(n). /shuffle uses `set_shuffle`.
+        """
+        tracks = list(self._items)
+        random.shuffle(tracks)
+        self._items.replace(tracks)
+
+    def move(self, source: int, destination: int, /) -> wavelink.Playable:
+        """
+        Moves the track at `source` to `destination`, both 0-based. Returns the track.
+        """
+        self._items.move(source, destination)
+        return self._items[destination]
+
+    def remove_range(self, start: int, stop: int, /) -> list[wavelink.Playable]:
+        """
+        Removes and returns the tracks in [start, stop), 0-based.
+        """
+        return self._items.pop_range(start, stop)
+
+    def dedupe(self, key: Callable[[wavelink.Playable], Any] = track_key) -> int:
+        """
+        Keeps the first of every track with the same key. Returns how many were removed.
+        """
+        seen = set()
+        kept = []
+        for track in self._items:
+            if (track_id := key(track)) not in seen:
+                seen.add(track_id)
+                kept.append(track)
+        removed = len(self._items) - len(kept)
+        if removed:
+            self._items.replace(kept)
+        return removed
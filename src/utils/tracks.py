@@ -0,0 +1,176 @@
+"""
+Holds the track interning layer.
+
+Popular songs sit in many guilds' queues at once, and every search returns a new
+wavelink.Playable with its own copy of the title, author, URIs and raw payload.
+Tracks are interned by their encoded string instead: every guild's track is a small
+SharedTrack pointing to one immutable TrackRecord, and only keeps what is per guild
+(extras such as the requester, the playlist it came from, whether AutoPlay picked it).
+Records are dropped once no queue or history references them anymore.
+
+Compare with plain Playables using `python -m benchmarks.track_memory`.
+"""
+
+import weakref
+from typing import Any, Iterable, Optional
+
+import wavelink
+
+from src.utils.metrics import metrics
+
+
+class TrackRecord:  # pylint:disable=too-many-instance-attributes,too-few-public-methods
+    """
+    The metadata of one track, shared by every guild that queued it.
+    """
+
+    __slots__ = (
+        "encoded",
+        "identifier",
+        "is_seekable",
+        "author",
+        "length",
+        "is_stream",
+        "position",
+        "title",
+        "uri",
+        "artwork",
+        "isrc",
+        "source",
+        "album",
+        "artist",
+        "preview_url",
+        "is_preview",
+        "raw_data",
+        "__weakref__",
+    )
+
+    def __init__(self, track: wavelink.Playable) -> None:
+        for name in self.__slots__[:-1]:
+            object.__setattr__(self, name, getattr(track, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("TrackRecord is immutable")
+
+
+class SharedTrack(wavelink.Playable):
+    """
+    A guild's reference to an interned track, a drop-in wavelink.Playable.
+    """
+
+    __slots__ = ("_record", "_playlist", "_recommended", "_extras")
+
+    ## Playable.__init__ is not called, every attribute it would set is read from the record.
+    def __init__(  # pylint:disable=super-init-not-called
+        self, record: TrackRecord, track: wavelink.Playable
+    ) -> None:
+        self._record = record
+        self._playlist = track.playlist
+        self._recommended = track.recommended
+        ## Most tracks have no extras, they are only created when asked for.
+        self._extras: Optional[wavelink.ExtrasNamespace] = (
+            track.extras if vars(track.extras) else None
+        )
+
+    @property
+    def record(self) -> TrackRecord:
+        return self._record
+
+    encoded = property(lambda self: self._record.encoded)
+    identifier = property(lambda self: self._record.identifier)
+    is_seekable = property(lambda self: self._record.is_seekable)
+    author = property(lambda self: self._record.author)
+    length = property(lambda self: self._record.length)
+    is_stream = property(lambda self: self._record.is_stream)
+    position = property(lambda self: self._record.position)
+    title = property(lambda self: self._record.title)
+    uri = property(lambda self: self._record.uri)
+    artwork = property(lambda self: self._record.artwork)
+    isrc = property(lambda self: self._record.isrc)
+    source = property(lambda self: self._record.source)
+    album = property(lambda self: self._record.album)
+    artist = property(lambda self: self._record.artist)
+    preview_url = property(lambda self: self._record.preview_url)
+    is_preview = property(lambda self: self._record.is_preview)
+    raw_data = property(lambda self: self._record.raw_data)
+
+    @property
+    def extras(self) -> wavelink.ExtrasNamespace:
+        if self._extras is None:
+            self._extras = wavelink.ExtrasNamespace()
+        return self._extras
+
+    @extras.setter
+    def extras(self, value: wavelink.ExtrasNamespace | dict[str, Any]) -> None:
+        if not isinstance(value, wavelink.ExtrasNamespace):
+            value = wavelink.ExtrasNamespace(value)
+        self._extras = value
+
+
+class TrackPool:
+    """
+    Interns tracks by their encoded string.
+    """
+
+    def __init__(self) -> None:
+        self._records: weakref.WeakValueDictionary[str, TrackRecord] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def intern(self, track: wavelink.Playable) -> SharedTrack:
+        """
+        Returns the guild's reference to the track's shared record.
+        """
+        if isinstance(track, SharedTrack):
+            return track
+
+        record = self._records.get(track.encoded)
+        if record is None:
+            record = self._records[track.encoded] = TrackRecord(track)
+            metrics.inc("track_intern", result="miss")
+            metrics.set_gauge("interned_tracks", len(self._records))
+        else:
+            metrics.inc("track_intern", result="hit")
+        return SharedTrack(record, track)
+
+    def intern_all(self, tracks: Iterable[wavelink.Playable]) -> list[SharedTrack]:
+        return [self.intern(track) for track in tracks]
+
+
+track_pool = TrackPool()
+
+
+class InternedQueue(wavelink.Queue):
+    """
+    wavelink.Queue that interns every track put in it, its history included.
+    """
+
+    def __init__(self, *, history: bool = True) -> None:
+        super().__init__(history=False)
+        self._history = type(self)(history=False) if history else None
+
+    @staticmethod
+    def _interned(item: Any) -> Any:
+        if isinstance(item, wavelink.Playable):
+            return track_pool.intern(item)
+        if isinstance(item, (list, wavelink.Playlist)):
+            return [
+                track_pool.intern(track) if isinstance(track, wavelink.Playable) else track
+                for track in item
+            ]
+        return item
+
+    def put(self, item, /, *, atomic: bool = True) -> int:
+        return super().put(self._interned(item), atomic=atomic)
+
+    async def put_wait(self, item, /, *, atomic: bool = True) -> int:
+        return await super().put_wait(self._interned(item), atomic=atomic)
+
+    def put_at(self, index: int, value: wavelink.Playable, /) -> None:
+        super().put_at(index, self._interned(value))
+
+    def __setitem__(self, index, value, /) -> None:
+        super().__setitem__(index, self._interned(value))
@@ -1,172 +1,491 @@
+"""
+Holds the player controls shown under every "Now Playing" message.
+
+A single persistent `PlayerControlsView` is registered once in `Bot.setup_hook`.
+Buttons are routed by their stable `custom_id`, so the same view serves every guild
+and keeps working after a restart. The messages themselves only carry a rendered
+layout (see `render_controls`), which is cached and never stored in the view store.
+"""
+
+import logging as logger
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import discord
-import discord
-from discord.ext import commands
-from discord.ui import Button, View
 import wavelink
+from discord.ui import Button, View
 
+from src.essentials.errors import BreakerOpen, DeadlineExceeded, NodeUnavailable
+from src.utils import deadline
+from src.utils.overload import Stage, overload
+from src.utils.player import BraumPlayer
+from src.utils.readiness import readiness
 from src.utils.responses import Responses
-import logging as logger
 
+## Stable custom_ids used to route button clicks to the dispatcher.
+PREVIOUS_ID = "player-previous"
+PAUSE_ID = "player-pause"
+SKIP_ID = "player-skip"
+FOR_YOU_ID = "player-for-you"
+CONTROLS_ID = "player-controls"
+EXPERIMENTAL_ID = "player-experimental"
+LOOP_TRACK_ID = "controls-loop-track"
+LOOP_QUEUE_ID = "controls-loop-queue"
+NIGHTCORE_ID = "experimental-nightcore"
+LYRICS_ID = "experimental-lyrics"
+HISTORY_ID = "experimental-history"
+
+SUPPORT_URL = "https://discord.gg/cbVdqU7X7j"
+
+## Seconds a button waits for a Lavalink node, of the 3 it has to be answered in.
+COMPONENT_NODE_WAIT = 2.0
+
+
+class ControlsState(NamedTuple):
+    """
+    Everything needed to render the player controls.
+    """
+
+    previous_disabled: bool = True
+    paused: bool = False
+    for_you: bool = False
+    controls_open: bool = False
+    experimental_open: bool = False
+    loop_track: bool = False
+    loop_queue: bool = False
+    nightcore: bool = False
+
+    @classmethod
+    def from_player(
+        cls,
+        player: BraumPlayer,
+        message: Optional[discord.Message] = None,
+    ) -> "ControlsState":
+        """
+        Builds the state from the player.
+        Which panels are open is read from the message the button was clicked on.
+        """
+        custom_ids: set[str] = set()
+        if message is not None:
+            for row in message.components:
+                for component in getattr(row, "children", []):
+                    if component.custom_id:
+                        custom_ids.add(component.custom_id)
+
+        return cls(
+            previous_disabled=not player.track_history,
+            paused=player.paused,
+            for_you=player.autoplay == wavelink.AutoPlayMode.enabled,
+            controls_open=LOOP_TRACK_ID in custom_ids,
+            experimental_open=NIGHTCORE_ID in custom_ids,
+            loop_track=player.queue.mode == wavelink.QueueMode.loop,
+            loop_queue=player.queue.mode == wavelink.QueueMode.loop_all,
+            nightcore=player.nightcore,
+        )
 
-class PlayerControlsView(View):
-    def __init__(self, responses: Responses):
-        super().__init__()
-        self.responses = responses
 
-        self.control_flag = False  # default to being "off"
-        self.control_flag_buttons = []
+def _toggle_style(enabled: bool) -> discord.ButtonStyle:
+    return discord.ButtonStyle.green if enabled else discord.ButtonStyle.grey
 
-        self.experimental_feature_flag = False  # default to being "off"
-        self.experimental_feature_flag_buttons = []
 
-    def get_player(self, interaction: discord.Interaction):
-        return wavelink.Pool().get_node().get_player(interaction.guild.id)
+@lru_cache(maxsize=256)
+def render_controls(state: ControlsState) -> View:
+    """
+    Returns the layout for the given state.
 
-    @discord.ui.button(
-        label="Previous",
-        style=discord.ButtonStyle.primary,
-        emoji="⏮️",
-        disabled=True,
+    The returned view is stopped, so discord.py never stores it per message.
+    Clicks are handled by the persistent `PlayerControlsView` instead.
+    Layouts are cached, as there are only a handful of possible states.
+    """
+    view = View(timeout=None)
+    view.add_item(
+        Button(
+            label="Previous",
+            style=discord.ButtonStyle.primary,
+            emoji="⏮️",
+            disabled=state.previous_disabled,
+            custom_id=PREVIOUS_ID,
+        )
+    )
+    view.add_item(
+        Button(
+            label="Resume" if state.paused else "Pause",
+            style=discord.ButtonStyle.primary,
+            emoji="▶️" if state.paused else "⏸️",
+            custom_id=PAUSE_ID,
+        )
+    )
+    view.add_item(
+        Button(
+            label="Skip",
+            style=discord.ButtonStyle.primary,
+            emoji="⏭️",
+            custom_id=SKIP_ID,
+        )
+    )
+    view.add_item(
+        Button(
+            label="For You",
+            style=_toggle_style(state.for_you),
+            emoji="<a:I_Check:812904249175834644>" if state.for_you else "🚀",
+            custom_id=FOR_YOU_ID,
+        )
+    )
+    view.add_item(
+        Button(
+            label="Controls",
+            style=_toggle_style(state.controls_open),
+            emoji="🔧",
+            custom_id=CONTROLS_ID,
+        )
+    )
+    view.add_item(
+        Button(
+            label="Experimental",
+            style=(
+                discord.ButtonStyle.green
+                if state.experimental_open
+                else discord.ButtonStyle.red
+            ),
+            emoji="🔍",
+            custom_id=EXPERIMENTAL_ID,
+        )
     )
-    async def previous(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        player: wavelink.Player = self.get_player(interaction)
 
-        if not player:
-            self.clear_items()
+    if state.controls_open:
+        view.add_item(
+            Button(
+                label="Loop Track",
+                style=_toggle_style(state.loop_track),
+                emoji="🔄",
+                custom_id=LOOP_TRACK_ID,
+            )
+        )
+        view.add_item(
+            Button(
+                label="Loop Queue",
+                style=_toggle_style(state.loop_queue),
+                emoji="🔁",
+                custom_id=LOOP_QUEUE_ID,
+            )
+        )
 
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
-                return
+    if state.experimental_open:
+        view.add_item(
+            Button(
+                label="Nightcore",
+                style=_toggle_style(state.nightcore),
+                emoji="🌙",
+                custom_id=NIGHTCORE_ID,
+            )
+        )
+        view.add_item(
+            Button(
+                label="Lyrics",
+                style=discord.ButtonStyle.grey,
+                emoji="📜",
+                custom_id=LYRICS_ID,
+            )
+        )
+        view.add_item(
+            Button(
+                label="History",
+                style=discord.ButtonStyle.gray,
+                emoji="📖",
+                custom_id=HISTORY_ID,
+            )
+        )
+        view.add_item(
+            Button(
+                label="Support?",
+                style=discord.ButtonStyle.url,
+                url=SUPPORT_URL,
+                emoji="<a:KittyPat:638301285845696522>",
+            )
+        )
 
-        if not hasattr(player, "custom_queue"):
-            logger.error("Player has no custom queue initialized.")
+    view.stop()
+    return view
 
-        if player.queue.mode != wavelink.QueueMode.normal:
-            # Reset the queue mode to normal. if user skips a track while in loop mode.
-            player.queue.mode = wavelink.QueueMode.normal
 
-        prev_track: wavelink.Playable = player.custom_queue.history[-1]
-        await player.play(prev_track)
+class _RoutedButton(Button["PlayerControlsView"]):
+    """
+    A button that forwards every click to the view's dispatcher.
+    """
 
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
+    async def callback(self, interaction: discord.Interaction):
+        assert self.view is not None
+        await self.view.dispatch(interaction, self.custom_id)
 
-    @discord.ui.button(label="Pause", style=discord.ButtonStyle.primary, emoji="⏸️")
-    async def pause_resume_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
 
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
-                return
+class PlayerControlsView(View):
+    """
+    Persistent dispatcher for the player controls.
+    Only one instance exists, it keeps no per-message state.
+    """
 
-        await player.pause(not player.paused)
-        button.label = "Resume" if player.paused else "Pause"
-        button.emoji = "▶️" if player.paused else "⏸️"
+    def __init__(self, responses: Responses):
+        super().__init__(timeout=None)
+        self.responses = responses
 
+        self._handlers = {
+            PREVIOUS_ID: self.previous,
+            PAUSE_ID: self.pause_resume,
+            SKIP_ID: self.skip,
+            FOR_YOU_ID: self.for_you,
+            CONTROLS_ID: self.controls,
+            EXPERIMENTAL_ID: self.experimental,
+            LOOP_TRACK_ID: self.loop_track,
+            LOOP_QUEUE_ID: self.loop_queue,
+            NIGHTCORE_ID: self.nightcore,
+            LYRICS_ID: self.lyrics,
+            HISTORY_ID: self.history,
+        }
+        for custom_id in self._handlers:
+            self.add_item(_RoutedButton(custom_id=custom_id))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        deadline.bind(interaction)
+        overload.track()
+        return True
+
+    async def confirm(
+        self,
+        interaction: discord.Interaction,
+        embed: discord.Embed,
+        delete_after: float,
+    ) -> None:
+        """
+        Sends a short-lived confirmation message, unless they are shed under load.
+        """
+        if overload.allows(Stage.CONFIRMATIONS):
+            await interaction.channel.send(embed=embed, delete_after=delete_after)
+
+    def get_player(self, interaction: discord.Interaction):
+        node = readiness.node()
+        return node.get_player(interaction.guild.id) if node is not None else None
+
+    async def edit_controls(
+        self,
+        interaction: discord.Interaction,
+        state: Optional[ControlsState],
+    ) -> None:
+        """
+        Re-renders the controls on the clicked message.
+        Passing None removes the controls.
+        """
+        view = render_controls(state) if state is not None else None
         try:
-            return await interaction.response.edit_message(view=self)
+            await interaction.response.edit_message(view=view)
         except discord.errors.NotFound:
             logger.warning("Tried to edit a message that no longer exists.")
 
-    @discord.ui.button(label="Skip", style=discord.ButtonStyle.primary, emoji="⏭️")
-    async def skip_button(
-        self, interaction: discord.Interaction, button: discord.ui.Button
-    ):
-        player: wavelink.Player = self.get_player(interaction)
+    async def dispatch(self, interaction: discord.Interaction, custom_id: str):
+        """
+        Looks up the guild's player and runs the handler for the clicked button.
+        """
+        handler = self._handlers.get(custom_id)
+        if handler is None:
+            logger.warning("Received a click for an unknown button: %s", custom_id)
+            return
+
+        ## Buttons must be answered within 3 seconds.
+        try:
+            await readiness.wait(timeout=COMPONENT_NODE_WAIT)
+        except NodeUnavailable:
+            return await interaction.response.send_message(
+                embed=await self.responses.music_unavailable(), ephemeral=True
+            )
+
+        player: BraumPlayer = self.get_player(interaction)
         if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
+            return await self.edit_controls(interaction, None)
+
+        state = ControlsState.from_player(player, interaction.message)
+        new_state = await handler(interaction, player, state)
+        if interaction.response.is_done():
+            return
+        return await self.edit_controls(interaction, new_state)
+
+    async def previous(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        history = player.track_history
+        if not history:
+            logger.error("Player has no history to go back to.")
+            return state._replace(previous_disabled=True)
 
+        if player.queue.mode != wavelink.QueueMode.normal:
+            # Reset the queue mode to normal. if user skips a track while in loop mode.
+            player.queue.mode = wavelink.QueueMode.normal
+
+        prev_track: wavelink.Playable = history[-1]
+        await player.play(prev_track)
+        return state._replace(loop_track=False, loop_queue=False)
+
+    async def pause_resume(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        await player.pause(not player.paused)
+        return state._replace(paused=player.paused)
+
+    async def skip(
+        self,
+        interaction: discord.Interaction,
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        new_state: Optional[ControlsState] = state._replace(
+            loop_track=False, loop_queue=False
+        )
         if player.queue.is_empty and player.autoplay != wavelink.AutoPlayMode.enabled:
-            await interaction.channel.send(
-                embed=await self.responses.empty_queue(),
-                delete_after=10,
+            await self.confirm(
+                interaction, await self.responses.empty_queue(), delete_after=10
             )
-            self.clear_items()
+            new_state = None
 
         # when skipping a track, player.queue.mode should be reset to normal
         if player.queue.mode != wavelink.QueueMode.normal:
             player.queue.mode = wavelink.QueueMode.normal
 
         await player.skip()
+        return new_state
 
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
+    async def for_you(
+        self,
+        interaction: discord.Interaction,
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        if not player.autoplay == wavelink.AutoPlayMode.enabled:
+            player.autoplay = wavelink.AutoPlayMode.enabled
+            await self.confirm(
+                interaction, await self.responses.for_you_enabled(), delete_after=20
+            )
+        else:
+            player.autoplay = wavelink.AutoPlayMode.partial
+            await self.confirm(
+                interaction, await self.responses.for_you_disabled(), delete_after=5
+            )
 
-    async def history(self, interaction: discord.Interaction):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
+        return state._replace(
+            for_you=player.autoplay == wavelink.AutoPlayMode.enabled
+        )
 
-        if not hasattr(player, "custom_queue"):
-            return await interaction.channel.send(
-                embed=await self.responses.nothing_in_history(),
-                delete_after=10,
-            )
+    async def controls(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,  # pylint:disable=unused-argument
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        return state._replace(controls_open=not state.controls_open)
 
-        history_tracks: wavelink.Queue = player.custom_queue.history
-        if not history_tracks:
-            return await interaction.channel.send(
-                embed=await self.responses.nothing_in_history(),
-                delete_after=10,
-            )
+    async def experimental(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,  # pylint:disable=unused-argument
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        return state._replace(experimental_open=not state.experimental_open)
 
-        ## Show the queue.
-        await interaction.channel.send(
-            embed=await self.responses.show_history(list(history_tracks), interaction)
+    async def loop_track(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        if player.queue.mode == wavelink.QueueMode.loop:
+            player.queue.mode = wavelink.QueueMode.normal
+        else:
+            player.queue.mode = wavelink.QueueMode.loop
+
+        return state._replace(
+            loop_track=player.queue.mode == wavelink.QueueMode.loop,
+            loop_queue=False,
         )
 
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
+    async def loop_queue(
+        self,
+        interaction: discord.Interaction,  # pylint:disable=unused-argument
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        if player.queue.mode == wavelink.QueueMode.loop_all:
+            player.queue.mode = wavelink.QueueMode.normal
+        else:
+            player.queue.mode = wavelink.QueueMode.loop_all
+
+        return state._replace(
+            loop_track=False,
+            loop_queue=player.queue.mode == wavelink.QueueMode.loop_all,
+        )
+
+    async def nightcore(
+        self,
+        interaction: discord.Interaction,
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        ## If nightcore mode is already enabled, disable it.
+        if player.nightcore:
+            await player.reset_preset()
+            await self.confirm(
+                interaction, await self.responses.nightcore_disable(), delete_after=10
+            )
+            return state._replace(nightcore=False)
 
-    async def lyrics(self, interaction: discord.Interaction):
+        ## Enable nightcore mode.
+        await player.apply_preset("nightcore")
+        await self.confirm(
+            interaction, await self.responses.nightcore_enable(), delete_after=10
+        )
+        return state._replace(nightcore=True)
+
+    async def lyrics(
+        self,
+        interaction: discord.Interaction,
+        player: BraumPlayer,  # pylint:disable=unused-argument
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
         """
         Fetch the lyrics of the current song.
         """
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
-
-        # send as an ephemeral to avoid clutter.
-        # await interaction.response.defer(ephemeral=True)
+        ## Genius is slow, acknowledge the click first. The controls stay as they are.
+        await interaction.response.defer()
+        deadline.bind(interaction, deferred=True)
 
         if not (current_track := await self.responses.get_track(interaction.guild)):
-            return await interaction.channel.send(
+            await interaction.channel.send(
                 embed=await self.responses.nothing_is_playing(),
                 delete_after=10,
             )
+            return state
 
         if current_track.source != "spotify":
-            return await interaction.channel.send(
+            await interaction.channel.send(
                 embed=await self.responses.display_lyrics_error_only_spotify_song_allowed(),
                 delete_after=10,
             )
+            return state
 
-        song_lyrics = await self.responses.get_lyrics(current_track)
+        try:
+            song_lyrics = await self.responses.get_lyrics(current_track)
+        except (DeadlineExceeded, BreakerOpen):
+            logger.warning("Genius could not answer for %s", current_track.title)
+            song_lyrics = None
 
         if not song_lyrics:
-            return await interaction.channel.send(
+            await interaction.channel.send(
                 embed=await self.responses.lyrics_not_found(current_track),
                 delete_after=10,
             )
+            return state
 
         lyrics_embed = await self.responses.display_lyrics(
             song_lyrics, interaction.user
@@ -183,305 +502,24 @@ class PlayerControlsView(View):
                 embed=await self.responses.lyrics_too_long(),
                 delete_after=10,
             )
-        finally:
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
+        return state
 
-    def change_button_style(
+    async def history(
         self,
-        style: discord.ButtonStyle,
-        custom_id: str,
-    ) -> discord.ui.Button:
-        for button in self.children:
-            if button.custom_id == custom_id:
-                button.style = style
-
-    async def nightcore(self, interaction: discord.Interaction):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
-
-        ## If nightcore mode is already enabled, respond.
-        if hasattr(player, "nightcore") and player.nightcore:
-
-            player.nightcore = False
-            filters: wavelink.Filters = player.filters
-            filters.timescale.reset()
-            await player.set_filters(filters)
+        interaction: discord.Interaction,
+        player: BraumPlayer,
+        state: ControlsState,
+    ) -> Optional[ControlsState]:
+        history = player.track_history
+        if not history:
             await interaction.channel.send(
-                embed=await self.responses.nightcore_disable(),
+                embed=await self.responses.nothing_in_history(),
                 delete_after=10,
             )
-            self.change_button_style(
-                style=discord.ButtonStyle.grey,
-                custom_id="experimental-nightcore",
-            )
-
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning(
-                    "Tried to edit a message that no longer exists.", exc_info=True
-                )
-                return
+            return state
 
-        ## Enable nightcore mode.
-        player.nightcore = True
-        filters: wavelink.Filters = player.filters
-        filters.timescale.set(pitch=1.2, speed=1.2, rate=1)
-        await player.set_filters(filters)
+        ## Show the history.
         await interaction.channel.send(
-            embed=await self.responses.nightcore_enable(),
-            delete_after=10,
-        )
-        self.change_button_style(
-            style=discord.ButtonStyle.green,
-            custom_id="experimental-nightcore",
+            embed=await self.responses.show_history(history, interaction)
         )
-
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning(
-                "Tried to edit a message that no longer exists.", exc_info=True
-            )
-
-    @discord.ui.button(
-        label="For You",
-        style=discord.ButtonStyle.primary,
-        emoji="🚀",
-    )
-    async def for_you(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button,
-    ):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
-                return
-
-        if not player.autoplay == wavelink.AutoPlayMode.enabled:
-            player.autoplay = wavelink.AutoPlayMode.enabled
-            await interaction.channel.send(
-                embed=await self.responses.for_you_enabled(),
-                delete_after=20,
-            )
-            button.style = discord.ButtonStyle.green
-            button.emoji = "<a:I_Check:812904249175834644>"
-
-        else:
-            player.autoplay = wavelink.AutoPlayMode.partial
-            await interaction.channel.send(
-                embed=await self.responses.for_you_disabled(),
-                delete_after=5,
-            )
-            button.style = discord.ButtonStyle.grey
-            button.emoji = "🚀"
-
-        if not hasattr(player, "custom_queue"):
-            logger.error("Player has no custom queue initialized.")
-
-            custom_queue: wavelink.Queue = player.custom_queue
-            if custom_queue.history.is_empty:
-                self.previous.disabled = True
-
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
-
-    async def loop_track(self, interaction: discord.Interaction):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
-
-        if player.queue.mode == wavelink.QueueMode.loop:
-            player.queue.mode = wavelink.QueueMode.normal
-            self.change_button_style(
-                style=discord.ButtonStyle.grey,
-                custom_id="controls-loop-track",
-            )
-        else:
-            player.queue.mode = wavelink.QueueMode.loop
-            self.change_button_style(
-                style=discord.ButtonStyle.green,
-                custom_id="controls-loop-track",
-            )
-
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
-
-    async def loop_queue(self, interaction: discord.Interaction):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-            return await interaction.response.edit_message(view=self)
-
-        if player.queue.mode == wavelink.QueueMode.loop_all:
-            player.queue.mode = wavelink.QueueMode.normal
-            self.change_button_style(
-                style=discord.ButtonStyle.grey,
-                custom_id="controls-loop-queue",
-            )
-        else:
-            player.queue.mode = wavelink.QueueMode.loop_all
-            self.change_button_style(
-                style=discord.ButtonStyle.green,
-                custom_id="controls-loop-queue",
-            )
-
-        try:
-            return await interaction.response.edit_message(view=self)
-        except discord.errors.NotFound:
-            logger.warning("Tried to edit a message that no longer exists.")
-
-    @discord.ui.button(
-        label="Controls",
-        style=discord.ButtonStyle.grey,
-        emoji="🔧",
-    )
-    async def controls(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button,
-    ):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
-                return
-
-        self.control_flag = not self.control_flag
-
-        if self.control_flag:
-            loop_track_style = discord.ButtonStyle.grey
-            if player.queue.mode == wavelink.QueueMode.loop:
-                loop_track_style = discord.ButtonStyle.green
-
-            loop_queue_style = discord.ButtonStyle.grey
-            if player.queue.mode == wavelink.QueueMode.loop_all:
-                loop_queue_style = discord.ButtonStyle.green
-
-            loop_track = Button(
-                label="Loop Track",
-                style=loop_track_style,
-                emoji="🔄",
-                custom_id="controls-loop-track",
-            )
-            loop_queue = Button(
-                label="Loop Queue",
-                style=loop_queue_style,
-                emoji="🔁",
-                custom_id="controls-loop-queue",
-            )
-
-            self.control_flag_buttons = [
-                loop_track,
-                loop_queue,
-            ]
-
-            # Add (functions) to be called when the button is clicked.
-            loop_track.callback = self.loop_track
-            loop_queue.callback = self.loop_queue
-
-            for _button in self.control_flag_buttons:
-                self.add_item(_button)
-            button.style = discord.ButtonStyle.green
-        else:
-            for _button in self.children:
-                if _button in self.control_flag_buttons:
-                    self.remove_item(_button)
-
-            button.style = discord.ButtonStyle.grey
-
-        return await interaction.response.edit_message(view=self)
-
-    @discord.ui.button(
-        label="Experimental",
-        style=discord.ButtonStyle.red,
-        emoji="🔍",
-    )
-    async def experimental(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button,
-    ):
-        player: wavelink.Player = self.get_player(interaction)
-        if not player:
-            self.clear_items()
-
-            try:
-                return await interaction.response.edit_message(view=self)
-            except discord.errors.NotFound:
-                logger.warning("Tried to edit a message that no longer exists.")
-                return
-
-        self.experimental_feature_flag = not self.experimental_feature_flag
-
-        if self.experimental_feature_flag:
-            nightcore_style = discord.ButtonStyle.grey
-            if hasattr(player, "nightcore") and player.nightcore:
-                nightcore_style = discord.ButtonStyle.green
-            nightcore = Button(
-                label="Nightcore",
-                style=nightcore_style,
-                emoji="🌙",
-                custom_id="experimental-nightcore",
-            )
-            lyrics = Button(
-                label="Lyrics",
-                style=discord.ButtonStyle.grey,
-                emoji="📜",
-                custom_id="experimental-lyrics",
-            )
-            feature_requests = Button(
-                label="Support?",
-                style=discord.ButtonStyle.url,
-                url="https://discord.gg/cbVdqU7X7j",
-                emoji="<a:KittyPat:638301285845696522>",
-            )
-            history = Button(
-                label="History",
-                style=discord.ButtonStyle.gray,
-                emoji="📖",
-                custom_id="experimental-history",
-            )
-
-            self.experimental_feature_flag_buttons = [
-                nightcore,
-                lyrics,
-                history,
-                feature_requests,
-            ]
-
-            # Add (functions) to be called when the button is clicked.
-            nightcore.callback = self.nightcore
-            lyrics.callback = self.lyrics
-            history.callback = self.history
-            for _button in self.experimental_feature_flag_buttons:
-                self.add_item(_button)
-            button.style = discord.ButtonStyle.green
-        else:
-            for _button in self.children:
-                if _button in self.experimental_feature_flag_buttons:
-                    self.remove_item(_button)
-
-            button.style = discord.ButtonStyle.red
-
-        return await interaction.response.edit_message(view=self)
+        return state